@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        from reports.storage import register_reference_source
+        from . import signals  # noqa: F401
+        from .avatars import rendition_references
+
+        register_reference_source(rendition_references)
@@ -0,0 +1,138 @@
+"""
+Profile photo renditions and avatar markup.
+
+Uploading a photo only stores the original. The generate_avatars command
+(run by the scheduler) then writes square JPEG and WebP renditions for every
+avatar size at 1x and 2x and records them in ``User.avatar_renditions``.
+Until that has happened avatars fall back to the original photo.
+
+Renditions are content-addressed like all media (reports.storage), so users
+with the same photo share them. Old renditions are left for gc_media.
+
+Avatar HTML is rendered on every use rather than cached: it is a
+format_html over the recorded rendition names, cheaper than a round trip to
+the default cache (the database unless REDIS_URL is set).
+"""
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django.utils.html import format_html
+from PIL import Image, ImageOps
+
+from .models import User
+
+AVATAR_SIZES = {
+    'sm': 32,
+    'md': 64,
+    'lg': 128,
+    'xl': 200,
+}
+DEFAULT_AVATAR_SIZE = 'md'
+
+# Pixel sizes written for each photo (1x and 2x of every avatar size)
+RENDITION_PIXELS = sorted({px for size in AVATAR_SIZES.values() for px in (size, size * 2)})
+RENDITION_FORMATS = (
+    ('jpeg', 'jpg', {'quality': 85, 'optimize': True, 'progressive': True}),
+    ('webp', 'webp', {'quality': 80, 'method': 6}),
+)
+
+def pending_avatar_users():
+    """Users with a photo but no renditions yet"""
+    return User.objects.exclude(profile_photo='').filter(
+        profile_photo__isnull=False,
+        avatar_renditions__isnull=True
+    )
+
+
+def generate_renditions(user):
+    """
+    Write all renditions of ``user.profile_photo`` to storage and return
+    the ``avatar_renditions`` mapping: {pixels: {format: storage name}}
+    """
+    with user.profile_photo.open('rb') as photo:
+        image = ImageOps.exif_transpose(Image.open(photo))
+        image = image.convert('RGB')
+
+    renditions = {}
+    for px in RENDITION_PIXELS:
+        square = ImageOps.fit(image, (px, px), Image.Resampling.LANCZOS)
+        renditions[str(px)] = {}
+        for fmt, ext, options in RENDITION_FORMATS:
+            buffer = BytesIO()
+            square.save(buffer, format=fmt.upper(), **options)
+            name = default_storage.save(f'avatars/{px}.{ext}', ContentFile(buffer.getvalue()))
+            renditions[str(px)][fmt] = name
+    return renditions
+
+
+def process_avatar(user):
+    """
+    Generate and record renditions for ``user``. Returns False if the photo
+    changed while they were being generated.
+    """
+    renditions = generate_renditions(user)
+    return bool(User.objects.filter(
+        pk=user.pk,
+        profile_photo=user.profile_photo.name,
+        avatar_renditions__isnull=True
+    ).update(avatar_renditions=renditions, updated_at=timezone.now()))
+
+
+def rendition_references():
+    """Storage names of all recorded renditions (a gc_media reference source)"""
+    renditions = User.objects.filter(avatar_renditions__isnull=False).values_list(
+        'avatar_renditions', flat=True
+    )
+    for formats_by_px in renditions.iterator(chunk_size=2000):
+        for formats in formats_by_px.values():
+            yield from formats.values()
+
+
+def _srcset(renditions, px, fmt):
+    one_x = renditions.get(str(px), {}).get(fmt)
+    two_x = renditions.get(str(px * 2), {}).get(fmt)
+    if not one_x:
+        return ''
+    srcset = f'{default_storage.url(one_x)} 1x'
+    if two_x:
+        srcset += f', {default_storage.url(two_x)} 2x'
+    return srcset
+
+
+def render_avatar(user, size):
+    """Avatar markup: a <picture> with WebP/JPEG srcsets, the original photo, or initials"""
+    px = AVATAR_SIZES[size]
+    name = user.get_full_name()
+    renditions = user.avatar_renditions
+
+    if user.profile_photo and renditions:
+        jpeg = renditions[str(px)]['jpeg']
+        return format_html(
+            '<picture>'
+            '<source type="image/webp" srcset="{}">'
+            '<img src="{}" srcset="{}" alt="{}" class="avatar-circle avatar-{}" '
+            'width="{}" height="{}" decoding="async">'
+            '</picture>',
+            _srcset(renditions, px, 'webp'),
+            default_storage.url(jpeg), _srcset(renditions, px, 'jpeg'),
+            name, size, px, px,
+        )
+    if user.profile_photo:
+        # Renditions not generated yet
+        return format_html(
+            '<img src="{}" alt="{}" class="avatar-circle avatar-{}" width="{}" height="{}">',
+            user.profile_photo.url, name, size, px, px,
+        )
+    return format_html(
+        '<div class="avatar-initials avatar-{}" style="background-color: {};">{}</div>',
+        size, user.get_avatar_color(), user.get_initials(),
+    )
+
+
+def avatar_html(user, size=DEFAULT_AVATAR_SIZE):
+    """Avatar markup for ``user`` at ``size`` (sm, md, lg or xl)"""
+    if size not in AVATAR_SIZES:
+        size = DEFAULT_AVATAR_SIZE
+    return render_avatar(user, size)
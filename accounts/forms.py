@@ -1,5 +1,7 @@
 from django import forms
-from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
+from django.contrib.auth.forms import UserCreationForm, AuthenticationForm, PasswordResetForm
+from django.core.mail import EmailMultiAlternatives
+from django.template import loader
 from .models import User
 
 
@@ -96,6 +98,11 @@ class UserRegistrationForm(UserCreationForm):
         return full_email
 
 
+def _timezone_choices():
+    from zoneinfo import available_timezones
+    return [('', 'Organization default')] + [(name, name) for name in sorted(available_timezones())]
+
+
 class UserProfileForm(forms.ModelForm):
     """Form for updating user profile"""
 
@@ -104,11 +111,22 @@ class UserProfileForm(forms.ModelForm):
         label='Remove current profile photo',
         widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
     )
+    reminder_timezone = forms.ChoiceField(
+        required=False,
+        label='Reminder time zone',
+        choices=_timezone_choices,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
 
     class Meta:
         model = User
-        fields = ['first_name', 'last_name', 'email', 'department', 'phone_number', 'profile_photo']
+        fields = ['first_name', 'last_name', 'email', 'department', 'phone_number', 'profile_photo',
+                  'reminder_timezone', 'reminder_time']
+        labels = {
+            'reminder_time': 'Preferred reminder time',
+        }
         widgets = {
+            'reminder_time': forms.TimeInput(attrs={'class': 'form-control', 'type': 'time'}, format='%H:%M'),
             'first_name': forms.TextInput(attrs={'class': 'form-control'}),
             'last_name': forms.TextInput(attrs={'class': 'form-control'}),
             'email': forms.EmailInput(attrs={'class': 'form-control'}),
@@ -118,7 +136,7 @@ class UserProfileForm(forms.ModelForm):
         }
 
     def clean_profile_photo(self):
-        """Validate and resize profile photo"""
+        """Validate profile photo"""
         photo = self.cleaned_data.get('profile_photo')
 
         if not photo:
@@ -139,39 +157,26 @@ class UserProfileForm(forms.ModelForm):
         if ext not in ['.jpg', '.jpeg', '.png']:
             raise forms.ValidationError('Only JPG and PNG files are allowed.')
 
-        # Resize image to 300x300px
-        try:
-            from PIL import Image
-            from io import BytesIO
-            from django.core.files.uploadedfile import InMemoryUploadedFile
-            import sys
-
-            # Open image
-            img = Image.open(photo)
-
-            # Convert to RGB if necessary (for PNG with transparency)
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-
-            # Resize to 300x300
-            output_size = (300, 300)
-            img.thumbnail(output_size, Image.Resampling.LANCZOS)
-
-            # Save to BytesIO
-            output = BytesIO()
-            img.save(output, format='JPEG', quality=85)
-            output.seek(0)
-
-            # Create new InMemoryUploadedFile
-            photo = InMemoryUploadedFile(
-                output,
-                'ImageField',
-                f"{os.path.splitext(photo.name)[0]}.jpg",
-                'image/jpeg',
-                sys.getsizeof(output),
-                None
-            )
-        except Exception as e:
-            raise forms.ValidationError(f'Error processing image: {str(e)}')
-
+        # The image itself was already verified by forms.ImageField. Resized
+        # renditions are generated later by generate_avatars (accounts.avatars)
         return photo
+
+
+class OutboxPasswordResetForm(PasswordResetForm):
+    """Password reset form that queues the email in the outbox instead of sending it inline"""
+
+    def send_mail(self, subject_template_name, email_template_name, context,
+                  from_email, to_email, html_email_template_name=None):
+        from reports.outbox import enqueue
+
+        subject = loader.render_to_string(subject_template_name, context)
+        # Email subject *must not* contain newlines
+        subject = ''.join(subject.splitlines())
+        body = loader.render_to_string(email_template_name, context)
+
+        email_message = EmailMultiAlternatives(subject, body, from_email, [to_email])
+        if html_email_template_name is not None:
+            html_email = loader.render_to_string(html_email_template_name, context)
+            email_message.attach_alternative(html_email, 'text/html')
+
+        enqueue(email_message)
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from accounts.avatars import pending_avatar_users, process_avatar
+from accounts.models import User
+
+
+class Command(BaseCommand):
+    help = 'Generate resized avatar renditions for new profile photos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Regenerate renditions for every user with a photo',
+        )
+
+    def handle(self, *args, **options):
+        if options['all']:
+            # Superseded renditions are removed by gc_media
+            User.objects.exclude(profile_photo='').filter(
+                profile_photo__isnull=False, avatar_renditions__isnull=False
+            ).update(avatar_renditions=None)
+
+        generated = failed = 0
+        for user in pending_avatar_users().iterator():
+            try:
+                if process_avatar(user):
+                    generated += 1
+            except Exception as e:
+                # Don't retry a broken photo forever; avatars fall back to the original
+                User.objects.filter(pk=user.pk).update(avatar_renditions={})
+                failed += 1
+                self.stdout.write(
+                    self.style.ERROR(f'Failed to process photo of {user.username}: {e}')
+                )
+
+        if generated or failed or options['verbosity'] >= 2:
+            self.stdout.write(
+                self.style.SUCCESS(f'Generated avatars for {generated} user(s)')
+            )
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.11 on 2026-10-17 10:07
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+from django.db import migrations
+import django.db.models.functions.text
+
+
+NAME_INDEXES = [
+    django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('first_name'), name='gin_trgm_ops'), name='accounts_user_fname_trgm'),
+    django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('last_name'), name='gin_trgm_ops'), name='accounts_user_lname_trgm'),
+    django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('username'), name='gin_trgm_ops'), name='accounts_user_uname_trgm'),
+]
+
+
+def create_name_indexes(apps, schema_editor):
+    # pg_trgm GIN indexes only exist on PostgreSQL
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    User = apps.get_model('accounts', 'User')
+    for index in NAME_INDEXES:
+        schema_editor.add_index(User, index)
+
+
+def drop_name_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    User = apps.get_model('accounts', 'User')
+    for index in NAME_INDEXES:
+        schema_editor.remove_index(User, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_profile_photo'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.TrigramExtension(),
+        # Not added to the model state: any later SQLite rebuild of the
+        # user table would replay them and fail on gin_trgm_ops
+        migrations.RunPython(create_name_indexes, drop_name_indexes),
+    ]
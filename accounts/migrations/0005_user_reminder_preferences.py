@@ -0,0 +1,23 @@
+# Generated by Django 4.2.11 on 2026-10-17 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_name_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='reminder_time',
+            field=models.TimeField(blank=True, help_text='Preferred local time for the EOD reminder (blank = default)', null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='reminder_timezone',
+            field=models.CharField(blank=True, help_text='Time zone for EOD reminders (blank = organization time zone)', max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-17 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_reminder_preferences'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='avatar_renditions',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -45,6 +45,24 @@ class User(AbstractUser):
         null=True,
         help_text='Profile photo (optional, max 2MB, JPG/PNG only)'
     )
+    # Resized copies of profile_photo (see accounts.avatars); NULL until generated
+    avatar_renditions = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+    # EOD reminder preferences (blank = organization defaults)
+    reminder_timezone = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        help_text='Time zone for EOD reminders (blank = organization time zone)'
+    )
+    reminder_time = models.TimeField(
+        null=True,
+        blank=True,
+        help_text='Preferred local time for the EOD reminder (blank = default)'
+    )
     # Note: date_joined is inherited from AbstractUser
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -52,6 +70,9 @@ class User(AbstractUser):
         ordering = ['username']
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        # The trigram indexes serving case-insensitive name search are
+        # created on PostgreSQL only by migration 0004 and kept out of the
+        # model, so SQLite table rebuilds don't try to recreate them
 
     def __str__(self):
         return f"{self.get_full_name()} ({self.get_role_display()})"
@@ -0,0 +1,20 @@
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from .models import User
+
+
+@receiver(pre_save, sender=User)
+def reset_avatar_renditions(sender, instance, raw=False, update_fields=None, **kwargs):
+    """A new or removed photo needs new renditions (old files are left to gc_media)"""
+    if raw or instance._state.adding or not instance.pk:
+        return
+    if update_fields is not None and 'profile_photo' not in update_fields:
+        return
+    old_photo = User.objects.filter(pk=instance.pk).values_list('profile_photo', flat=True).first()
+    if (old_photo or '') == (instance.profile_photo.name or ''):
+        return
+    instance.avatar_renditions = None
+    if update_fields is not None:
+        # avatar_renditions isn't part of this save
+        User.objects.filter(pk=instance.pk).update(avatar_renditions=None)
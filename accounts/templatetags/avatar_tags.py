@@ -1,5 +1,6 @@
 from django import template
-from django.utils.safestring import mark_safe
+
+from accounts import avatars
 
 register = template.Library()
 
@@ -8,46 +9,13 @@ register = template.Library()
 def avatar_html(user, size='md'):
     """
     Generate avatar HTML for a user.
-    Returns either an image tag (if profile photo exists) or initials avatar.
+    Returns a responsive <picture> (WebP + JPEG renditions) if the user has a
+    profile photo, otherwise an initials avatar.
 
     Usage: {{ user|avatar_html:"md" }}
-    Sizes: sm (32px), md (64px), lg (128px)
+    Sizes: sm (32px), md (64px), lg (128px), xl (200px)
     """
-    size_map = {
-        'sm': '32',
-        'md': '64',
-        'lg': '128',
-        'xl': '200',
-    }
-
-    px_size = size_map.get(size, '64')
-
-    if user.profile_photo:
-        # Return image tag
-        return mark_safe(
-            f'<img src="{user.profile_photo.url}" '
-            f'alt="{user.get_full_name()}" '
-            f'class="avatar-circle avatar-{size}" '
-            f'width="{px_size}" height="{px_size}" '
-            f'style="width: {px_size}px; height: {px_size}px; object-fit: cover; border-radius: 50%;">'
-        )
-    else:
-        # Return initials avatar
-        initials = user.get_initials()
-        color = user.get_avatar_color()
-        font_size = int(int(px_size) * 0.4)  # 40% of avatar size
-
-        return mark_safe(
-            f'<div class="avatar-initials avatar-{size}" '
-            f'style="width: {px_size}px; height: {px_size}px; '
-            f'background-color: {color}; color: white; '
-            f'border-radius: 50%; display: inline-flex; '
-            f'align-items: center; justify-content: center; '
-            f'font-weight: bold; font-size: {font_size}px; '
-            f'text-transform: uppercase;">'
-            f'{initials}'
-            f'</div>'
-        )
+    return avatars.avatar_html(user, size)
 
 
 @register.simple_tag
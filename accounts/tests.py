@@ -1,3 +1,129 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import BytesIO, StringIO
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from accounts import avatars
+from accounts.models import User
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def photo_upload(color='red'):
+    buffer = BytesIO()
+    Image.new('RGB', (600, 400), color).save(buffer, 'JPEG')
+    return SimpleUploadedFile('me.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class AvatarRenditionTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user('pic', 'pic@example.com', 'x', first_name='Pia', last_name='Ito')
+
+    def upload(self, color='red'):
+        self.user.profile_photo = photo_upload(color)
+        self.user.save()
+
+    def test_renditions_generated_off_request_path(self):
+        self.upload()
+        self.assertIsNone(self.user.avatar_renditions)
+        self.assertIn(self.user.profile_photo.url, avatars.avatar_html(self.user, 'sm'))
+
+        call_command('generate_avatars', stdout=StringIO())
+        self.user.refresh_from_db()
+        self.assertEqual(sorted(map(int, self.user.avatar_renditions)), avatars.RENDITION_PIXELS)
+        with Image.open(avatars.default_storage.open(self.user.avatar_renditions['64']['webp'])) as image:
+            self.assertEqual((image.format, image.size), ('WEBP', (64, 64)))
+
+        html = avatars.avatar_html(self.user, 'sm')
+        self.assertIn('<source type="image/webp"', html)
+        url = avatars.default_storage.url
+        self.assertIn(f"{url(self.user.avatar_renditions['32']['jpeg'])} 1x", html)
+        self.assertIn(f"{url(self.user.avatar_renditions['64']['jpeg'])} 2x", html)
+
+    def test_new_photo_resets_renditions(self):
+        self.upload()
+        call_command('generate_avatars', stdout=StringIO())
+        self.user.refresh_from_db()
+        old = self.user.avatar_renditions['32']['jpeg']
+
+        self.upload('blue')
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.avatar_renditions)
+        self.assertTrue(avatars.default_storage.exists(old))
+
+        call_command('gc_media', '--min-age', '0', '--pause', '0', stdout=StringIO())
+        self.assertFalse(avatars.default_storage.exists(old))
+        self.assertTrue(avatars.default_storage.exists(self.user.profile_photo.name))
+
+    def test_identical_photos_share_files(self):
+        other = User.objects.create_user('twin', 'twin@example.com', 'x')
+        self.upload()
+        other.profile_photo = photo_upload()
+        other.save()
+        self.assertEqual(other.profile_photo.name, self.user.profile_photo.name)
+
+        call_command('generate_avatars', stdout=StringIO())
+        self.user.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(other.avatar_renditions, self.user.avatar_renditions)
+
+    def test_clearing_a_shared_photo_keeps_the_file(self):
+        other = User.objects.create_user('twin', 'twin@example.com', 'x')
+        self.upload()
+        other.profile_photo = photo_upload()
+        other.save()
+        call_command('generate_avatars', stdout=StringIO())
+        other.refresh_from_db()
+
+        self.user.manager = User.objects.create_user('boss', 'boss@example.com', 'x', role='MANAGER')
+        self.user.save()
+        self.client.force_login(self.user)
+        response = self.client.post(reverse('accounts:profile'), {
+            'first_name': 'Pia', 'last_name': 'Ito', 'email': 'pic@example.com',
+            'clear_profile_photo': 'on',
+        })
+        self.assertRedirects(response, reverse('accounts:profile'))
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.profile_photo)
+
+        self.assertTrue(avatars.default_storage.exists(other.profile_photo.name))
+        for formats in other.avatar_renditions.values():
+            for name in formats.values():
+                self.assertTrue(avatars.default_storage.exists(name))
+
+    def test_avatars_render_without_queries(self):
+        self.upload()
+        call_command('generate_avatars', stdout=StringIO())
+        self.client.force_login(self.user)
+        # The profile page shows the user's avatar three times (navbar, header, form);
+        # its only queries are the session and the user
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('accounts:profile'))
+        self.assertContains(response, '<source type="image/webp"', count=3)
+
+    def test_initials_without_photo(self):
+        html = avatars.avatar_html(self.user, 'lg')
+        self.assertIn('avatar-initials avatar-lg', html)
+        self.assertIn('PI', html)
+
+
+class UserMigrationStateTests(TestCase):
+
+    def test_trigram_indexes_stay_out_of_the_migration_state(self):
+        # SQLite rebuilds the table from this state on most field changes
+        state = MigrationLoader(connection).project_state()
+        self.assertEqual(state.models['accounts', 'user'].options.get('indexes', []), [])
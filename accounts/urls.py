@@ -1,6 +1,7 @@
 from django.urls import path
 from django.contrib.auth import views as auth_views
 from . import views
+from .forms import OutboxPasswordResetForm
 
 app_name = 'accounts'
 
@@ -14,6 +15,7 @@ urlpatterns = [
     # Password Reset URLs (Forgot Password)
     path('password-reset/',
          auth_views.PasswordResetView.as_view(
+             form_class=OutboxPasswordResetForm,
              template_name='accounts/password_reset.html',
              email_template_name='accounts/password_reset_email.html',
              subject_template_name='accounts/password_reset_subject.txt',
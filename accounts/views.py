@@ -94,12 +94,10 @@ def profile_view(request):
         if form.is_valid():
             user = form.save(commit=False)
 
-            # Handle profile photo removal
+            # Handle profile photo removal; the file may be shared with other
+            # users, so it (and its renditions) is left for gc_media
             if form.cleaned_data.get('clear_profile_photo'):
-                if user.profile_photo:
-                    # Delete old photo file
-                    user.profile_photo.delete(save=False)
-                    user.profile_photo = None
+                user.profile_photo = None
 
             user.save()
             messages.success(request, 'Profile updated successfully!')
@@ -0,0 +1,225 @@
+"""
+Per-request query and latency budgets.
+
+RequestBudgetMiddleware measures every request: number of queries, time
+spent in the database, time spent rendering templates and total latency.
+The numbers are checked against the budget for the resolved view name in
+settings.REQUEST_BUDGETS (falling back to its 'default' entry), and
+requests over budget are logged as one JSON object per line to the
+'eod_project.budgets' logger (logs/request_budgets.log). Staff users get
+the measurements in a Server-Timing header, which browsers show in the
+network panel.
+
+Queries are counted through a database execute wrapper and templates are
+timed around the template backend's render(), counting only the outermost
+render (form widgets render templates of their own inside the page's);
+both report to the current request through a context variable, so queries the async views run in
+worker threads are counted too. DB time spent while rendering (lazy
+querysets) is included in both db and template time.
+"""
+import json
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends.django import Template
+from django.utils import timezone
+from django.utils.functional import LazyObject, empty
+
+logger = logging.getLogger('eod_project.budgets')
+
+BUDGET_METRICS = ('queries', 'db_ms', 'template_ms', 'total_ms')
+
+_current = ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    """Measurements for one request; updated from any thread serving it"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.template = 0.0
+        self.template_depth = 0
+        self.total = None
+        self._lock = threading.Lock()
+
+    def add_query(self, seconds):
+        with self._lock:
+            self.queries += 1
+            self.db += seconds
+
+    def start_template(self):
+        """Enter a render; returns whether it is the outermost one"""
+        with self._lock:
+            self.template_depth += 1
+            return self.template_depth == 1
+
+    def end_template(self, seconds, outermost):
+        with self._lock:
+            self.template_depth -= 1
+            if outermost:
+                self.template += seconds
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+    def metrics(self):
+        return {
+            'queries': self.queries,
+            'db_ms': round(self.db * 1000, 1),
+            'template_ms': round(self.template * 1000, 1),
+            'total_ms': round(self.total * 1000, 1),
+        }
+
+
+def record_query(execute, sql, params, many, context):
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.add_query(time.perf_counter() - started)
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install_on_open_connections():
+    """Cover this thread's connections opened before the middleware was loaded"""
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(None, connection)
+
+
+def _timed_render(render):
+    def wrapper(self, context=None, request=None):
+        timing = _current.get()
+        if timing is None:
+            return render(self, context, request)
+        outermost = timing.start_template()
+        started = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            timing.end_template(time.perf_counter() - started, outermost)
+    wrapper.timed = True
+    return wrapper
+
+
+if not getattr(Template.render, 'timed', False):
+    Template.render = _timed_render(Template.render)
+
+
+_budgets = {}
+
+
+@receiver(setting_changed)
+def clear_budgets(setting, **kwargs):
+    if setting == 'REQUEST_BUDGETS':
+        _budgets.clear()
+
+
+def budget_for(view_name):
+    """Limits for ``view_name``: its REQUEST_BUDGETS entry over the default"""
+    if view_name not in _budgets:
+        budgets = getattr(settings, 'REQUEST_BUDGETS', {})
+        _budgets[view_name] = {**budgets.get('default', {}), **budgets.get(view_name, {})}
+    return _budgets[view_name]
+
+
+def over_budget(metrics, budget):
+    """{metric: [measured, limit]} for every limit exceeded"""
+    return {
+        name: [metrics[name], budget[name]]
+        for name in BUDGET_METRICS
+        if budget.get(name) is not None and metrics[name] > budget[name]
+    }
+
+
+def server_timing(metrics):
+    return (
+        f'db;dur={metrics["db_ms"]};desc="{metrics["queries"]} queries", '
+        f'tpl;dur={metrics["template_ms"]};desc="Templates", '
+        f'total;dur={metrics["total_ms"]};desc="Total"'
+    )
+
+
+class RequestBudgetMiddleware:
+    """Measure each request, log budget violations and send Server-Timing to staff"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        install_on_open_connections()
+        timing = RequestTiming()
+        token = _current.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        timing.finish()
+        self.process(request, response, timing, *self.user_info(request))
+        return response
+
+    async def __acall__(self, request):
+        timing = RequestTiming()
+        token = _current.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        timing.finish()
+        self.process(request, response, timing, *self.user_info(request))
+        return response
+
+    def user_info(self, request):
+        """(is staff, user id) of the request's user, if the request loaded it"""
+        user = getattr(request, 'user', None)
+        # Don't run the session and user queries just for this
+        if user is None or (isinstance(user, LazyObject) and user._wrapped is empty):
+            return False, None
+        if not user.is_authenticated:
+            return False, None
+        return user.is_staff, user.pk
+
+    def process(self, request, response, timing, is_staff, user_id):
+        metrics = timing.metrics()
+        if is_staff:
+            response['Server-Timing'] = server_timing(metrics)
+
+        match = request.resolver_match
+        if match is None:
+            return
+        exceeded = over_budget(metrics, budget_for(match.view_name))
+        if exceeded:
+            logger.warning(json.dumps({
+                'time': timezone.now().isoformat(),
+                'view': match.view_name,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'user': user_id,
+                **metrics,
+                'over': exceeded,
+            }))
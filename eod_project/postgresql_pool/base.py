@@ -0,0 +1,78 @@
+"""
+PostgreSQL backend that takes connections from a per-process pool.
+
+Use it as ENGINE 'eod_project.postgresql_pool' and configure the pool with
+a POOL entry in the database settings:
+
+    'POOL': {'MIN_SIZE': 2, 'MAX_SIZE': 10, 'MAX_LIFETIME': 1800, 'TIMEOUT': 10}
+
+With CONN_MAX_AGE = 0 Django "closes" the connection at the end of every
+request, which here returns it to the pool, so a web worker or management
+command only holds a connection while it is using one. Threads (the
+scheduler, bulk mail senders) share the same pool.
+"""
+from functools import partial
+
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.creation import DatabaseCreation as BaseDatabaseCreation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from .pool import close_pools, get_pool
+
+POOL_DEFAULTS = {
+    'MIN_SIZE': 0,
+    'MAX_SIZE': 10,
+    'MAX_LIFETIME': 30 * 60,
+    'TIMEOUT': 10,
+    'CHECK': True,
+}
+
+
+class DatabaseCreation(BaseDatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would keep the test database from being dropped
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+
+    def get_pool(self, conn_params):
+        options = {**POOL_DEFAULTS, **self.settings_dict.get('POOL', {})}
+        key = (self.alias, tuple(sorted((k, repr(v)) for k, v in conn_params.items())))
+        return get_pool(
+            key,
+            partial(super().get_new_connection, conn_params),
+            min_size=options['MIN_SIZE'],
+            max_size=options['MAX_SIZE'],
+            max_lifetime=options['MAX_LIFETIME'],
+            timeout=options['TIMEOUT'],
+            check=options['CHECK'],
+            name=self.alias,
+        )
+
+    def get_new_connection(self, conn_params):
+        if self.alias == NO_DB_ALIAS:
+            # Maintenance connections (creating/dropping databases) aren't pooled
+            return super().get_new_connection(conn_params)
+        self.pool = self.get_pool(conn_params)
+        connection = self.pool.getconn()
+        # Normally set by the connection that opened it
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED)
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None or self.pool is None:
+            return super()._close()
+        pool, self.pool = self.pool, None
+        with self.wrap_database_errors:
+            pool.putconn(self.connection)
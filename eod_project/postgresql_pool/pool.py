@@ -0,0 +1,234 @@
+"""
+Thread-safe pool of psycopg2 connections, one per process and database.
+
+Connections are checked for health when they are handed out, replaced once
+they are older than ``max_lifetime``, and the pool never holds more than
+``max_size`` connections; callers wait up to ``timeout`` seconds for one to
+be returned before giving up.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from psycopg2 import extensions
+
+logger = logging.getLogger('eod_project.db')
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    pass
+
+
+class ConnectionPool:
+
+    def __init__(self, connect, min_size=0, max_size=10, max_lifetime=1800.0,
+                 timeout=10.0, check=True, name='default'):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError(f'Invalid pool size for {name!r}: min {min_size}, max {max_size}')
+        self.connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.check = check
+        self.name = name
+        self.pid = os.getpid()
+
+        self._lock = threading.Condition()
+        # (connection, opened at) of connections not in use, most recent last
+        self._idle = deque()
+        self._size = 0
+        self._waiting = 0
+        self.stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time': 0.0,
+            'timeouts': 0,
+            'opened': 0,
+            'closed': 0,
+            'failed_checks': 0,
+        }
+        self._opened_at = {}
+
+        if min_size:
+            threading.Thread(target=self._fill, name=f'db-pool-{name}', daemon=True).start()
+
+    def _fill(self):
+        """Open connections up to min_size (runs in the background)"""
+        while True:
+            with self._lock:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._open()
+            except Exception:
+                logger.exception('Could not pre-open a connection for pool %s', self.name)
+                with self._lock:
+                    self._size -= 1
+                return
+            self.putconn(conn)
+
+    def _open(self):
+        conn = self.connect()
+        with self._lock:
+            self._opened_at[id(conn)] = time.monotonic()
+            self.stats['opened'] += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._opened_at.pop(id(conn), None)
+            self._size -= 1
+            self.stats['closed'] += 1
+            self._lock.notify()
+
+    def _expired(self, conn):
+        opened_at = self._opened_at.get(id(conn), 0)
+        return time.monotonic() - opened_at > self.max_lifetime
+
+    def _healthy(self, conn):
+        if conn.closed:
+            return False
+        if not self.check:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if not conn.autocommit:
+                conn.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+    def getconn(self):
+        """A healthy connection from the pool, opening one if there is room"""
+        deadline = time.monotonic() + self.timeout
+        waited = None
+        while True:
+            with self._lock:
+                conn = None
+                while conn is None:
+                    if self._idle:
+                        conn = self._idle.pop()
+                    elif self._size < self.max_size:
+                        self._size += 1
+                        break
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.stats['timeouts'] += 1
+                            logger.warning(
+                                'Timed out after %.1fs waiting for a connection from pool %s (%s)',
+                                self.timeout, self.name, self.metrics(),
+                            )
+                            raise PoolTimeout(
+                                f'No connection available in pool {self.name!r} '
+                                f'after {self.timeout:.1f}s ({self.max_size} in use)'
+                            )
+                        if waited is None:
+                            waited = time.monotonic()
+                            self.stats['waits'] += 1
+                        self._waiting += 1
+                        try:
+                            self._lock.wait(remaining)
+                        finally:
+                            self._waiting -= 1
+                self.stats['checkouts'] += 1
+                if waited is not None:
+                    self.stats['wait_time'] += time.monotonic() - waited
+
+            if conn is None:
+                try:
+                    return self._open()
+                except BaseException:
+                    with self._lock:
+                        self._size -= 1
+                        self._lock.notify()
+                    raise
+
+            # Health check outside the lock; it's a round trip to the server
+            if self._expired(conn):
+                self._discard(conn)
+            elif self._healthy(conn):
+                return conn
+            else:
+                with self._lock:
+                    self.stats['failed_checks'] += 1
+                self._discard(conn)
+
+    def putconn(self, conn):
+        """Return ``conn`` to the pool, or close it if it can't be reused"""
+        if conn.closed or self._expired(conn) or os.getpid() != self.pid:
+            self._discard(conn)
+            return
+        try:
+            if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except psycopg2.Error:
+            self._discard(conn)
+            return
+        with self._lock:
+            self._idle.append(conn)
+            self._lock.notify()
+
+    def close(self):
+        """Close idle connections; connections in use are closed when returned"""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+            # Anything returned from now on is discarded
+            self.max_lifetime = -1
+        for conn in idle:
+            self._discard(conn)
+
+    def metrics(self):
+        with self._lock:
+            idle = len(self._idle)
+            return {
+                'name': self.name,
+                'size': self._size,
+                'idle': idle,
+                'in_use': self._size - idle,
+                'waiting': self._waiting,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                **self.stats,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, connect, **options):
+    """The pool for ``key`` in this process, created on first use"""
+    pool = _pools.get(key)
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.pid != os.getpid():
+            # New process (e.g. forked worker): don't touch the parent's sockets
+            pool = _pools[key] = ConnectionPool(connect, **options)
+        return pool
+
+
+def close_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        if pool.pid == os.getpid():
+            pool.close()
+
+
+def pool_metrics():
+    """Metrics of every pool in this process"""
+    return [pool.metrics() for pool in list(_pools.values()) if pool.pid == os.getpid()]
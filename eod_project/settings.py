@@ -52,6 +52,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third-party apps
     'crispy_forms',
@@ -64,6 +65,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so its latency covers the rest of the middleware
+    'eod_project.middleware.RequestBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -106,14 +109,32 @@ WSGI_APPLICATION = 'eod_project.wsgi.application'
 # }
 
 # PostgreSQL Configuration
+# Connections come from a per-process pool (eod_project/postgresql_pool):
+# at most DB_POOL_MAX_SIZE per web worker or command, checked before use and
+# replaced after DB_POOL_MAX_LIFETIME seconds. Keep (web workers + worker
+# commands) x DB_POOL_MAX_SIZE below PostgreSQL's max_connections. Set
+# DB_POOL=False to open a connection per request instead. Admins can see a
+# worker's pool metrics at /reports/ops/db-pool/.
+# Under ASGI one worker serves many requests at once and each async view
+# holds up to ASYNC_VIEW_DB_CONNECTIONS connections (below), so size
+# DB_POOL_MAX_SIZE for (concurrent dashboard requests per worker) x
+# ASYNC_VIEW_DB_CONNECTIONS; requests beyond that wait up to DB_POOL_TIMEOUT.
+DB_POOL = config('DB_POOL', default=True, cast=bool)
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'eod_project.postgresql_pool' if DB_POOL else 'django.db.backends.postgresql',
         'NAME': config('DB_NAME', default='eod_reports'),
         'USER': config('DB_USER', default='eod_user'),
         'PASSWORD': config('DB_PASSWORD', default='eod_password123'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
+        'POOL': {
+            'MIN_SIZE': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'MAX_SIZE': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'MAX_LIFETIME': config('DB_POOL_MAX_LIFETIME', default=1800, cast=int),
+            # Seconds to wait for a free connection before failing the request
+            'TIMEOUT': config('DB_POOL_TIMEOUT', default=10, cast=float),
+        },
     }
 }
 
@@ -160,11 +181,90 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Media files are named by the hash of their contents (reports/storage.py):
+# identical uploads are stored once and can be cached forever. Unreferenced
+# files are removed by `manage.py gc_media`.
+STORAGES = {
+    'default': {'BACKEND': 'reports.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Cache shared by every web worker and management command, so an
+# invalidation in one process (e.g. of cached dashboard stats) is seen by
+# all; the default LocMemCache is per process. Redis when REDIS_URL is set,
+# otherwise a database table (create it with `manage.py createcachetable`).
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+
+# Background export artifacts (not publicly served)
+EXPORT_ROOT = BASE_DIR / 'exports'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Use the async dashboard and report detail views (reports/async_views.py).
+# On by default under ASGI (eod_project/asgi.py); compare the two with
+# `manage.py benchmark_dashboards`.
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
+
+# Database connections one async view request runs its queries on at once.
+# Without the pool every one is a new connection, so the queries share one.
+ASYNC_VIEW_DB_CONNECTIONS = config('ASYNC_VIEW_DB_CONNECTIONS', default=2 if DB_POOL else 1, cast=int)
+
+# Per-view request budgets checked by RequestBudgetMiddleware: max queries,
+# DB time, template render time and total latency (ms). Views without an
+# entry use 'default'; None disables a limit. Requests over budget are
+# logged as JSON lines to logs/request_budgets.log.
+REQUEST_BUDGETS = {
+    'default': {'queries': 25, 'db_ms': 250, 'template_ms': 250, 'total_ms': 750},
+    'reports:manager_dashboard': {'queries': 15, 'total_ms': 500},
+    'reports:employee_dashboard': {'queries': 12, 'total_ms': 400},
+    'reports:report_detail': {'queries': 10, 'total_ms': 300},
+    # Constant whatever the selection: one select, insert, rollup upsert and update
+    'reports:bulk_review': {'queries': 15, 'total_ms': 1000},
+    # Exports stream their rows after the view returns; this covers setup only
+    'reports:export_reports_excel': {'total_ms': 2000},
+    'admin:index': {'queries': None},
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'request_budgets': {
+            'class': 'logging.handlers.WatchedFileHandler',
+            'filename': BASE_DIR / 'logs' / 'request_budgets.log',
+            'formatter': 'message',
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'eod_project.budgets': {
+            'handlers': ['request_budgets'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -190,6 +290,52 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='EOD Reports <noreply@eodreports.com>')
 
+# Bulk sends (reminders, manager digests): worker threads, messages per
+# SMTP connection, and a global cap in messages per second (0 = unlimited)
+EMAIL_SEND_WORKERS = config('EMAIL_SEND_WORKERS', default=4, cast=int)
+EMAIL_BATCH_SIZE = config('EMAIL_BATCH_SIZE', default=50, cast=int)
+EMAIL_RATE_LIMIT = config('EMAIL_RATE_LIMIT', default=0, cast=float)
+
+# Staggered EOD reminders (send_eod_reminders --waves): each employee is
+# reminded at their preferred time (default below) in their own time zone,
+# plus one of REMINDER_WAVES offsets REMINDER_WAVE_INTERVAL minutes apart
+# and up to REMINDER_WAVE_JITTER seconds of jitter
+REMINDER_DEFAULT_TIME = config('REMINDER_DEFAULT_TIME', default='18:00')
+REMINDER_WAVES = config('REMINDER_WAVES', default=4, cast=int)
+REMINDER_WAVE_INTERVAL = config('REMINDER_WAVE_INTERVAL', default=10, cast=int)
+REMINDER_WAVE_JITTER = config('REMINDER_WAVE_JITTER', default=120, cast=int)
+
+# Jobs run by `manage.py run_scheduler`. "at" times are in TIME_ZONE on the
+# given days; "every" is an interval in seconds. Runs missed while no
+# scheduler was up are caught up within "grace" seconds (default one hour).
+NOTIFICATION_SCHEDULE = {
+    'eod_reminders': {
+        # Queues the reminders whose staggered time has come (see REMINDER_*)
+        'command': 'send_eod_reminders', 'args': ['--waves'], 'every': 120,
+    },
+    'manager_notifications': {
+        'command': 'send_manager_notifications', 'at': '18:30', 'days': 'mon-fri',
+    },
+    'outbox': {
+        'command': 'process_outbox', 'args': ['--once'], 'every': 60,
+    },
+    'avatars': {
+        'command': 'generate_avatars', 'every': 30,
+    },
+    'media_gc': {
+        'command': 'gc_media', 'at': '03:00', 'grace': 12 * 60 * 60,
+    },
+    'prune_exports': {
+        'command': 'run_export_worker', 'args': ['--prune-days', '7'], 'at': '02:00',
+        'grace': 12 * 60 * 60,
+    },
+    'report_partitions': {
+        # Monthly partitions of the report table, created months ahead (see reports.partitions)
+        'command': 'create_report_partitions', 'at': '01:00', 'grace': 24 * 60 * 60,
+    },
+}
+SCHEDULER_WORKERS = config('SCHEDULER_WORKERS', default=4, cast=int)
+
 # Note: For production emails, set these in .env file:
 # EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend
 # EMAIL_HOST=smtp.gmail.com
@@ -1,5 +1,9 @@
-from django.contrib import admin
-from .models import EODReport, ReportReview
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import ORDER_VAR, SEARCH_VAR, ChangeList
+from django.utils import timezone
+from .models import EODReport, ReportReview, DailyReportRollup, ExportJob, Outbox, ScheduledJob
+from .reviews import bulk_review
+from .search import annotate_search, highlight, matching_reports, search_enabled
 
 
 class ReportReviewInline(admin.StackedInline):
@@ -11,13 +15,23 @@ class ReportReviewInline(admin.StackedInline):
     readonly_fields = ['reviewed_at']
 
 
+class EODReportChangeList(ChangeList):
+    """Lists ranked search results best match first unless a column is sorted on"""
+
+    def get_ordering(self, request, queryset):
+        ordering = super().get_ordering(request, queryset)
+        if 'search_rank' in queryset.query.annotations and ORDER_VAR not in self.params:
+            ordering = ['-search_rank', *ordering]
+        return ordering
+
+
 @admin.register(EODReport)
 class EODReportAdmin(admin.ModelAdmin):
     """Admin for EOD Reports"""
 
     list_display = ['employee', 'report_date', 'project_name', 'hours_worked', 'status', 'submitted_at']
     list_filter = ['status', 'report_date', 'employee__department', 'project_name']
-    search_fields = ['employee__username', 'employee__first_name', 'employee__last_name', 'project_name', 'tasks_completed']
+    search_fields = ['employee__username', 'employee__first_name', 'employee__last_name', 'project_name']
     date_hierarchy = 'report_date'
     ordering = ['-report_date', '-submitted_at']
     readonly_fields = ['submitted_at', 'updated_at']
@@ -41,16 +55,51 @@ class EODReportAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         return qs.select_related('employee', 'employee__manager')
 
+    def get_changelist(self, request, **kwargs):
+        return EODReportChangeList
+
+    def get_list_display(self, request):
+        list_display = super().get_list_display(request)
+        if search_enabled() and request.GET.get(SEARCH_VAR):
+            list_display = [*list_display, 'search_match']
+        return list_display
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Match names as before, plus report content through the full-text
+        index. On PostgreSQL the results are ranked by their content match.
+        """
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            results |= matching_reports(queryset, search_term)
+            if search_enabled():
+                results = annotate_search(results, search_term)
+        return results, may_have_duplicates
+
+    def search_match(self, obj):
+        return highlight(getattr(obj, 'search_headline', ''))
+    search_match.short_description = 'Match'
+
     actions = ['approve_reports', 'reject_reports']
 
+    def _review_reports(self, request, queryset, decision, action):
+        """Review the selected pending reports as the admin user, recording ReportReview history"""
+        reviewed = bulk_review(queryset, request.user, decision)
+        self.message_user(request, f'{len(reviewed)} report(s) {action}.')
+        skipped = queryset.count() - len(reviewed)
+        if skipped:
+            self.message_user(
+                request,
+                f'{skipped} report(s) skipped: only pending reports can be reviewed.',
+                messages.WARNING,
+            )
+
     def approve_reports(self, request, queryset):
-        updated = queryset.update(status='APPROVED')
-        self.message_user(request, f'{updated} report(s) approved successfully.')
+        self._review_reports(request, queryset, 'APPROVED', 'approved')
     approve_reports.short_description = 'Approve selected reports'
 
     def reject_reports(self, request, queryset):
-        updated = queryset.update(status='REJECTED')
-        self.message_user(request, f'{updated} report(s) rejected.')
+        self._review_reports(request, queryset, 'REJECTED', 'rejected')
     reject_reports.short_description = 'Reject selected reports'
 
 
@@ -67,3 +116,68 @@ class ReportReviewAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         return qs.select_related('report', 'report__employee', 'reviewer')
+
+
+@admin.register(DailyReportRollup)
+class DailyReportRollupAdmin(admin.ModelAdmin):
+    """Read-only admin for the daily report rollup (rebuild with rebuild_report_rollup)"""
+
+    list_display = ['report_date', 'manager', 'department', 'status', 'report_count', 'hours_worked']
+    list_filter = ['status', 'department']
+    date_hierarchy = 'report_date'
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.select_related('manager')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    """Admin for background export jobs"""
+
+    list_display = ['id', 'requested_by', 'scope', 'status', 'rows_written', 'total_rows', 'created_at', 'finished_at']
+    list_filter = ['status', 'created_at']
+    readonly_fields = ['cache_key', 'created_at', 'started_at', 'finished_at']
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.select_related('requested_by')
+
+
+@admin.register(Outbox)
+class OutboxAdmin(admin.ModelAdmin):
+    """Admin for queued and delivered emails"""
+
+    list_display = ['id', 'subject', 'status', 'attempts', 'created_at', 'next_attempt_at', 'sent_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['subject', 'dedupe_key']
+    readonly_fields = ['dedupe_key', 'attempts', 'last_error', 'created_at', 'claimed_at', 'sent_at']
+    actions = ['retry_now']
+
+    def retry_now(self, request, queryset):
+        """Put failed or waiting messages back at the front of the queue"""
+        updated = queryset.filter(status__in=['PENDING', 'FAILED']).update(
+            status='PENDING', next_attempt_at=timezone.now(), claimed_at=None
+        )
+        self.message_user(request, f'{updated} message(s) queued for retry.')
+    retry_now.short_description = 'Retry selected messages now'
+
+
+@admin.register(ScheduledJob)
+class ScheduledJobAdmin(admin.ModelAdmin):
+    """Read-only view of run_scheduler state"""
+
+    list_display = ['name', 'last_slot', 'last_status', 'last_started_at', 'last_finished_at', 'owner']
+    list_filter = ['last_status']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
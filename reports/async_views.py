@@ -0,0 +1,156 @@
+"""
+Async variants of the dashboard and report detail views, used instead of
+the ones in views.py when the site runs under ASGI (settings.ASYNC_VIEWS).
+
+Each view starts its independent queries at once and awaits them together.
+Django 4.2's async ORM methods all run on the one thread-sensitive sync
+thread, so gathering them would still run the queries one after another;
+instead the queries are shared out among up to ASYNC_VIEW_DB_CONNECTIONS
+worker threads, each with its own database connection (taken from and
+returned to the connection pool) that it uses for all of its queries.
+Templates are rendered in the sync thread as usual.
+
+The gain over the sync views has only been measured against SQLite
+(benchmark_dashboards), not yet on PostgreSQL with the pool.
+"""
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.views import redirect_to_login
+from django.db import connections
+from django.http import Http404
+from django.shortcuts import redirect, render
+from django.utils import timezone
+
+from .filters import filtered_team_reports
+from .models import EODReport, ReportReview
+from .stats import get_employee_stats, get_manager_stats
+from .utils import get_week_date_range
+from .views import (
+    _employee_dashboard_context, _manager_dashboard_context, _recent_export_jobs,
+    _recent_reports, _rejected_editable_reports, _report_access_denied, _report_detail_context,
+    _report_page,
+)
+
+
+async def run_queries(*calls):
+    """
+    Await the results of ``calls``, (func, *args) tuples, in order. They run
+    in at most ASYNC_VIEW_DB_CONNECTIONS worker threads, each calling its
+    share one after another on one database connection, so a request never
+    holds more connections than that.
+    """
+    lanes = max(1, min(settings.ASYNC_VIEW_DB_CONNECTIONS, len(calls)))
+    results = [None] * len(calls)
+
+    def run_lane(lane):
+        try:
+            for index in range(lane, len(calls), lanes):
+                func, *args = calls[index]
+                results[index] = func(*args)
+        finally:
+            # Hand the thread's connection back; worker threads are reused
+            connections.close_all()
+
+    await asyncio.gather(*(
+        sync_to_async(run_lane, thread_sensitive=False)(lane) for lane in range(lanes)
+    ))
+    return results
+
+
+def evaluated(queryset):
+    """``queryset`` with its results fetched, so templates don't query again"""
+    len(queryset)
+    return queryset
+
+
+def async_login_required(view):
+    """login_required for async views"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        # Resolve the lazy request.user (a session and user query) off the event loop
+        if not await sync_to_async(lambda: request.user.is_authenticated)():
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+@async_login_required
+async def employee_dashboard_view(request):
+    """Employee dashboard showing their reports"""
+    user = request.user
+    today = timezone.now().date()
+    reports, today_report, rejected, stats = await run_queries(
+        (evaluated, _recent_reports(user)),
+        (EODReport.objects.filter(employee=user, report_date=today).first,),
+        (evaluated, _rejected_editable_reports(user)),
+        (get_employee_stats, user),
+    )
+    context = _employee_dashboard_context(
+        reports=reports,
+        today=today,
+        today_report=today_report,
+        rejected_editable_reports=rejected,
+        stats=stats,
+    )
+    return await sync_to_async(render)(request, 'reports/employee_dashboard.html', context)
+
+
+@async_login_required
+async def manager_dashboard_view(request):
+    """Manager dashboard for reviewing team reports"""
+    user = request.user
+    if not (user.is_manager() or user.is_admin_user()):
+        messages.error(request, 'You do not have permission to access this page.')
+        return redirect('reports:employee_dashboard')
+
+    def report_page():
+        reports, filter_form, _ = filtered_team_reports(user, request.GET)
+        reports, next_cursor = _report_page(request, reports, filter_form)
+        # Search results come back as a queryset
+        return list(reports), next_cursor, filter_form
+
+    week_start, week_end = get_week_date_range()
+    queries = [
+        (report_page,),
+        (evaluated, _recent_export_jobs(user)),
+        (get_manager_stats, user, week_start, week_end),
+    ]
+    # Admins see everyone and get no team list (as in filtered_team_reports)
+    if not user.is_admin_user():
+        queries.append((evaluated, user.get_team_members()))
+    (reports, next_cursor, filter_form), export_jobs, stats, *team = await run_queries(*queries)
+    team_members = team[0] if team else None
+
+    context = _manager_dashboard_context(
+        reports=reports,
+        next_cursor=next_cursor,
+        filter_form=filter_form,
+        team_members=team_members,
+        export_jobs=export_jobs,
+        stats=stats,
+    )
+    return await sync_to_async(render)(request, 'reports/manager_dashboard.html', context)
+
+
+@async_login_required
+async def report_detail_view(request, pk):
+    """View individual report details"""
+    # The reviews are fetched alongside the report and dropped if access is denied
+    report, reviews = await run_queries(
+        (EODReport.objects.select_related('employee').filter(pk=pk).first,),
+        (evaluated, (
+            ReportReview.objects.filter(report_id=pk).select_related('reviewer').order_by('review_number')
+        )),
+    )
+    if report is None:
+        raise Http404('No EODReport matches the given query.')
+
+    denied = _report_access_denied(request, report)
+    if denied:
+        return denied
+    context = _report_detail_context(request, report, reviews)
+    return await sync_to_async(render)(request, 'reports/report_detail.html', context)
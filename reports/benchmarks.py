@@ -0,0 +1,269 @@
+"""
+View benchmarks: every URL in reports.urls and accounts.urls requested with
+the test client against seeded datasets of several sizes, measuring wall
+time, query count and peak memory per view.
+
+Results are compared with a committed baseline (benchmark_baseline.json)
+by the benchmark_views command. Query counts are exact and comparable
+anywhere; wall time and memory are only meaningful against a baseline
+recorded on the same machine and database.
+"""
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.contrib.auth import SESSION_KEY
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test import Client
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from accounts.models import User
+from .export_jobs import run_export_job, submit_export
+from .models import EODReport
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'benchmark_baseline.json'
+
+# seed_dataset() arguments per dataset size
+DATASETS = {
+    'small': {'managers': 2, 'employees': 10, 'days': 20},
+    'medium': {'managers': 5, 'employees': 100, 'days': 60},
+    'large': {'managers': 10, 'employees': 300, 'days': 120},
+}
+
+# Allowed growth over the baseline before a view counts as regressed.
+# Time and memory also need to grow by an absolute amount, so that noise
+# on views taking a few milliseconds doesn't fail the run.
+DEFAULT_TOLERANCES = {
+    'queries': 0,
+    'time_percent': 50,
+    'time_ms': 10,
+    'memory_percent': 25,
+    'memory_kb': 64,
+}
+
+BENCHMARKED_APPS = ('reports', 'accounts')
+
+
+def url_names():
+    """Namespaced names of every URL in the benchmarked apps"""
+    names = set()
+    for entry in get_resolver().url_patterns:
+        if isinstance(entry, URLResolver) and entry.namespace in BENCHMARKED_APPS:
+            names.update(f'{entry.namespace}:{p.name}' for p in entry.url_patterns if p.name)
+    return names
+
+
+def benchmark_fixtures():
+    """Users and objects of a seeded dataset that the view cases request as or about"""
+    manager = User.objects.filter(role='MANAGER').order_by('username').first()
+    employee = manager.team_members.order_by('username').first()
+    reports = EODReport.objects.filter(employee=employee).order_by('-report_date')
+
+    job, _ = submit_export(manager, {})
+    if not job.is_done():
+        job = run_export_job(job)
+
+    team_pending = EODReport.objects.filter(employee__manager=manager, status='PENDING')
+    pending_report = team_pending.order_by('-report_date').first()
+    editable_report = reports.filter(status='PENDING').first() or reports.first()
+
+    return {
+        'admin': User.objects.get(username='admin'),
+        'manager': manager,
+        'employee': employee,
+        'report': reports.first(),
+        'editable_report': editable_report,
+        'pending_report': pending_report,
+        # Reviewed by the bulk review case, so not the ones other cases need pending
+        'bulk_review_ids': list(
+            team_pending.exclude(pk__in=[pending_report.pk, editable_report.pk])
+            .order_by('pk').values_list('pk', flat=True)[:50]
+        ),
+        'export_job': job,
+        'uidb64': urlsafe_base64_encode(force_bytes(employee.pk)),
+        'token': default_token_generator.make_token(employee),
+    }
+
+
+def _case(name, user, args=(), query='', method='get', data=None, label=None):
+    url = reverse(name, args=args)
+    if query:
+        url = f'{url}?{query}'
+    return {
+        'label': label or name,
+        'name': name,
+        'url': url,
+        'method': method,
+        'data': data or {},
+        'user': user,
+    }
+
+
+def view_cases(fixtures):
+    """One request per benchmarked view (a few views get a second variant)"""
+    f = fixtures
+    employee, manager, admin = f['employee'], f['manager'], f['admin']
+    return [
+        # Employee pages
+        _case('reports:dashboard', employee),
+        _case('reports:employee_dashboard', employee),
+        _case('reports:submit_report', employee),
+        _case('reports:edit_report', employee, args=[f['editable_report'].pk]),
+        _case('reports:my_reports', employee),
+        _case('reports:my_report_rows', employee),
+        _case('reports:report_detail', employee, args=[f['report'].pk]),
+
+        # Manager pages
+        _case('reports:manager_dashboard', manager),
+        _case('reports:manager_dashboard', manager, query='q=login', label='reports:manager_dashboard?q'),
+        _case('reports:manager_dashboard', admin, label='reports:manager_dashboard(admin)'),
+        _case('reports:manager_report_rows', manager),
+        _case('reports:employee_autocomplete', manager, query='q=a'),
+        _case('reports:export_reports_excel', manager),
+        _case('reports:export_reports_excel', manager, query='format=csv', label='reports:export_reports_excel?csv'),
+        _case('reports:export_job_create', manager, query='status=PENDING', method='post'),
+        _case('reports:export_job_status', manager, args=[f['export_job'].pk]),
+        _case('reports:export_job_download', manager, args=[f['export_job'].pk]),
+        _case('reports:review_report', manager, args=[f['pending_report'].pk]),
+        # Only the warm-up request finds the reports pending; the measured
+        # ones select and skip them
+        _case('reports:bulk_review', manager, method='post', data={
+            'report_ids': f['bulk_review_ids'], 'decision': 'APPROVED',
+        }),
+        _case('reports:db_pool_metrics', admin),
+
+        # Accounts
+        _case('accounts:login', None),
+        _case('accounts:logout', employee),
+        _case('accounts:register', None),
+        _case('accounts:profile', employee),
+        _case('accounts:change_password', employee),
+        _case('accounts:password_reset', None),
+        _case('accounts:password_reset_done', None),
+        _case('accounts:password_reset_confirm', None, args=[f['uidb64'], f['token']]),
+        _case('accounts:password_reset_complete', None),
+    ]
+
+
+class ViewRunner:
+    """Issues the requests of view cases, logging the client in as each case's user"""
+
+    def __init__(self):
+        self.clients = {}
+
+    def client_for(self, user):
+        key = user.pk if user else None
+        client = self.clients.get(key)
+        if client is None:
+            client = self.clients[key] = Client()
+        # Checked before every request: the logout case ends the session
+        if user is not None and client.session.get(SESSION_KEY) != str(user.pk):
+            client.force_login(user)
+        return client
+
+    def request(self, client, case):
+        """Issue the case's request and read the whole body. Returns the status code."""
+        response = getattr(client, case['method'])(case['url'], case['data'])
+        # The test client closes the response itself (a streamed one once it
+        # is consumed); closing it again would fire request_finished and
+        # close the connection, which breaks the test transaction on PostgreSQL
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        else:
+            response.content
+        return response.status_code
+
+    def measure(self, case, repeat=5):
+        """Status, query count, median wall time and peak traced memory of one view"""
+        user = case['user']
+        # Warm up caches, template loading and the session
+        self.request(self.client_for(user), case)
+
+        # Logging in again (for the logout case) stays outside the measured part
+        client = self.client_for(user)
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        # Not CaptureQueriesContext: the handler resets the query log on request_started
+        with connection.execute_wrapper(record):
+            status = self.request(client, case)
+
+        timings = []
+        for _ in range(repeat):
+            client = self.client_for(user)
+            started = time.perf_counter()
+            self.request(client, case)
+            timings.append(time.perf_counter() - started)
+
+        client = self.client_for(user)
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        self.request(client, case)
+        _, peak = tracemalloc.get_traced_memory()
+        if not tracing:
+            tracemalloc.stop()
+
+        return {
+            'status': status,
+            'queries': len(queries),
+            'wall_ms': round(statistics.median(timings) * 1000, 2),
+            'peak_kb': round((peak - baseline) / 1024, 1),
+        }
+
+
+def _limit(expected, percent, absolute):
+    return expected + max(expected * percent / 100, absolute)
+
+
+def compare(results, baseline, tolerances=None):
+    """
+    Regressions of ``results`` against ``baseline`` (both {dataset: {label: metrics}}),
+    as (dataset, label, metric, baseline value, measured value) tuples.
+    Views or datasets missing from the baseline are not compared.
+    """
+    tolerances = {**DEFAULT_TOLERANCES, **(tolerances or {})}
+    regressions = []
+    for dataset, views in results.items():
+        for label, measured in views.items():
+            expected = baseline.get(dataset, {}).get(label)
+            if expected is None:
+                continue
+
+            limits = {
+                'queries': expected['queries'] + tolerances['queries'],
+                'wall_ms': _limit(expected['wall_ms'], tolerances['time_percent'], tolerances['time_ms']),
+                'peak_kb': _limit(expected['peak_kb'], tolerances['memory_percent'], tolerances['memory_kb']),
+            }
+            if measured['status'] != expected['status']:
+                regressions.append((dataset, label, 'status', expected['status'], measured['status']))
+            for metric, limit in limits.items():
+                if measured[metric] > limit:
+                    regressions.append((dataset, label, metric, expected[metric], measured[metric]))
+    return regressions
+
+
+def load_baseline(path=BASELINE_PATH):
+    """The baseline file's contents, or an empty baseline if there is none yet"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'results': {}}
+
+
+def save_baseline(data, path=BASELINE_PATH):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
@@ -0,0 +1,130 @@
+"""
+Write-time processing of Summernote report content.
+
+Runs once when a report is saved: the HTML fields are sanitized against an
+allowlist, and plain-text shadows, a short preview and a word count are
+stored alongside them so exports, search and list views never re-parse HTML.
+
+Everything here is pure Python (no ORM access) so the backfill command can
+run it in worker processes.
+"""
+import re
+from html.parser import HTMLParser
+
+import bleach
+from bleach.css_sanitizer import CSSSanitizer
+
+CONTENT_FIELDS = ('tasks_completed', 'blockers_issues', 'next_day_plan')
+TEXT_FIELDS = tuple(f'{field}_text' for field in CONTENT_FIELDS)
+DERIVED_FIELDS = TEXT_FIELDS + ('preview', 'word_count')
+
+# Large columns list views never display; they show ``preview`` instead
+LIST_DEFERRED_FIELDS = CONTENT_FIELDS + TEXT_FIELDS + ('search_vector',)
+
+PREVIEW_LENGTH = 160
+
+# Matches what the Summernote toolbar (SUMMERNOTE_CONFIG) can produce
+ALLOWED_TAGS = {
+    'p', 'br', 'div', 'span', 'b', 'strong', 'i', 'em', 'u', 'font',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'pre', 'code',
+    'ul', 'ol', 'li', 'a',
+    'table', 'thead', 'tbody', 'tr', 'th', 'td',
+}
+ALLOWED_ATTRIBUTES = {
+    '*': ['style'],
+    'a': ['href', 'title', 'target', 'rel'],
+    'font': ['color'],
+    'td': ['colspan', 'rowspan'],
+    'th': ['colspan', 'rowspan'],
+}
+ALLOWED_CSS_PROPERTIES = [
+    'color', 'background-color', 'text-align', 'font-weight', 'text-decoration',
+]
+ALLOWED_PROTOCOLS = ['http', 'https', 'mailto']
+
+_cleaner = bleach.Cleaner(
+    tags=ALLOWED_TAGS,
+    attributes=ALLOWED_ATTRIBUTES,
+    protocols=ALLOWED_PROTOCOLS,
+    css_sanitizer=CSSSanitizer(allowed_css_properties=ALLOWED_CSS_PROPERTIES),
+    strip=True,
+)
+
+# Elements removed together with their content (bleach would keep the text)
+_DROP_CONTENT_RE = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+
+# Tags that start a new line of text when flattened
+_BLOCK_TAGS = {
+    'p', 'br', 'div', 'li', 'tr', 'blockquote', 'pre',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+}
+
+
+class _TextExtractor(HTMLParser):
+    """Collects text content, breaking lines at block-level elements"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+        elif tag in ('td', 'th'):
+            self.parts.append(' ')
+
+    def handle_endtag(self, tag):
+        if tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def sanitize_html(value):
+    """Allowlist-sanitize Summernote HTML"""
+    if not value:
+        return value
+    return _cleaner.clean(_DROP_CONTENT_RE.sub('', value))
+
+
+def html_to_text(value):
+    """Plain text of an HTML fragment, one line per block element"""
+    if not value:
+        return ''
+    extractor = _TextExtractor()
+    extractor.feed(value)
+    extractor.close()
+    lines = (' '.join(line.split()) for line in ''.join(extractor.parts).splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def make_preview(text, length=PREVIEW_LENGTH):
+    """Single-line snippet of ``text`` cut at a word boundary"""
+    text = ' '.join(text.split())
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(' ', 1)[0] + '…'
+
+
+def process_content(tasks_completed, blockers_issues, next_day_plan):
+    """
+    Sanitized HTML plus derived text fields for one report's content.
+    Returns a dict keyed by model field name.
+    """
+    values = {
+        'tasks_completed': sanitize_html(tasks_completed),
+        'blockers_issues': sanitize_html(blockers_issues),
+        'next_day_plan': sanitize_html(next_day_plan),
+    }
+    for field, text_field in zip(CONTENT_FIELDS, TEXT_FIELDS):
+        values[text_field] = html_to_text(values[field])
+
+    values['preview'] = make_preview(values['tasks_completed_text'])
+    values['word_count'] = sum(len(values[field].split()) for field in TEXT_FIELDS)
+    return values
+
+
+def process_content_batch(rows):
+    """Process (pk, tasks, blockers, plan) tuples; used by backfill workers"""
+    return [(pk, process_content(*content)) for pk, *content in rows]
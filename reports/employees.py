@@ -0,0 +1,54 @@
+"""
+Employee lookup for report filters and autocomplete
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from accounts.models import User
+
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_CACHE_TIMEOUT = 60
+
+
+def visible_employees(user):
+    """Users whose reports ``user`` may see: their team, or everyone for admins"""
+    if user.is_admin_user():
+        return User.objects.all()
+    return user.get_team_members()
+
+
+def name_matches(users, term):
+    """Case-insensitive name match (served by the trigram indexes on PostgreSQL)"""
+    return users.filter(
+        Q(first_name__icontains=term) |
+        Q(last_name__icontains=term) |
+        Q(username__icontains=term)
+    )
+
+
+def matching_employee_ids(user, term):
+    """IDs of the visible employees matching ``term``, for ``employee_id__in`` filters"""
+    return list(name_matches(visible_employees(user), term).values_list('id', flat=True))
+
+
+def autocomplete_employees(user, term):
+    """Up to AUTOCOMPLETE_LIMIT suggestions for ``term``, cached briefly per user"""
+    term = term.strip().lower()
+    digest = hashlib.md5(term.encode()).hexdigest()
+    key = f'reports:employee_autocomplete:{user.pk}:{digest}'
+    suggestions = cache.get(key)
+    if suggestions is None:
+        users = name_matches(visible_employees(user), term).order_by('first_name', 'last_name')
+        suggestions = [
+            {
+                'id': employee.pk,
+                'name': employee.get_full_name() or employee.username,
+                'username': employee.username,
+                'department': employee.department or '',
+            }
+            for employee in users.only('id', 'first_name', 'last_name', 'username', 'department')[:AUTOCOMPLETE_LIMIT]
+        ]
+        cache.set(key, suggestions, AUTOCOMPLETE_CACHE_TIMEOUT)
+    return suggestions
@@ -0,0 +1,197 @@
+"""
+Background export jobs.
+
+Managers submit an export from the dashboard; the run_export_worker command
+builds it outside the request cycle and stores the file under EXPORT_ROOT.
+Artifacts are keyed by (scope, filter params, data version) so an identical
+request is served from the finished file until the underlying reports change.
+
+The worker records a heartbeat on the job as it writes rows; a running job
+whose heartbeat is older than EXPORT_JOB_TIMEOUT belonged to a worker that
+died, and release_stale_jobs() queues it again (or fails it after
+EXPORT_JOB_MAX_ATTEMPTS tries).
+"""
+import hashlib
+import json
+import tempfile
+from datetime import timedelta
+
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+
+from accounts.models import User
+from .exports import write_reports_xlsx
+from .filters import filtered_team_reports
+from .models import ExportJob
+
+# Filter parameters that affect export contents
+EXPORT_PARAMS = ('date_from', 'date_to', 'status', 'employee')
+
+EXPORT_JOB_TIMEOUT = timedelta(minutes=10)
+EXPORT_JOB_MAX_ATTEMPTS = 3
+
+
+def export_scope(user):
+    """Admins share one scope; each manager's scope is their own team"""
+    if user.is_admin_user():
+        return 'all'
+    return f'manager:{user.pk}'
+
+
+def export_params(data):
+    """Non-empty export filter parameters from a GET QueryDict or dict"""
+    return {name: data.get(name) for name in EXPORT_PARAMS if data.get(name)}
+
+
+def data_version(reports):
+    """
+    Cheap fingerprint of the rows an export would contain. Any report
+    created, deleted, edited or reviewed within the scope changes it, as
+    does a change to an employee's name or department or to the comments
+    of a report's latest review. The sum of the latest review ids changes
+    when a deleted review hands that place to an older one.
+    """
+    version = reports.order_by().aggregate(
+        count=Count('id'),
+        updated=Max('updated_at'),
+        reviewed=Max('last_reviewed_at'),
+        employees=Max('employee__updated_at'),
+        reviews=Sum('last_review_id'),
+        comments=Max('last_review__updated_at'),
+    )
+    return [
+        version['count'],
+        str(version['updated']),
+        str(version['reviewed']),
+        str(version['employees']),
+        str(version['reviews']),
+        str(version['comments']),
+    ]
+
+
+def export_cache_key(user, params, reports):
+    payload = json.dumps(
+        [export_scope(user), sorted(params.items()), data_version(reports)]
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def submit_export(user, data):
+    """
+    Return (job, cached) for an export of the dashboard filters in ``data``.
+    ``cached`` is True when a finished artifact for the same scope, filters
+    and data version already exists; otherwise a new job is queued.
+    """
+    params = export_params(data)
+    reports, _, _ = filtered_team_reports(user, params)
+    cache_key = export_cache_key(user, params, reports)
+
+    existing = ExportJob.objects.filter(
+        cache_key=cache_key,
+        status__in=['QUEUED', 'RUNNING', 'DONE'],
+    ).order_by('-created_at').first()
+    if existing and existing.is_done() and existing.file:
+        return existing, True
+    if existing:
+        # Same export already on its way
+        return existing, False
+
+    job = ExportJob.objects.create(
+        requested_by=user,
+        scope=export_scope(user),
+        params=params,
+        cache_key=cache_key,
+    )
+    return job, False
+
+
+def can_access_job(user, job):
+    """Jobs (and their files) are visible to anyone with the same export scope"""
+    return job.requested_by_id == user.pk or job.scope == export_scope(user)
+
+
+def claim_next_job():
+    """Mark the oldest queued job as running and return it (None when idle)"""
+    with transaction.atomic():
+        job = (
+            ExportJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='QUEUED')
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = 'RUNNING'
+        job.started_at = job.heartbeat_at = timezone.now()
+        job.attempts += 1
+        job.save(update_fields=['status', 'started_at', 'heartbeat_at', 'attempts'])
+    return job
+
+
+def release_stale_jobs():
+    """
+    Queue running jobs whose worker stopped sending heartbeats again, or
+    mark them failed once they have used up EXPORT_JOB_MAX_ATTEMPTS.
+    Returns (requeued, failed).
+    """
+    now = timezone.now()
+    stale = ExportJob.objects.filter(status='RUNNING', heartbeat_at__lt=now - EXPORT_JOB_TIMEOUT)
+    failed = stale.filter(attempts__gte=EXPORT_JOB_MAX_ATTEMPTS).update(
+        status='FAILED',
+        error='The export worker stopped responding',
+        finished_at=now,
+    )
+    requeued = stale.update(
+        status='QUEUED',
+        started_at=None,
+        heartbeat_at=None,
+        rows_written=0,
+    )
+    return requeued, failed
+
+
+def run_export_job(job):
+    """Build the export file for a claimed job, recording progress as it goes"""
+    user = User.objects.get(pk=job.requested_by_id)
+    reports, _, _ = filtered_team_reports(user, job.params)
+    reports = reports.order_by('-report_date', '-submitted_at')
+
+    job.total_rows = reports.count()
+    job.heartbeat_at = timezone.now()
+    job.save(update_fields=['total_rows', 'heartbeat_at'])
+
+    def progress(rows_written):
+        ExportJob.objects.filter(pk=job.pk).update(
+            rows_written=rows_written, heartbeat_at=timezone.now()
+        )
+
+    try:
+        with tempfile.TemporaryFile() as export_file:
+            write_reports_xlsx(reports, export_file, progress=progress)
+            export_file.seek(0)
+            job.file.save(f'{job.cache_key}.xlsx', File(export_file), save=False)
+    except Exception as e:
+        job.status = 'FAILED'
+        job.error = str(e)
+    else:
+        job.status = 'DONE'
+        job.rows_written = job.total_rows
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'file', 'rows_written', 'finished_at'])
+    return job
+
+
+def prune_export_jobs(days):
+    """Delete jobs (and their files) finished more than ``days`` days ago"""
+    cutoff = timezone.now() - timedelta(days=days)
+    stale = ExportJob.objects.filter(finished_at__lt=cutoff)
+    pruned = 0
+    for job in stale.iterator():
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        pruned += 1
+    return pruned
@@ -0,0 +1,231 @@
+"""
+Report export writers.
+
+Exports iterate reports through a server-side cursor in fixed-size chunks
+and write rows as they arrive, so memory stays flat regardless of how many
+reports match the filters.
+"""
+import csv
+import json
+import re
+import zlib
+from itertools import chain, islice
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Rows used to estimate column widths (write-only sheets need widths up front)
+WIDTH_SAMPLE_ROWS = 200
+MIN_COLUMN_WIDTH = 12
+MAX_COLUMN_WIDTH = 50
+
+HEADERS = [
+    'Employee Name',
+    'Department',
+    'Report Date',
+    'Project Name',
+    'Tasks Completed',
+    'Hours Worked',
+    'Blockers/Issues',
+    'Next Day Plan',
+    'Status',
+    'Resubmission Count',
+    'Submitted At',
+    'Last Review Comments'
+]
+STATUS_COLUMN = HEADERS.index('Status')
+
+_HTML_TAG_RE = re.compile('<.*?>')
+
+
+def strip_html(text):
+    """Remove HTML tags from text"""
+    if not text:
+        return ''
+    return _HTML_TAG_RE.sub('', str(text)).strip()
+
+
+def report_text(report, field):
+    """Stored plain text of a content field, stripping tags if not yet processed"""
+    text = getattr(report, f'{field}_text')
+    if text is None:
+        return strip_html(getattr(report, field))
+    return text
+
+
+def export_queryset(reports):
+    """
+    Reports with everything a row needs fetched in the same query
+    (employee and the denormalized last review), streamed in chunks
+    """
+    return (
+        reports
+        .select_related('employee', 'last_review')
+        .defer('search_vector')
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+def report_row(report):
+    """One export row for ``report`` (values in HEADERS order)"""
+    last_review = report.last_review
+    review_comments = last_review.comments if last_review else 'No review yet'
+    return [
+        report.employee.get_full_name() or report.employee.username,
+        report.employee.department or 'N/A',
+        report.report_date.strftime('%Y-%m-%d'),
+        report.project_name,
+        report_text(report, 'tasks_completed'),
+        float(report.hours_worked),
+        report_text(report, 'blockers_issues') or 'None',
+        report_text(report, 'next_day_plan'),
+        report.get_status_display(),
+        report.resubmission_count,
+        report.submitted_at.strftime('%Y-%m-%d %H:%M'),
+        strip_html(review_comments)
+    ]
+
+
+def _column_widths(sample_rows):
+    """Column widths from the header and a sample of rows, within fixed bounds"""
+    widths = [len(header) for header in HEADERS]
+    for row in sample_rows:
+        for index, value in enumerate(row):
+            if value is not None:
+                widths[index] = max(widths[index], len(str(value)))
+    return [max(min(width + 2, MAX_COLUMN_WIDTH), MIN_COLUMN_WIDTH) for width in widths]
+
+
+def write_reports_xlsx(reports, fileobj, progress=None):
+    """
+    Write ``reports`` to ``fileobj`` as an .xlsx workbook using a write-only sheet.
+    ``progress``, if given, is called with the number of rows written so far
+    after every EXPORT_CHUNK_SIZE rows.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("EOD Reports")
+
+    rows = (
+        (report.status, report_row(report))
+        for report in export_queryset(reports)
+    )
+    sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+    for col_num, width in enumerate(_column_widths(row for _, row in sample), 1):
+        ws.column_dimensions[get_column_letter(col_num)].width = width
+
+    # Freeze header row
+    ws.freeze_panes = 'A2'
+
+    # Header row
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=11)
+    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    header_cells = []
+    for header in HEADERS:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    # Style for status cells
+    status_fills = {
+        'APPROVED': PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"),
+        'PENDING': PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid"),
+        'REJECTED': PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid"),
+    }
+    data_alignment = Alignment(vertical="top", wrap_text=True)
+
+    for row_count, (status, row) in enumerate(chain(sample, rows), 1):
+        cells = []
+        for index, value in enumerate(row):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.alignment = data_alignment
+            if index == STATUS_COLUMN:
+                cell.fill = status_fills.get(status, PatternFill())
+            cells.append(cell)
+        ws.append(cells)
+        if progress and row_count % EXPORT_CHUNK_SIZE == 0:
+            progress(row_count)
+
+    wb.save(fileobj)
+
+
+def report_record(report):
+    """Machine-friendly export record for ``report`` (used by NDJSON)"""
+    last_review = report.last_review
+    return {
+        'id': report.pk,
+        'employee_name': report.employee.get_full_name() or report.employee.username,
+        'employee_username': report.employee.username,
+        'department': report.employee.department,
+        'report_date': report.report_date.isoformat(),
+        'project_name': report.project_name,
+        'tasks_completed': report_text(report, 'tasks_completed'),
+        'hours_worked': float(report.hours_worked),
+        'blockers_issues': report_text(report, 'blockers_issues') or None,
+        'next_day_plan': report_text(report, 'next_day_plan'),
+        'status': report.status,
+        'resubmission_count': report.resubmission_count,
+        'submitted_at': report.submitted_at.isoformat(),
+        'last_review_comments': strip_html(last_review.comments) if last_review else None,
+    }
+
+
+class _Echo:
+    """File-like object whose write() just returns the value (for csv.writer)"""
+
+    def write(self, value):
+        return value
+
+
+def iter_reports_csv(reports):
+    """Yield ``reports`` as CSV lines, header first"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(HEADERS)
+    for report in export_queryset(reports):
+        yield writer.writerow(report_row(report))
+
+
+def iter_reports_ndjson(reports):
+    """Yield ``reports`` as newline-delimited JSON records"""
+    for report in export_queryset(reports):
+        yield json.dumps(report_record(report)) + '\n'
+
+
+def accepts_encoding(header, coding):
+    """
+    Whether an Accept-Encoding ``header`` allows ``coding``: listed with a
+    non-zero q-value, or not listed but covered by a non-zero ``*``
+    """
+    qualities = {}
+    for part in header.split(','):
+        name, *params = [item.strip() for item in part.split(';')]
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.lower()] = quality
+    quality = qualities.get(coding, qualities.get('*', 0.0))
+    return quality > 0
+
+
+def gzip_stream(chunks):
+    """Gzip-compress a stream of text chunks incrementally"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,62 @@
+"""
+Report list filtering shared by the dashboards, exports and export jobs
+"""
+from .employees import matching_employee_ids
+from .forms import EODReportFilterForm
+from .models import EODReport
+
+
+def filtered_team_reports(user, data):
+    """
+    Reports visible to a manager/admin with the dashboard filters in ``data``
+    (a GET QueryDict or plain dict) applied. Returns (reports, filter_form, team_members).
+    """
+    # Get team members' reports
+    if user.is_admin_user():
+        reports = EODReport.objects.all()
+        team_members = None
+    else:
+        team_members = user.get_team_members()
+        reports = EODReport.objects.filter(employee__in=team_members)
+
+    # Apply filters
+    filter_form = EODReportFilterForm(data)
+    if filter_form.is_valid():
+        date_from = filter_form.cleaned_data.get('date_from')
+        date_to = filter_form.cleaned_data.get('date_to')
+        status = filter_form.cleaned_data.get('status')
+        employee = filter_form.cleaned_data.get('employee')
+
+        if date_from:
+            reports = reports.filter(report_date__gte=date_from)
+        if date_to:
+            reports = reports.filter(report_date__lte=date_to)
+        if status:
+            reports = reports.filter(status=status)
+        if employee:
+            reports = reports.filter(
+                employee_id__in=matching_employee_ids(user, employee)
+            )
+
+    return reports.select_related('employee'), filter_form, team_members
+
+
+def filtered_my_reports(user, data):
+    """A user's own reports with the date/status filters in ``data`` applied"""
+    reports = EODReport.objects.filter(employee=user)
+
+    # Apply date filters
+    filter_form = EODReportFilterForm(data)
+    if filter_form.is_valid():
+        date_from = filter_form.cleaned_data.get('date_from')
+        date_to = filter_form.cleaned_data.get('date_to')
+        status = filter_form.cleaned_data.get('status')
+
+        if date_from:
+            reports = reports.filter(report_date__gte=date_from)
+        if date_to:
+            reports = reports.filter(report_date__lte=date_to)
+        if status:
+            reports = reports.filter(status=status)
+
+    return reports, filter_form
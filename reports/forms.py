@@ -135,7 +135,57 @@ class EODReportFilterForm(forms.Form):
         required=False,
         widget=forms.TextInput(attrs={
             'class': 'form-control',
-            'placeholder': 'Search by employee name...'
+            'placeholder': 'Search by employee name...',
+            'list': 'employee-suggestions',
+            'autocomplete': 'off'
         }),
         label='Employee'
     )
+    q = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Search report content...',
+            'type': 'search'
+        }),
+        label='Search'
+    )
+
+
+class ReportIdsField(forms.Field):
+    """List of report ids from repeated ``report_ids`` inputs (dashboard checkboxes)"""
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            return sorted({int(pk) for pk in value})
+        except (TypeError, ValueError):
+            raise forms.ValidationError('Invalid report selection.', code='invalid')
+
+
+class BulkReviewForm(forms.Form):
+    """Approve or reject several reports selected on the manager dashboard"""
+
+    MAX_REPORTS = 500
+
+    report_ids = ReportIdsField(
+        error_messages={'required': 'Select at least one report.'}
+    )
+    decision = forms.ChoiceField(choices=ReportReviewForm.DECISION_CHOICES)
+    comments = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control form-control-sm',
+            'placeholder': 'Comment for all selected reports (optional)'
+        })
+    )
+
+    def clean_report_ids(self):
+        report_ids = self.cleaned_data['report_ids']
+        if len(report_ids) > self.MAX_REPORTS:
+            raise forms.ValidationError(
+                f'Review at most {self.MAX_REPORTS} reports at a time.', code='too_many'
+            )
+        return report_ids
@@ -0,0 +1,124 @@
+"""
+Bulk email delivery for the notification commands.
+
+Messages are consumed lazily from an iterable and sent in batches by a
+bounded pool of worker threads. Each batch goes over a single connection,
+so SMTP handshakes scale with batches rather than messages. An optional
+rate limit is shared by all workers.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+
+class RateLimiter:
+    """Spaces calls to acquire() at most ``rate`` per second across threads"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class DeliverySummary:
+    """Counts and timing for one bulk send"""
+
+    def __init__(self, on_result=None):
+        self.on_result = on_result
+        self.sent = 0
+        self.failures = []
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+
+    @property
+    def failed(self):
+        return len(self.failures)
+
+    @property
+    def rate(self):
+        """Messages delivered per second"""
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    def add(self, results):
+        for message, error in results:
+            if self.on_result:
+                self.on_result(message, error)
+            if error is None:
+                self.sent += 1
+            else:
+                self.failures.append((', '.join(message.to), error))
+
+    def finish(self):
+        self.elapsed = time.monotonic() - self.started
+        return self
+
+    def __str__(self):
+        return (
+            f'{self.sent} sent, {self.failed} failed '
+            f'in {self.elapsed:.1f}s ({self.rate:.1f} msg/s)'
+        )
+
+
+def _send_batch(messages, limiter):
+    """Send ``messages`` over one connection; returns (message, error) pairs"""
+    results = []
+    connection = get_connection(fail_silently=False)
+    try:
+        for message in messages:
+            limiter.acquire()
+            message.connection = connection
+            try:
+                # send() opens and closes the connection around each message
+                # unless it is already open; open() is a no-op once it is
+                connection.open()
+                message.send()
+            except Exception as e:
+                # The connection may be unusable now; the next message reopens it
+                connection.close()
+                results.append((message, e))
+            else:
+                results.append((message, None))
+    finally:
+        connection.close()
+    return results
+
+
+def send_bulk(messages, workers=None, batch_size=None, rate_limit=None, on_result=None):
+    """
+    Deliver an iterable of EmailMessage objects and return a DeliverySummary.
+    Defaults come from EMAIL_SEND_WORKERS, EMAIL_BATCH_SIZE and
+    EMAIL_RATE_LIMIT (messages per second, 0 for no limit).
+    ``on_result(message, error)`` is called in the calling thread for every
+    message, with ``error`` None on success.
+    """
+    workers = workers or settings.EMAIL_SEND_WORKERS
+    batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+    limiter = RateLimiter(settings.EMAIL_RATE_LIMIT if rate_limit is None else rate_limit)
+
+    summary = DeliverySummary(on_result)
+    messages = iter(messages)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Keep at most two batches per worker queued so the input stays lazy
+        while batch := list(islice(messages, batch_size)):
+            pending.append(pool.submit(_send_batch, batch, limiter))
+            if len(pending) >= workers * 2:
+                summary.add(pending.popleft().result())
+        while pending:
+            summary.add(pending.popleft().result())
+    return summary.finish()
@@ -0,0 +1,77 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from reports.content import CONTENT_FIELDS, DERIVED_FIELDS, process_content_batch
+from reports.models import EODReport
+from reports.search import update_search_vector
+
+
+class Command(BaseCommand):
+    help = 'Sanitize report HTML and fill plain text, previews and word counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of reports processed and updated per batch',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes doing the HTML parsing',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Reprocess every report, not just those without stored text',
+        )
+
+    def handle(self, *args, **options):
+        reports = EODReport.objects.order_by('pk')
+        if not options['all']:
+            reports = reports.filter(tasks_completed_text__isnull=True)
+
+        # Workers only parse HTML; all database reads and writes stay in this
+        # process. Keep at most two batches per worker in flight.
+        max_pending = options['workers'] * 2
+        total = 0
+        pending = []
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            for rows in self._batches(reports, options['batch_size']):
+                pending.append(pool.submit(process_content_batch, rows))
+                if len(pending) >= max_pending:
+                    total += self._save(pending.pop(0).result())
+            for future in pending:
+                total += self._save(future.result())
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Processed content of {total} report(s)')
+        )
+
+    def _batches(self, reports, batch_size):
+        """(pk, *content) tuples in pk order, one keyset-paginated batch at a time"""
+        last_pk = 0
+        while True:
+            rows = list(
+                reports.filter(pk__gt=last_pk)
+                .values_list('pk', *CONTENT_FIELDS)[:batch_size]
+            )
+            if not rows:
+                return
+            last_pk = rows[-1][0]
+            yield rows
+
+    def _save(self, results):
+        reports = []
+        for pk, values in results:
+            report = EODReport(pk=pk)
+            for field, value in values.items():
+                setattr(report, field, value)
+            reports.append(report)
+        # bulk_update skips save() and signals, so refresh the search vectors here
+        EODReport.objects.bulk_update(reports, CONTENT_FIELDS + DERIVED_FIELDS)
+        update_search_vector(EODReport.objects.filter(pk__in=[pk for pk, _ in results]))
+        return len(reports)
@@ -0,0 +1,173 @@
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from types import ModuleType
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.urls import URLPattern, URLResolver, reverse
+
+from accounts.models import User
+from reports import async_views, views
+from reports.models import EODReport
+
+# URL names in reports.urls that have an async variant
+DASHBOARD_URL_NAMES = {'employee_dashboard', 'manager_dashboard', 'report_detail'}
+
+
+def dashboard_urlconf(dashboard_views):
+    """The site's URLconf with the dashboard views taken from ``dashboard_views``"""
+    root = import_module(settings.ROOT_URLCONF)
+    urlpatterns = []
+    for entry in root.urlpatterns:
+        if isinstance(entry, URLResolver) and entry.app_name == 'reports':
+            patterns = [
+                URLPattern(
+                    p.pattern, getattr(dashboard_views, p.callback.__name__), p.default_args, p.name
+                ) if p.name in DASHBOARD_URL_NAMES else p
+                for p in entry.url_patterns
+            ]
+            entry = URLResolver(
+                entry.pattern, patterns, entry.default_kwargs,
+                app_name=entry.app_name, namespace=entry.namespace,
+            )
+        urlpatterns.append(entry)
+    urlconf = ModuleType(f'{dashboard_views.__name__}_urlconf')
+    urlconf.urlpatterns = urlpatterns
+    return urlconf
+
+
+def run_sync(url, cookies, requests, concurrency):
+    """Latencies of ``requests`` GETs through the WSGI handler from ``concurrency`` threads"""
+    local = threading.local()
+
+    def get(_):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = Client()
+            client.cookies = cookies.copy()
+        started = time.perf_counter()
+        response = client.get(url)
+        elapsed = time.perf_counter() - started
+        if response.status_code != 200:
+            raise CommandError(f'GET {url} returned {response.status_code}')
+        return elapsed
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(get, range(requests)))
+
+
+async def run_async(url, cookies, requests, concurrency):
+    """Latencies of ``requests`` GETs through the ASGI handler, ``concurrency`` at a time"""
+    client = AsyncClient()
+    client.cookies = cookies.copy()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def get():
+        async with slots:
+            started = time.perf_counter()
+            response = await client.get(url)
+            elapsed = time.perf_counter() - started
+        if response.status_code != 200:
+            raise CommandError(f'GET {url} returned {response.status_code}')
+        return elapsed
+
+    return await asyncio.gather(*(get() for _ in range(requests)))
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare latency of the sync (WSGI) and async (ASGI) dashboard and report '
+        'detail views under concurrent load'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Requests per view and variant (default: 200)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=20,
+            help='Requests in flight at once (default: 20)',
+        )
+        parser.add_argument(
+            '--manager',
+            help='Username of the manager to load the manager dashboard as',
+        )
+        parser.add_argument(
+            '--employee',
+            help='Username of the employee to load the employee dashboard and a report as',
+        )
+
+    def handle(self, *args, **options):
+        manager = self.get_user(options['manager'], role='MANAGER')
+        employee = self.get_user(options['employee'], role='EMPLOYEE')
+        report = EODReport.objects.filter(employee=employee).order_by('-report_date').first()
+
+        targets = [
+            ('employee_dashboard', employee, reverse('reports:employee_dashboard')),
+            ('manager_dashboard', manager, reverse('reports:manager_dashboard')),
+        ]
+        if report:
+            targets.append(('report_detail', employee, reverse('reports:report_detail', args=[report.pk])))
+
+        requests, concurrency = options['requests'], options['concurrency']
+        self.stdout.write(
+            f'{requests} requests per view, {concurrency} concurrent, '
+            f"database {settings.DATABASES['default']['ENGINE']}"
+        )
+        self.stdout.write(
+            f"{'View':<20} {'Variant':<8} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8} {'req/s':>8}"
+        )
+
+        # The test clients send Host: testserver
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for name, user, url in targets:
+                login = Client()
+                login.force_login(user)
+                try:
+                    for variant, dashboard_views in (('sync', views), ('async', async_views)):
+                        with override_settings(ROOT_URLCONF=dashboard_urlconf(dashboard_views)):
+                            started = time.perf_counter()
+                            if variant == 'sync':
+                                latencies = run_sync(url, login.cookies, requests, concurrency)
+                            else:
+                                latencies = asyncio.run(
+                                    run_async(url, login.cookies, requests, concurrency)
+                                )
+                            wall = time.perf_counter() - started
+                        self.write_row(name, variant, latencies, wall)
+                finally:
+                    login.logout()
+
+    def get_user(self, username, role):
+        users = User.objects.filter(is_active=True)
+        if username:
+            users = users.filter(username=username)
+        elif role == 'MANAGER':
+            users = users.filter(role=role, team_members__isnull=False).distinct()
+        else:
+            users = users.filter(role=role, eod_reports__isnull=False).distinct()
+        user = users.order_by('pk').first()
+        if user is None:
+            raise CommandError(
+                f'No {role.lower()} found to benchmark with'
+                + (f' (username {username!r})' if username else '; seed some data first')
+            )
+        return user
+
+    def write_row(self, name, variant, latencies, wall):
+        cuts = statistics.quantiles(latencies, n=20, method='inclusive')
+        self.stdout.write(
+            f'{name:<20} {variant:<8} {statistics.median(latencies) * 1000:>8.1f} '
+            f'{cuts[18] * 1000:>8.1f} {statistics.fmean(latencies) * 1000:>8.1f} '
+            f'{len(latencies) / wall:>8.1f}'
+        )
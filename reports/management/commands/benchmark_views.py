@@ -0,0 +1,162 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+
+from reports.benchmarks import (
+    BASELINE_PATH, DATASETS, DEFAULT_TOLERANCES, ViewRunner, benchmark_fixtures, compare,
+    load_baseline, save_baseline, url_names, view_cases,
+)
+from reports.seeding import rebuild_derived_data, seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark every reports and accounts view against seeded datasets in a '
+        'throwaway test database and compare with the committed baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--datasets',
+            default=','.join(DATASETS),
+            help=f"Comma-separated dataset sizes to run (default: {','.join(DATASETS)})",
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Timed requests per view; the median is reported (default: 5)',
+        )
+        parser.add_argument(
+            '--baseline',
+            default=str(BASELINE_PATH),
+            help='Baseline file to compare with (default: reports/benchmark_baseline.json)',
+        )
+        parser.add_argument(
+            '--update-baseline',
+            action='store_true',
+            help='Write the results to the baseline file instead of comparing',
+        )
+        parser.add_argument(
+            '--query-tolerance',
+            type=int,
+            default=DEFAULT_TOLERANCES['queries'],
+            help=f"Extra queries allowed per view (default: {DEFAULT_TOLERANCES['queries']})",
+        )
+        parser.add_argument(
+            '--time-tolerance',
+            type=float,
+            default=DEFAULT_TOLERANCES['time_percent'],
+            help=f"Allowed wall time growth in percent (default: {DEFAULT_TOLERANCES['time_percent']})",
+        )
+        parser.add_argument(
+            '--memory-tolerance',
+            type=float,
+            default=DEFAULT_TOLERANCES['memory_percent'],
+            help=f"Allowed peak memory growth in percent (default: {DEFAULT_TOLERANCES['memory_percent']})",
+        )
+        parser.add_argument(
+            '--queries-only',
+            action='store_true',
+            help='Only compare status codes and query counts, e.g. on a machine other '
+                 'than the one the baseline was recorded on',
+        )
+
+    def handle(self, *args, **options):
+        datasets = [name.strip() for name in options['datasets'].split(',') if name.strip()]
+        unknown = set(datasets) - set(DATASETS)
+        if unknown:
+            raise CommandError(f"Unknown dataset(s): {', '.join(sorted(unknown))}")
+
+        baseline = load_baseline(options['baseline'])
+        vendor = connection.vendor
+        if not options['update_baseline'] and baseline.get('database') not in (None, vendor):
+            self.stdout.write(self.style.WARNING(
+                f"Baseline was recorded on {baseline['database']}, running on {vendor}; "
+                'query counts may differ'
+            ))
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = self.run(datasets, options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options['update_baseline']:
+            baseline['database'] = vendor
+            baseline['datasets'] = {**baseline.get('datasets', {}), **{n: DATASETS[n] for n in datasets}}
+            baseline['results'] = {**baseline.get('results', {}), **results}
+            save_baseline(baseline, options['baseline'])
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['baseline']}"))
+            return
+
+        tolerances = {
+            'queries': options['query_tolerance'],
+            'time_percent': options['time_tolerance'],
+            'memory_percent': options['memory_tolerance'],
+        }
+        if options['queries_only']:
+            tolerances.update(time_percent=float('inf'), memory_percent=float('inf'))
+        regressions = compare(results, baseline['results'], tolerances)
+        if regressions:
+            for dataset, label, metric, expected, measured in regressions:
+                self.stdout.write(self.style.ERROR(
+                    f'{dataset:<7} {label:<40} {metric}: {expected} -> {measured}'
+                ))
+            raise CommandError(f'{len(regressions)} regression(s) against {options["baseline"]}')
+
+        missing = {
+            label for dataset in datasets for label in results[dataset]
+            if label not in baseline['results'].get(dataset, {})
+        }
+        if missing:
+            self.stdout.write(self.style.WARNING(
+                f"No baseline yet for: {', '.join(sorted(missing))} (run with --update-baseline)"
+            ))
+        self.stdout.write(self.style.SUCCESS('No regressions'))
+
+    def run(self, datasets, repeat):
+        """Seed each dataset into the test database and measure every view case"""
+        results = {}
+        # The test client sends Host: testserver; budget warnings would only fill the log
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+            REQUEST_BUDGETS={},
+        ):
+            for dataset in datasets:
+                call_command('flush', interactive=False, verbosity=0)
+                cache.clear()
+                counts = seed_dataset(**DATASETS[dataset])
+                rebuild_derived_data()
+                self.stdout.write(
+                    f"Dataset {dataset}: {counts['users']} users, {counts['reports']} reports, "
+                    f"{counts['reviews']} reviews"
+                )
+
+                fixtures = benchmark_fixtures()
+                cases = view_cases(fixtures)
+                uncovered = url_names() - {case['name'] for case in cases}
+                if uncovered:
+                    raise CommandError(f"No benchmark case for: {', '.join(sorted(uncovered))}")
+
+                self.stdout.write(
+                    f"{'View':<40} {'Status':>6} {'Queries':>8} {'ms':>9} {'Peak KB':>9}"
+                )
+                runner = ViewRunner()
+                results[dataset] = {}
+                try:
+                    for case in cases:
+                        metrics = results[dataset][case['label']] = runner.measure(case, repeat)
+                        self.stdout.write(
+                            f"{case['label']:<40} {metrics['status']:>6} {metrics['queries']:>8} "
+                            f"{metrics['wall_ms']:>9.2f} {metrics['peak_kb']:>9.1f}"
+                        )
+                finally:
+                    # Export files are written outside the test database
+                    fixtures['export_job'].file.delete(save=False)
+        return results
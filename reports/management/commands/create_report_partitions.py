@@ -0,0 +1,40 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from reports.partitions import DEFAULT_MONTHS_AHEAD, ensure_partitions, partitioning_enabled, partitions
+
+
+class Command(BaseCommand):
+    help = 'Create the monthly partitions of the EOD report table for the coming months'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=DEFAULT_MONTHS_AHEAD,
+            help=f'Months after the current one to create partitions for (default: {DEFAULT_MONTHS_AHEAD})',
+        )
+        parser.add_argument(
+            '--since',
+            type=date.fromisoformat,
+            help='Also create partitions from this month on, YYYY-MM-DD (e.g. before loading old reports)',
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List the partitions afterwards',
+        )
+
+    def handle(self, *args, **options):
+        if not partitioning_enabled():
+            self.stdout.write('The report table is not partitioned (PostgreSQL only); nothing to do')
+            return
+
+        created = ensure_partitions(months_ahead=options['months_ahead'], since=options['since'])
+        if options['list']:
+            for name, bound in partitions():
+                self.stdout.write(f'{name:<32} {bound}')
+        if created:
+            self.stdout.write(self.style.SUCCESS(f"Created partition(s): {', '.join(created)}"))
+        else:
+            self.stdout.write(self.style.SUCCESS('All partitions already exist'))
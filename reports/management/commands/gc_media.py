@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+from reports.storage import collect_garbage
+
+
+class Command(BaseCommand):
+    help = 'Delete media files that are no longer referenced by any row'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=60,
+            help='Keep files modified within this many minutes (default: 60)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Files to delete between pauses (default: 500)',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.5,
+            help='Seconds to wait between chunks (default: 0.5)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would be deleted without deleting anything',
+        )
+
+    def handle(self, *args, **options):
+        stats = collect_garbage(
+            min_age=timedelta(minutes=options['min_age']),
+            chunk_size=options['chunk_size'],
+            pause=options['pause'],
+            dry_run=options['dry_run'],
+        )
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(
+            f"Scanned {stats['scanned']} file(s): {stats['referenced']} referenced, "
+            f"{stats['shared']} shared by several rows"
+        )
+        if stats['missing']:
+            self.stdout.write(
+                self.style.WARNING(f"{stats['missing']} referenced file(s) are missing from storage")
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {stats['deleted']} orphaned file(s) ({filesizeformat(stats['freed'])})"
+            )
+        )
@@ -0,0 +1,82 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from reports.outbox import (
+    OUTBOX_BATCH_SIZE, claim_batch, deliver, outbox_metrics, release_stale_claims,
+)
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbox emails, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Deliver the messages currently due and exit instead of polling',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help='Seconds to wait between checks when nothing is due',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=OUTBOX_BATCH_SIZE,
+            help='Messages claimed per round',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.EMAIL_SEND_WORKERS,
+            help='Concurrent SMTP connections',
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Print queue depth and delivery latency, then exit',
+        )
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.write_metrics()
+            return
+
+        self.stdout.write('Outbox worker started')
+        while True:
+            release_stale_claims()
+            rows = claim_batch(options['batch_size'])
+            if not rows:
+                if options['once']:
+                    break
+                # Give the connection back (to the pool) while idle
+                close_old_connections()
+                time.sleep(options['poll_interval'])
+                continue
+
+            summary = deliver(rows, workers=options['workers'])
+            for recipient, error in summary.failures:
+                self.stdout.write(
+                    self.style.ERROR(f'Failed to send to {recipient}: {error}')
+                )
+            self.stdout.write(self.style.SUCCESS(f'Outbox batch: {summary}'))
+
+        self.write_metrics()
+
+    def write_metrics(self):
+        metrics = outbox_metrics()
+        self.stdout.write(
+            f"Queue depth: {metrics['pending']} ({metrics['due']} due, "
+            f"{metrics['failed']} failed permanently)"
+        )
+        if metrics['oldest_pending_age'] is not None:
+            self.stdout.write(f"Oldest queued message: {metrics['oldest_pending_age']}")
+        if metrics['sent']:
+            self.stdout.write(
+                f"Delivered in the last hour: {metrics['sent']} "
+                f"(avg latency {metrics['avg_latency']}, max {metrics['max_latency']})"
+            )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from reports.rollup import rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily report rollup table from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rollup rows inserted per query',
+        )
+
+    def handle(self, *args, **options):
+        buckets = rebuild_rollup(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt daily report rollup ({buckets} bucket(s))')
+        )
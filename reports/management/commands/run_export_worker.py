@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from reports.export_jobs import claim_next_job, prune_export_jobs, release_stale_jobs, run_export_job
+
+
+class Command(BaseCommand):
+    help = 'Build queued report exports in the background'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the jobs currently queued and exit instead of polling',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait between checks when the queue is empty',
+        )
+        parser.add_argument(
+            '--prune-days',
+            type=int,
+            default=None,
+            help='Delete finished jobs and files older than this many days, then exit',
+        )
+
+    def handle(self, *args, **options):
+        if options['prune_days'] is not None:
+            pruned = prune_export_jobs(options['prune_days'])
+            self.stdout.write(self.style.SUCCESS(f'Pruned {pruned} export job(s)'))
+            return
+
+        self.stdout.write('Export worker started')
+        while True:
+            # Jobs a crashed worker left running
+            requeued, failed = release_stale_jobs()
+            if requeued or failed:
+                self.stdout.write(
+                    self.style.WARNING(f'Stale export job(s): {requeued} requeued, {failed} failed')
+                )
+
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                # Give the connection back (to the pool) while idle
+                close_old_connections()
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f'Building export #{job.pk} for {job.requested_by_id}...')
+            job = run_export_job(job)
+            if job.status == 'DONE':
+                self.stdout.write(
+                    self.style.SUCCESS(f'Export #{job.pk} done ({job.rows_written} rows)')
+                )
+            else:
+                self.stdout.write(
+                    self.style.ERROR(f'Export #{job.pk} failed: {job.error}')
+                )
@@ -0,0 +1,73 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from reports.scheduler import Scheduler, load_schedule
+
+
+class Command(BaseCommand):
+    help = 'Run the scheduled notification and housekeeping jobs in one long-lived process'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run whatever is due now (including catch-up), wait for it and exit',
+        )
+        parser.add_argument(
+            '--tick',
+            type=float,
+            default=15.0,
+            help='Seconds between schedule checks',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.SCHEDULER_WORKERS,
+            help='Jobs that may run at the same time',
+        )
+
+    def handle(self, *args, **options):
+        jobs = load_schedule()
+        scheduler = Scheduler(jobs, workers=options['workers'])
+        self.verbosity = options['verbosity']
+        self.stdout.write(
+            f'Scheduler {scheduler.owner} started with {len(jobs)} job(s) '
+            f'(times in {settings.TIME_ZONE})'
+        )
+
+        try:
+            while True:
+                # Drop connections the database closed while we were sleeping
+                close_old_connections()
+                for job, slot, status in scheduler.tick():
+                    if status == 'SKIPPED':
+                        self.stdout.write(
+                            self.style.WARNING(f'{job} {slot:%Y-%m-%d %H:%M %Z}: missed, skipping')
+                        )
+                    elif self.verbosity >= 2 or not job.every:
+                        self.stdout.write(f'{job} {slot:%Y-%m-%d %H:%M %Z}: started')
+                self.report(scheduler.finished())
+
+                if options['once']:
+                    if not scheduler.running:
+                        break
+                    time.sleep(0.1)
+                    continue
+                time.sleep(options['tick'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping scheduler, waiting for running jobs...')
+        finally:
+            scheduler.shutdown()
+            self.report(scheduler.finished())
+
+    def report(self, finished):
+        for name, slot, status, output, elapsed in finished:
+            if status == 'FAILED':
+                self.stdout.write(self.style.ERROR(f'{name} failed after {elapsed:.1f}s: {output}'))
+                continue
+            if self.verbosity >= 2 and output.strip():
+                self.stdout.write(output.rstrip())
+            if self.verbosity >= 2 or elapsed >= 1:
+                self.stdout.write(self.style.SUCCESS(f'{name} finished in {elapsed:.1f}s'))
@@ -0,0 +1,138 @@
+import os
+import time
+from datetime import date
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from accounts.models import User
+from reports.seeding import DEFAULT_PASSWORD, rebuild_derived_data, seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        'Load a deterministic synthetic organisation (managers, employees, weekday '
+        'reports, reviews and resubmissions) for testing at production scale'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--managers',
+            type=int,
+            default=200,
+            help='Number of managers (default: 200)',
+        )
+        parser.add_argument(
+            '--employees',
+            type=int,
+            default=5000,
+            help='Number of employees, spread evenly over the managers (default: 5000)',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=520,
+            help='Weekdays of reports per employee, about two years (default: 520)',
+        )
+        parser.add_argument(
+            '--end-date',
+            type=date.fromisoformat,
+            help='Last report date, YYYY-MM-DD (default: today)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed; the same seed gives the same data (default: 0)',
+        )
+        parser.add_argument(
+            '--password',
+            default=DEFAULT_PASSWORD,
+            help=f'Password of every generated user (default: {DEFAULT_PASSWORD})',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=20000,
+            help='Reports written per transaction (default: 20000)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Processes generating rows while this one writes them (default: CPU count)',
+        )
+        parser.add_argument(
+            '--method',
+            choices=['auto', 'copy', 'bulk'],
+            default='auto',
+            help='COPY (PostgreSQL only) or bulk_create; auto uses COPY on PostgreSQL (default: auto)',
+        )
+        parser.add_argument(
+            '--flush',
+            action='store_true',
+            help='Delete ALL data in the database first',
+        )
+        parser.add_argument(
+            '--noinput', '--no-input',
+            action='store_false',
+            dest='interactive',
+            help='Do not ask for confirmation before flushing',
+        )
+
+    def handle(self, *args, **options):
+        if options['managers'] < 1 or options['employees'] < 0 or options['days'] < 1:
+            raise CommandError('Need at least one manager and one day')
+        if options['method'] == 'copy' and connection.vendor != 'postgresql':
+            raise CommandError('COPY needs PostgreSQL; use --method bulk')
+
+        if options['flush']:
+            call_command('flush', interactive=options['interactive'], verbosity=0)
+        if User.objects.filter(username__in=['admin', 'manager0001', 'employee00001']).exists():
+            raise CommandError(
+                'Synthetic users already exist; load into an empty database or pass --flush'
+            )
+
+        use_copy = options['method'] == 'copy' or (
+            options['method'] == 'auto' and connection.vendor == 'postgresql'
+        )
+        self.stdout.write(
+            f"Loading {options['managers']} managers, {options['employees']} employees and "
+            f"{options['days']} weekdays of reports with {'COPY' if use_copy else 'bulk_create'}"
+        )
+
+        started = time.perf_counter()
+
+        def progress(counts):
+            rows = counts['reports'] + counts['reviews']
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"  {counts['reports']} reports, {counts['reviews']} reviews "
+                f"({rows / elapsed:,.0f} rows/s)"
+            )
+
+        counts = seed_dataset(
+            managers=options['managers'],
+            employees=options['employees'],
+            days=options['days'],
+            seed=options['seed'],
+            end_date=options['end_date'],
+            password=options['password'],
+            batch_size=options['batch_size'],
+            use_copy=use_copy,
+            workers=options['workers'],
+            progress=progress,
+        )
+        loaded = time.perf_counter() - started
+        rows = sum(counts.values())
+
+        started = time.perf_counter()
+        rebuild_derived_data()
+        rebuilt = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {counts['users']} users, {counts['reports']} reports and {counts['reviews']} "
+            f"reviews in {loaded:.1f}s ({rows / loaded:,.0f} rows/s); rebuilt the rollup and "
+            f"search documents in {rebuilt:.1f}s"
+        ))
@@ -1,60 +1,17 @@
 from django.core.management.base import BaseCommand
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
 from django.conf import settings
 from django.utils import timezone
-from accounts.models import User
-from reports.models import EODReport
+from reports.outbox import enqueue_many
+from reports.reminders import due_reminders, employees_without_report
 
 
-class Command(BaseCommand):
-    help = 'Send email reminders to employees who have not submitted EOD reports'
-
-    def add_arguments(self, parser):
-        parser.add_argument(
-            '--dry-run',
-            action='store_true',
-            help='Show who would receive emails without actually sending them',
-        )
-
-    def handle(self, *args, **options):
-        dry_run = options['dry_run']
-        today = timezone.now().date()
-
-        # Get all active employees
-        employees = User.objects.filter(
-            role='EMPLOYEE',
-            is_active=True
-        )
-
-        # Filter employees who haven't submitted reports today
-        employees_without_report = []
-        for employee in employees:
-            if not EODReport.objects.filter(
-                employee=employee,
-                report_date=today
-            ).exists():
-                employees_without_report.append(employee)
-
-        if not employees_without_report:
-            self.stdout.write(self.style.SUCCESS('All employees have submitted their reports!'))
-            return
-
-        # Send reminders
-        sent_count = 0
-        failed_count = 0
-
-        for employee in employees_without_report:
-            if not employee.email:
-                self.stdout.write(
-                    self.style.WARNING(f'Skipping {employee.username} - no email address')
-                )
-                continue
-
-            subject = 'Reminder: Submit Your EOD Report'
-            message = f"""
+def reminder_message(employee, report_date):
+    subject = 'Reminder: Submit Your EOD Report'
+    message = f"""
 Hello {employee.get_full_name()},
 
-This is a friendly reminder to submit your End-of-Day (EOD) report for {today.strftime('%B %d, %Y')}.
+This is a friendly reminder to submit your End-of-Day (EOD) report for {report_date.strftime('%B %d, %Y')}.
 
 Please log in to the EOD Reporting System to submit your report:
 {settings.DEFAULT_FROM_EMAIL}
@@ -65,43 +22,81 @@ Thank you!
 
 ---
 EOD Reporting System
-            """.strip()
+    """.strip()
+    return EmailMessage(
+        subject=subject,
+        body=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[employee.email],
+    )
 
-            if dry_run:
-                self.stdout.write(
-                    self.style.WARNING(f'[DRY RUN] Would send email to: {employee.email}')
-                )
-                sent_count += 1
+
+class Command(BaseCommand):
+    help = 'Queue email reminders to employees who have not submitted EOD reports'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show who would receive emails without actually queueing them',
+        )
+        parser.add_argument(
+            '--waves',
+            action='store_true',
+            help='Only queue reminders whose staggered time (per-user zone and preferred time) has come',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        today = timezone.now().date()
+        self.missing_count = 0
+
+        # Reminders go through the outbox (delivered by process_outbox);
+        # the dedupe key makes re-running the command on the same day harmless
+        if options['waves']:
+            candidates = due_reminders()
+        else:
+            candidates = (
+                (employee, today)
+                for employee in employees_without_report(today).iterator(chunk_size=500)
+            )
+        messages = self.reminders(candidates, dry_run, options['verbosity'])
+        if dry_run:
+            queued_count = sum(1 for _ in messages)
+        else:
+            queued_count = enqueue_many(messages)
+
+        if not self.missing_count:
+            if options['waves']:
+                self.stdout.write(self.style.SUCCESS('No reminders due'))
             else:
-                try:
-                    send_mail(
-                        subject=subject,
-                        message=message,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[employee.email],
-                        fail_silently=False,
-                    )
-                    self.stdout.write(
-                        self.style.SUCCESS(f'Sent reminder to: {employee.email}')
-                    )
-                    sent_count += 1
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.ERROR(f'Failed to send to {employee.email}: {str(e)}')
-                    )
-                    failed_count += 1
+                self.stdout.write(self.style.SUCCESS('All employees have submitted their reports!'))
+            return
 
         # Summary
         self.stdout.write('\n' + '='*50)
         if dry_run:
             self.stdout.write(
-                self.style.SUCCESS(f'[DRY RUN] Would send {sent_count} reminder(s)')
+                self.style.SUCCESS(f'[DRY RUN] Would send {queued_count} reminder(s)')
             )
         else:
             self.stdout.write(
-                self.style.SUCCESS(f'Successfully sent {sent_count} reminder(s)')
+                self.style.SUCCESS(f'Queued {queued_count} reminder(s) for delivery')
             )
-            if failed_count > 0:
+
+    def reminders(self, candidates, dry_run, verbosity):
+        """Yield (message, dedupe key) per (employee, report date) candidate"""
+        for employee, report_date in candidates:
+            self.missing_count += 1
+            if not employee.email:
                 self.stdout.write(
-                    self.style.ERROR(f'Failed to send {failed_count} email(s)')
+                    self.style.WARNING(f'Skipping {employee.username} - no email address')
+                )
+                continue
+            if dry_run:
+                self.stdout.write(
+                    self.style.WARNING(f'[DRY RUN] Would send email to: {employee.email}')
                 )
+            elif verbosity >= 2:
+                self.stdout.write(f'Queueing reminder for: {employee.email}')
+            yield reminder_message(employee, report_date), f'eod-reminder:{employee.pk}:{report_date}'
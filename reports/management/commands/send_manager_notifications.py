@@ -1,116 +1,117 @@
+from itertools import groupby
+
 from django.core.management.base import BaseCommand
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
 from django.conf import settings
-from accounts.models import User
+from django.utils import timezone
 from reports.models import EODReport
+from reports.outbox import enqueue_many
+
+
+def pending_reports_by_manager():
+    """
+    Pending reports of active managers' teams in one streamed query,
+    ordered so consecutive rows share a manager. Yields (manager, reports).
+    """
+    reports = EODReport.objects.filter(
+        status='PENDING',
+        employee__manager__role='MANAGER',
+        employee__manager__is_active=True
+    ).select_related(
+        'employee__manager'
+    ).only(
+        'report_date',
+        'employee__first_name', 'employee__last_name', 'employee__manager',
+        'employee__manager__username', 'employee__manager__first_name',
+        'employee__manager__last_name', 'employee__manager__email',
+    ).order_by('employee__manager_id', 'report_date', 'pk')
+
+    for _, group in groupby(reports.iterator(chunk_size=2000), key=lambda report: report.employee.manager_id):
+        group = list(group)
+        yield group[0].employee.manager, group
+
+
+def digest_message(manager, pending_reports):
+    subject = f'Pending EOD Reports to Review ({len(pending_reports)})'
+
+    report_list = '\n'.join([
+        f'- {report.employee.get_full_name()} ({report.report_date.strftime("%B %d, %Y")})'
+        for report in pending_reports
+    ])
+
+    message = f"""
+Hello {manager.get_full_name()},
+
+You have {len(pending_reports)} pending EOD report(s) awaiting your review:
+
+{report_list}
+
+Please log in to the EOD Reporting System to review these reports:
+{settings.DEFAULT_FROM_EMAIL}
+
+Thank you!
+
+---
+EOD Reporting System
+    """.strip()
+    return EmailMessage(
+        subject=subject,
+        body=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[manager.email],
+    )
 
 
 class Command(BaseCommand):
-    help = 'Send notifications to managers about pending reports to review'
+    help = 'Queue notifications to managers about pending reports to review'
 
     def add_arguments(self, parser):
         parser.add_argument(
             '--dry-run',
             action='store_true',
-            help='Show who would receive emails without actually sending them',
+            help='Show who would receive emails without actually queueing them',
         )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
+        today = timezone.now().date()
 
-        # Get all managers
-        managers = User.objects.filter(
-            role='MANAGER',
-            is_active=True
-        )
-
-        sent_count = 0
-        failed_count = 0
-
-        for manager in managers:
-            # Get pending reports for this manager's team
-            pending_reports = EODReport.objects.filter(
-                employee__manager=manager,
-                status='PENDING'
-            ).select_related('employee')
+        # One digest per manager per day, delivered by process_outbox
+        messages = self.digests(today, dry_run, options['verbosity'])
+        if dry_run:
+            queued_count = sum(1 for _ in messages)
+        else:
+            queued_count = enqueue_many(messages)
 
-            if not pending_reports.exists():
-                self.stdout.write(
-                    self.style.SUCCESS(f'No pending reports for manager: {manager.username}')
-                )
-                continue
+        # Summary
+        self.stdout.write('\n' + '='*50)
+        if dry_run:
+            self.stdout.write(
+                self.style.SUCCESS(f'[DRY RUN] Would send {queued_count} notification(s)')
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f'Queued {queued_count} notification(s) for delivery')
+            )
 
+    def digests(self, today, dry_run, verbosity):
+        """Yield (message, dedupe key) per manager with pending reports"""
+        for manager, pending_reports in pending_reports_by_manager():
             if not manager.email:
                 self.stdout.write(
                     self.style.WARNING(f'Skipping {manager.username} - no email address')
                 )
                 continue
-
-            # Prepare email
-            subject = f'Pending EOD Reports to Review ({pending_reports.count()})'
-
-            report_list = '\n'.join([
-                f'- {report.employee.get_full_name()} ({report.report_date.strftime("%B %d, %Y")})'
-                for report in pending_reports
-            ])
-
-            message = f"""
-Hello {manager.get_full_name()},
-
-You have {pending_reports.count()} pending EOD report(s) awaiting your review:
-
-{report_list}
-
-Please log in to the EOD Reporting System to review these reports:
-{settings.DEFAULT_FROM_EMAIL}
-
-Thank you!
-
----
-EOD Reporting System
-            """.strip()
-
             if dry_run:
                 self.stdout.write(
                     self.style.WARNING(
                         f'[DRY RUN] Would send email to: {manager.email} '
-                        f'({pending_reports.count()} pending reports)'
+                        f'({len(pending_reports)} pending reports)'
                     )
                 )
-                sent_count += 1
-            else:
-                try:
-                    send_mail(
-                        subject=subject,
-                        message=message,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[manager.email],
-                        fail_silently=False,
-                    )
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f'Sent notification to: {manager.email} '
-                            f'({pending_reports.count()} pending reports)'
-                        )
-                    )
-                    sent_count += 1
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.ERROR(f'Failed to send to {manager.email}: {str(e)}')
-                    )
-                    failed_count += 1
-
-        # Summary
-        self.stdout.write('\n' + '='*50)
-        if dry_run:
-            self.stdout.write(
-                self.style.SUCCESS(f'[DRY RUN] Would send {sent_count} notification(s)')
-            )
-        else:
-            self.stdout.write(
-                self.style.SUCCESS(f'Successfully sent {sent_count} notification(s)')
-            )
-            if failed_count > 0:
+            elif verbosity >= 2:
                 self.stdout.write(
-                    self.style.ERROR(f'Failed to send {failed_count} email(s)')
+                    f'Queueing notification for: {manager.email} '
+                    f'({len(pending_reports)} pending reports)'
                 )
+            yield digest_message(manager, pending_reports), f'manager-digest:{manager.pk}:{today}'
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.11 on 2026-10-17 10:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_rollup(apps, schema_editor):
+    EODReport = apps.get_model('reports', 'EODReport')
+    DailyReportRollup = apps.get_model('reports', 'DailyReportRollup')
+    rows = (
+        EODReport.objects
+        .order_by()
+        .annotate(
+            manager_id=F('employee__manager_id'),
+            dept=Coalesce('employee__department', Value('')),
+        )
+        .values('report_date', 'manager_id', 'dept', 'status')
+        .annotate(report_count=Count('id'), hours=Sum('hours_worked'))
+    )
+    DailyReportRollup.objects.bulk_create(
+        [
+            DailyReportRollup(
+                report_date=row['report_date'],
+                manager_id=row['manager_id'],
+                department=row['dept'],
+                status=row['status'],
+                report_count=row['report_count'],
+                hours_worked=row['hours'] or 0,
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reports', '0003_eodreport_resubmission_count_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyReportRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report_date', models.DateField()),
+                ('department', models.CharField(blank=True, default='', max_length=100)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending Review'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected')], max_length=10)),
+                ('report_count', models.IntegerField(default=0)),
+                ('hours_worked', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('manager', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='report_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Daily Report Rollup',
+                'verbose_name_plural': 'Daily Report Rollups',
+                'ordering': ['-report_date'],
+                'indexes': [models.Index(fields=['manager', '-report_date'], name='reports_dai_manager_7bc357_idx')],
+                'unique_together': {('report_date', 'manager', 'department', 'status')},
+            },
+        ),
+        migrations.RunPython(populate_rollup, migrations.RunPython.noop),
+    ]
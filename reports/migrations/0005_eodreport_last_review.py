@@ -0,0 +1,36 @@
+# Generated by Django 4.2.11 on 2026-10-17 10:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import OuterRef, Subquery
+
+
+def fill_last_review(apps, schema_editor):
+    EODReport = apps.get_model('reports', 'EODReport')
+    ReportReview = apps.get_model('reports', 'ReportReview')
+    latest = ReportReview.objects.filter(report=OuterRef('pk')).order_by('-reviewed_at')
+    EODReport.objects.update(
+        last_review_id=Subquery(latest.values('id')[:1]),
+        last_reviewed_at=Subquery(latest.values('reviewed_at')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0004_dailyreportrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eodreport',
+            name='last_review',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='reports.reportreview'),
+        ),
+        migrations.AddField(
+            model_name='eodreport',
+            name='last_reviewed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_last_review, migrations.RunPython.noop),
+    ]
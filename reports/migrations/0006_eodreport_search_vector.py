@@ -0,0 +1,65 @@
+# Generated by Django 4.2.11 on 2026-10-17 10:06
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import F, Func, TextField, Value
+from django.db.models.functions import Coalesce
+
+
+def plain_text(field):
+    return Func(
+        Coalesce(F(field), Value(''), output_field=TextField()),
+        Value('<[^>]*>'), Value(' '), Value('g'),
+        function='regexp_replace',
+        output_field=TextField()
+    )
+
+
+def create_search_index(apps, schema_editor):
+    # GIN indexes and tsvector only exist on PostgreSQL
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    EODReport = apps.get_model('reports', 'EODReport')
+    EODReport.objects.update(search_vector=(
+        SearchVector('project_name', weight='A', config='english') +
+        SearchVector(plain_text('tasks_completed'), weight='B', config='english') +
+        SearchVector(plain_text('blockers_issues'), weight='C', config='english') +
+        SearchVector(plain_text('next_day_plan'), weight='C', config='english')
+    ))
+    schema_editor.execute(
+        'CREATE INDEX reports_eod_search_gin ON reports_eodreport USING gin (search_vector)'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS reports_eod_search_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0005_eodreport_last_review'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eodreport',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='eodreport',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='reports_eod_search_gin'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_index, drop_search_index),
+            ],
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.11 on 2026-10-17 10:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import reports.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reports', '0006_eodreport_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(help_text="Whose reports are exported (a manager's team or everyone)", max_length=50)),
+                ('params', models.JSONField(blank=True, default=dict, help_text='Dashboard filter parameters')),
+                ('cache_key', models.CharField(db_index=True, help_text='Hash of scope, filters and data version', max_length=64)),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='QUEUED', max_length=10)),
+                ('total_rows', models.IntegerField(default=0)),
+                ('rows_written', models.IntegerField(default=0)),
+                ('file', models.FileField(blank=True, storage=reports.models.export_storage, upload_to='')),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Export Job',
+                'verbose_name_plural': 'Export Jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='reports_exp_status_b9ce26_idx')],
+            },
+        ),
+    ]
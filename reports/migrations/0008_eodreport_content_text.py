@@ -0,0 +1,38 @@
+# Generated by Django 4.2.11 on 2026-10-17 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0007_exportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eodreport',
+            name='blockers_issues_text',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='eodreport',
+            name='next_day_plan_text',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='eodreport',
+            name='preview',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='eodreport',
+            name='tasks_completed_text',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='eodreport',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.11 on 2026-10-17 10:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0009_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('last_slot', models.DateTimeField(blank=True, null=True)),
+                ('last_status', models.CharField(blank=True, choices=[('RUNNING', 'Running'), ('SUCCEEDED', 'Succeeded'), ('FAILED', 'Failed'), ('SKIPPED', 'Skipped')], max_length=10)),
+                ('last_started_at', models.DateTimeField(blank=True, null=True)),
+                ('last_finished_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('owner', models.CharField(blank=True, help_text='Host and process that ran the last slot', max_length=255)),
+            ],
+            options={
+                'verbose_name': 'Scheduled Job',
+                'verbose_name_plural': 'Scheduled Jobs',
+                'ordering': ['name'],
+            },
+        ),
+    ]
@@ -0,0 +1,142 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:02
+
+from datetime import date
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+TABLE = 'reports_eodreport'
+MONTHS_AHEAD = 3
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def table_definition(cursor, table):
+    """
+    The constraints (name, type, definition) and the other indexes
+    (name, CREATE INDEX statement) of ``table``, to recreate them by the
+    same names on the rebuilt table
+    """
+    cursor.execute(
+        "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f', 'c') ORDER BY contype, conname",
+        [table]
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        'SELECT c.relname, pg_get_indexdef(i.indexrelid) FROM pg_index i '
+        'JOIN pg_class c ON c.oid = i.indexrelid '
+        'WHERE i.indrelid = %s::regclass '
+        'AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = i.indexrelid) '
+        'ORDER BY c.relname',
+        [table]
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        'SELECT conname, conrelid::regclass::text FROM pg_constraint '
+        "WHERE confrelid = %s::regclass AND contype = 'f' AND conrelid <> confrelid",
+        [table]
+    )
+    referencing = cursor.fetchall()
+    return constraints, indexes, referencing
+
+
+def rebuild_table(cursor, partition_by, primary_key, create_partitions=None):
+    """
+    Recreate the report table with its rows, id sequence, constraints and
+    indexes, partitioned by ``partition_by`` (or not, if None), with
+    ``primary_key`` as its primary key columns.
+    """
+    old = f'{TABLE}_rebuild'
+    constraints, indexes, referencing = table_definition(cursor, TABLE)
+    if referencing:
+        raise RuntimeError(
+            f'Drop the foreign keys to {TABLE} first: '
+            + ', '.join(f'{name} on {table}' for name, table in referencing)
+        )
+    if partition_by:
+        for name, kind, definition in constraints:
+            if kind == 'u' and 'report_date' not in definition:
+                raise RuntimeError(f'{name} ({definition}) cannot be enforced on a partitioned table')
+
+    cursor.execute(f"SELECT pg_get_serial_sequence('{TABLE}', 'id')")
+    old_sequence = cursor.fetchone()[0]
+    cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {old}')
+    cursor.execute(
+        f'CREATE TABLE {TABLE} (LIKE {old} INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS)'
+        + (f' PARTITION BY {partition_by}' if partition_by else '')
+    )
+    if create_partitions:
+        create_partitions(cursor, old)
+    cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM {old}')
+
+    # The old sequence may be an identity sequence, which can't change owner
+    # and goes with the old table
+    sequence = f'{TABLE}_id_seq'
+    cursor.execute(f'CREATE SEQUENCE {sequence}_new OWNED BY {TABLE}.id')
+    cursor.execute(f'SELECT last_value, is_called FROM {old_sequence}')
+    cursor.execute(f"SELECT setval('{sequence}_new', %s, %s)", cursor.fetchone())
+    cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{sequence}_new')")
+    cursor.execute(f'DROP TABLE {old}')
+    cursor.execute(f'ALTER SEQUENCE {sequence}_new RENAME TO {sequence}')
+
+    for name, kind, definition in constraints:
+        if kind == 'p':
+            definition = f"PRIMARY KEY ({', '.join(primary_key)})"
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}')
+    for name, definition in indexes:
+        cursor.execute(definition)
+
+
+def create_month_partitions(cursor, old):
+    """Partitions for every month with reports through MONTHS_AHEAD months from now, and the default"""
+    this_month = timezone.localdate().replace(day=1)
+    cursor.execute(f'SELECT min(report_date), max(report_date) FROM {old}')
+    first, last = cursor.fetchone()
+    month = min(first or this_month, this_month).replace(day=1)
+    end = add_months(max(last or this_month, this_month).replace(day=1), MONTHS_AHEAD)
+    while month <= end:
+        cursor.execute(
+            f'CREATE TABLE {TABLE}_y{month.year}m{month.month:02d} PARTITION OF {TABLE} '
+            'FOR VALUES FROM (%s) TO (%s)',
+            [month, add_months(month, 1)]
+        )
+        month = add_months(month, 1)
+    cursor.execute(f'CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT')
+
+
+def partition_reports(apps, schema_editor):
+    # Declarative partitioning is PostgreSQL only
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        rebuild_table(cursor, 'RANGE (report_date)', ['id', 'report_date'], create_month_partitions)
+
+
+def unpartition_reports(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        rebuild_table(cursor, None, ['id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0010_scheduledjob'),
+    ]
+
+    operations = [
+        # A partitioned table's primary key has to include report_date, so
+        # nothing can reference its id with a foreign key constraint
+        migrations.AlterField(
+            model_name='reportreview',
+            name='report',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='reports.eodreport'),
+        ),
+        migrations.RunPython(partition_reports, unpartition_reports),
+    ]
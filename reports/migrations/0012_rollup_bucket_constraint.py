@@ -0,0 +1,45 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:12
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+from django.db.models import Count, Min, Sum
+
+
+def merge_duplicate_buckets(apps, schema_editor):
+    # The old unique_together let PostgreSQL store several buckets with no
+    # manager for the same day, department and status; fold them into one
+    DailyReportRollup = apps.get_model('reports', 'DailyReportRollup')
+    duplicates = (
+        DailyReportRollup.objects.filter(manager__isnull=True)
+        .values('report_date', 'department', 'status')
+        .annotate(rows=Count('id'), keep=Min('id'), total=Sum('report_count'), hours=Sum('hours_worked'))
+        .filter(rows__gt=1)
+    )
+    for row in duplicates:
+        bucket = DailyReportRollup.objects.filter(
+            manager__isnull=True,
+            report_date=row['report_date'],
+            department=row['department'],
+            status=row['status'],
+        )
+        bucket.exclude(pk=row['keep']).delete()
+        bucket.update(report_count=row['total'], hours_worked=row['hours'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0011_partition_eodreport'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_buckets, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='dailyreportrollup',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyreportrollup',
+            constraint=models.UniqueConstraint(models.F('report_date'), django.db.models.functions.comparison.Coalesce('manager', models.Value(0)), models.F('department'), models.F('status'), name='reports_rollup_bucket_uniq'),
+        ),
+    ]
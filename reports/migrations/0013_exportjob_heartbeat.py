@@ -0,0 +1,36 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:19
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_review_updated_at(apps, schema_editor):
+    # Existing reviews were last changed when they were made, as far as we know
+    ReportReview = apps.get_model('reports', 'ReportReview')
+    ReportReview.objects.update(updated_at=F('reviewed_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0012_rollup_bucket_constraint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportjob',
+            name='attempts',
+            field=models.IntegerField(default=0, help_text='Times a worker has picked up the job'),
+        ),
+        migrations.AddField(
+            model_name='exportjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='Last sign of life from the worker building the job', null=True),
+        ),
+        migrations.AddField(
+            model_name='reportreview',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_review_updated_at, migrations.RunPython.noop),
+    ]
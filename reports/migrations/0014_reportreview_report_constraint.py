@@ -0,0 +1,100 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# A partitioned report table's primary key is (id, report_date), so no
+# foreign key can reference its id; deferred constraint triggers check the
+# same thing instead: every review's report exists, at commit
+CREATE_TRIGGERS = [
+    """
+    CREATE FUNCTION reports_reportreview_report_exists() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM reports_eodreport WHERE id = NEW.report_id) THEN
+            RAISE foreign_key_violation USING MESSAGE =
+                'reports_reportreview.report_id ' || NEW.report_id || ' has no reports_eodreport row';
+        END IF;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE CONSTRAINT TRIGGER reports_reportreview_report_check
+    AFTER INSERT OR UPDATE OF report_id ON reports_reportreview
+    DEFERRABLE INITIALLY DEFERRED FOR EACH ROW
+    EXECUTE FUNCTION reports_reportreview_report_exists()
+    """,
+    # Reports move between partitions (a DELETE and an INSERT), so the
+    # check is whether the id is still gone when the transaction commits
+    """
+    CREATE FUNCTION reports_eodreport_reviews_gone() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF EXISTS (SELECT 1 FROM reports_reportreview WHERE report_id = OLD.id)
+                AND NOT EXISTS (SELECT 1 FROM reports_eodreport WHERE id = OLD.id) THEN
+            RAISE foreign_key_violation USING MESSAGE =
+                'reports_eodreport ' || OLD.id || ' is still referenced from reports_reportreview';
+        END IF;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE CONSTRAINT TRIGGER reports_eodreport_reviews_check
+    AFTER DELETE OR UPDATE OF id ON reports_eodreport
+    DEFERRABLE INITIALLY DEFERRED FOR EACH ROW
+    EXECUTE FUNCTION reports_eodreport_reviews_gone()
+    """,
+]
+
+DROP_TRIGGERS = [
+    'DROP TRIGGER reports_eodreport_reviews_check ON reports_eodreport',
+    'DROP FUNCTION reports_eodreport_reviews_gone()',
+    'DROP TRIGGER reports_reportreview_report_check ON reports_reportreview',
+    'DROP FUNCTION reports_reportreview_report_exists()',
+]
+
+
+def reports_partitioned(schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return False
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('reports_eodreport')"
+        )
+        return cursor.fetchone() is not None
+
+
+class AlterReportForeignKey(migrations.AlterField):
+    """
+    Add the foreign key constraint 0011 dropped back, except on a
+    partitioned report table, which gets the triggers instead
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if reports_partitioned(schema_editor):
+            for sql in CREATE_TRIGGERS:
+                schema_editor.execute(sql)
+        else:
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if reports_partitioned(schema_editor):
+            for sql in DROP_TRIGGERS:
+                schema_editor.execute(sql)
+        else:
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0013_exportjob_heartbeat'),
+    ]
+
+    operations = [
+        AlterReportForeignKey(
+            model_name='reportreview',
+            name='report',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='reports.eodreport'),
+        ),
+    ]
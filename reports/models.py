@@ -1,14 +1,22 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.files.storage import FileSystemStorage
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from datetime import timedelta
 
+from .content import CONTENT_FIELDS, DERIVED_FIELDS, process_content
+
 
 class EODReport(models.Model):
     """
     End-of-Day Report Model
     Tracks daily employee reports with tasks, hours, blockers, and plans
+    Partitioned by report_date month on PostgreSQL (see reports.partitions)
     """
     STATUS_CHOICES = (
         ('PENDING', 'Pending Review'),
@@ -64,6 +72,55 @@ class EODReport(models.Model):
     submitted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized latest review (maintained by reports.signals)
+    last_review = models.ForeignKey(
+        'ReportReview',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+'
+    )
+    last_reviewed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+
+    # Derived from the HTML fields on save (see reports.content);
+    # NULL text means the report predates the content pipeline
+    tasks_completed_text = models.TextField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+    blockers_issues_text = models.TextField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+    next_day_plan_text = models.TextField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+    preview = models.CharField(
+        max_length=200,
+        blank=True,
+        default='',
+        editable=False
+    )
+    word_count = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+
+    # Full-text search document (PostgreSQL only, maintained by reports.signals)
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False
+    )
+
     class Meta:
         ordering = ['-report_date', '-submitted_at']
         unique_together = ['employee', 'report_date']
@@ -73,11 +130,25 @@ class EODReport(models.Model):
             models.Index(fields=['-report_date']),
             models.Index(fields=['employee', '-report_date']),
             models.Index(fields=['status']),
+            GinIndex(fields=['search_vector'], name='reports_eod_search_gin'),
         ]
 
     def __str__(self):
         return f"{self.employee.get_full_name()} - {self.report_date}"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(CONTENT_FIELDS):
+            for field, value in process_content(
+                self.tasks_completed, self.blockers_issues, self.next_day_plan
+            ).items():
+                setattr(self, field, value)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | set(CONTENT_FIELDS) | set(DERIVED_FIELDS)
+        # Keep the report write and its rollup update (post_save) in one transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def can_edit(self):
         """
         Check if report can still be edited:
@@ -93,12 +164,10 @@ class EODReport(models.Model):
             if self.resubmission_count >= 3:
                 return False
             # Check if within 7 days of last review
-            try:
-                last_review = self.reviews.latest('reviewed_at')
-                days_since_review = (timezone.now() - last_review.reviewed_at).days
-                return days_since_review <= 7
-            except ReportReview.DoesNotExist:
+            if self.last_reviewed_at is None:
                 return False
+            days_since_review = (timezone.now() - self.last_reviewed_at).days
+            return days_since_review <= 7
         return False
 
     def is_pending(self):
@@ -120,6 +189,9 @@ class ReportReview(models.Model):
     Manager's review and comments on EOD reports
     Supports multiple reviews per report for resubmissions
     """
+    # Where the report table is partitioned (PostgreSQL) its primary key is
+    # (id, report_date), so triggers stand in for the foreign key constraint;
+    # see reports.partitions
     report = models.ForeignKey(
         EODReport,
         on_delete=models.CASCADE,
@@ -141,6 +213,7 @@ class ReportReview(models.Model):
         help_text='Manager feedback and comments'
     )
     reviewed_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-reviewed_at']
@@ -150,3 +223,227 @@ class ReportReview(models.Model):
 
     def __str__(self):
         return f"Review by {self.reviewer.get_full_name()} for {self.report}"
+
+
+def rollup_manager_key():
+    """DailyReportRollup's manager as used in its bucket key: 0 for no manager"""
+    return Coalesce('manager', Value(0))
+
+
+class DailyReportRollup(models.Model):
+    """
+    Incrementally maintained report counts per day, manager, department and status.
+    Dashboard stat cards read from here instead of counting EODReport rows.
+    """
+    report_date = models.DateField()
+    manager = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='report_rollups'
+    )
+    department = models.CharField(
+        max_length=100,
+        blank=True,
+        default=''
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=EODReport.STATUS_CHOICES
+    )
+    report_count = models.IntegerField(default=0)
+    hours_worked = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0
+    )
+
+    class Meta:
+        ordering = ['-report_date']
+        constraints = [
+            # Bucket key; COALESCE because PostgreSQL never treats NULL
+            # managers as equal, which would let duplicate buckets in
+            models.UniqueConstraint(
+                'report_date', rollup_manager_key(), 'department', 'status',
+                name='reports_rollup_bucket_uniq',
+            ),
+        ]
+        verbose_name = 'Daily Report Rollup'
+        verbose_name_plural = 'Daily Report Rollups'
+        indexes = [
+            models.Index(fields=['manager', '-report_date']),
+        ]
+
+    def __str__(self):
+        return f"{self.report_date} {self.status}: {self.report_count}"
+
+
+def export_storage():
+    """Export artifacts live outside MEDIA_ROOT so they are never publicly served"""
+    return FileSystemStorage(location=settings.EXPORT_ROOT)
+
+
+class ExportJob(models.Model):
+    """
+    Background report export built by the run_export_worker command.
+    Finished files are reused for identical requests via ``cache_key``.
+    """
+    STATUS_CHOICES = (
+        ('QUEUED', 'Queued'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='export_jobs'
+    )
+    scope = models.CharField(
+        max_length=50,
+        help_text='Whose reports are exported (a manager\'s team or everyone)'
+    )
+    params = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Dashboard filter parameters'
+    )
+    cache_key = models.CharField(
+        max_length=64,
+        db_index=True,
+        help_text='Hash of scope, filters and data version'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='QUEUED'
+    )
+    total_rows = models.IntegerField(default=0)
+    rows_written = models.IntegerField(default=0)
+    file = models.FileField(
+        storage=export_storage,
+        blank=True
+    )
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    attempts = models.IntegerField(
+        default=0,
+        help_text='Times a worker has picked up the job'
+    )
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Last sign of life from the worker building the job'
+    )
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Export Job'
+        verbose_name_plural = 'Export Jobs'
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Export #{self.pk} ({self.get_status_display()})"
+
+    def is_done(self):
+        return self.status == 'DONE'
+
+    def progress_percent(self):
+        if self.status == 'DONE':
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(100, int(self.rows_written * 100 / self.total_rows))
+
+
+class Outbox(models.Model):
+    """
+    Outgoing email, written in the same transaction as whatever triggered it
+    and delivered by the process_outbox command with retries.
+    ``dedupe_key`` makes enqueueing the same logical message twice a no-op.
+    """
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('SENDING', 'Sending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    )
+
+    dedupe_key = models.CharField(
+        max_length=200,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text='Identifies the logical message, e.g. a reminder for one employee and date'
+    )
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='PENDING'
+    )
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Outbox Message'
+        verbose_name_plural = 'Outbox'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {', '.join(self.to)} ({self.get_status_display()})"
+
+
+class ScheduledJob(models.Model):
+    """
+    Last-run state of a run_scheduler job. ``last_slot`` is the scheduled
+    time of the most recent run; advancing it is how a node claims a run,
+    so two schedulers never run the same slot.
+    """
+    STATUS_CHOICES = (
+        ('RUNNING', 'Running'),
+        ('SUCCEEDED', 'Succeeded'),
+        ('FAILED', 'Failed'),
+        ('SKIPPED', 'Skipped'),
+    )
+
+    name = models.CharField(max_length=100, unique=True)
+    last_slot = models.DateTimeField(null=True, blank=True)
+    last_status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        blank=True
+    )
+    last_started_at = models.DateTimeField(null=True, blank=True)
+    last_finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    owner = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text='Host and process that ran the last slot'
+    )
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Scheduled Job'
+        verbose_name_plural = 'Scheduled Jobs'
+
+    def __str__(self):
+        return self.name
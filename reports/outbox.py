@@ -0,0 +1,199 @@
+"""
+Durable email outbox.
+
+Callers enqueue messages instead of sending them, inside the transaction
+of whatever triggered the email, so a message exists exactly when the
+action committed. The process_outbox command claims due messages in
+batches, delivers them through reports.mailer and retries failures with
+exponential backoff. Delivery is at-least-once: a worker that dies between
+sending and recording leaves the message to be retried once its claim
+expires.
+"""
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, F, Max, Min, Q, Count
+from django.utils import timezone
+
+from .mailer import send_bulk
+from .models import Outbox
+
+OUTBOX_BATCH_SIZE = 200
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_BACKOFF_BASE = 60          # seconds before the first retry
+OUTBOX_BACKOFF_MAX = 6 * 60 * 60  # retry delays are capped at six hours
+OUTBOX_CLAIM_TIMEOUT = timedelta(minutes=15)
+
+
+def _outbox_row(message, dedupe_key=None):
+    html_body = ''
+    for content, mimetype in getattr(message, 'alternatives', []):
+        if mimetype == 'text/html':
+            html_body = content
+    return Outbox(
+        dedupe_key=dedupe_key,
+        subject=message.subject,
+        body=message.body,
+        html_body=html_body,
+        from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(message.to),
+    )
+
+
+def enqueue(message, dedupe_key=None):
+    """
+    Queue an EmailMessage for delivery. Returns (outbox, created); a message
+    with a ``dedupe_key`` that is already queued or sent is not added again.
+    """
+    if dedupe_key is None:
+        row = _outbox_row(message)
+        row.save()
+        return row, True
+    row = _outbox_row(message, dedupe_key)
+    return Outbox.objects.get_or_create(
+        dedupe_key=dedupe_key,
+        defaults={
+            field: getattr(row, field)
+            for field in ('subject', 'body', 'html_body', 'from_email', 'to')
+        },
+    )
+
+
+def _queued_keys(keys):
+    """Which of ``keys`` are already in the outbox"""
+    return set(Outbox.objects.filter(dedupe_key__in=keys).values_list('dedupe_key', flat=True))
+
+
+def enqueue_many(messages, batch_size=500):
+    """
+    Queue (message, dedupe_key) pairs in bulk. Keys already in the outbox
+    are skipped. Returns the number of messages newly queued.
+    """
+    queued = 0
+    batch = []
+
+    def flush():
+        existing = _queued_keys([key for _, key in batch if key is not None])
+        pending = []
+        for message, key in batch:
+            if key is not None:
+                # Also drops repeats of a key within the batch
+                if key in existing:
+                    continue
+                existing.add(key)
+            pending.append((message, key))
+        batch.clear()
+        try:
+            with transaction.atomic():
+                Outbox.objects.bulk_create([_outbox_row(message, key) for message, key in pending])
+        except IntegrityError:
+            # A concurrent run queued some of the same keys since the lookup;
+            # queue one at a time to count only the messages added here
+            return sum(enqueue(message, key)[1] for message, key in pending)
+        return len(pending)
+
+    with transaction.atomic():
+        for item in messages:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                queued += flush()
+        if batch:
+            queued += flush()
+    return queued
+
+
+def email_message(row):
+    """The EmailMessage to send for an Outbox row"""
+    message = EmailMultiAlternatives(
+        subject=row.subject,
+        body=row.body,
+        from_email=row.from_email,
+        to=row.to,
+    )
+    if row.html_body:
+        message.attach_alternative(row.html_body, 'text/html')
+    message.outbox_id = row.pk
+    return message
+
+
+def backoff_delay(attempts):
+    """Seconds to wait before retry number ``attempts`` (exponential, jittered)"""
+    delay = min(OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1), OUTBOX_BACKOFF_MAX)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def release_stale_claims():
+    """Return messages claimed by a worker that never finished them to the queue"""
+    return Outbox.objects.filter(
+        status='SENDING',
+        claimed_at__lt=timezone.now() - OUTBOX_CLAIM_TIMEOUT
+    ).update(status='PENDING', claimed_at=None)
+
+
+def claim_batch(size=OUTBOX_BATCH_SIZE):
+    """Mark up to ``size`` due messages as sending and return them"""
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            Outbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='PENDING', next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:size]
+        )
+        Outbox.objects.filter(pk__in=[row.pk for row in rows]).update(
+            status='SENDING', claimed_at=now
+        )
+    return rows
+
+
+def deliver(rows, workers=None):
+    """Send claimed ``rows`` and record the outcome; returns a DeliverySummary"""
+    sent_ids = []
+    failures = []
+
+    def record(message, error):
+        if error is None:
+            sent_ids.append(message.outbox_id)
+        else:
+            failures.append((message.outbox_id, error))
+
+    summary = send_bulk((email_message(row) for row in rows), workers=workers, on_result=record)
+
+    now = timezone.now()
+    Outbox.objects.filter(pk__in=sent_ids).update(
+        status='SENT', sent_at=now, claimed_at=None, attempts=F('attempts') + 1, last_error=''
+    )
+    attempts = {row.pk: row.attempts + 1 for row in rows}
+    for pk, error in failures:
+        attempt = attempts[pk]
+        retry = attempt < OUTBOX_MAX_ATTEMPTS
+        Outbox.objects.filter(pk=pk).update(
+            status='PENDING' if retry else 'FAILED',
+            attempts=attempt,
+            last_error=str(error),
+            claimed_at=None,
+            next_attempt_at=now + timedelta(seconds=backoff_delay(attempt)) if retry else now,
+        )
+    return summary
+
+
+def outbox_metrics(window=timedelta(hours=1)):
+    """Queue depth and delivery latency (creation to send) over ``window``"""
+    now = timezone.now()
+    queue = Outbox.objects.aggregate(
+        pending=Count('pk', filter=Q(status__in=['PENDING', 'SENDING'])),
+        due=Count('pk', filter=Q(status='PENDING', next_attempt_at__lte=now)),
+        failed=Count('pk', filter=Q(status='FAILED')),
+        oldest_pending=Min('created_at', filter=Q(status__in=['PENDING', 'SENDING'])),
+    )
+    latency = Outbox.objects.filter(status='SENT', sent_at__gte=now - window).aggregate(
+        sent=Count('pk'),
+        avg_latency=Avg(F('sent_at') - F('created_at')),
+        max_latency=Max(F('sent_at') - F('created_at')),
+    )
+    oldest = queue.pop('oldest_pending')
+    queue['oldest_pending_age'] = (now - oldest) if oldest else None
+    return {**queue, **latency}
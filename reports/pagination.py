@@ -0,0 +1,57 @@
+"""
+Keyset (cursor) pagination for report lists.
+
+Pages are ordered newest first on (report_date, submitted_at, id) and the
+next page is selected with a WHERE clause on the last row seen, so every
+page costs the same index range scan - no OFFSET and no COUNT(*).
+"""
+import base64
+from datetime import date, datetime
+
+from django.db.models import Q
+
+PAGE_SIZE = 25
+KEYSET_ORDERING = ('-report_date', '-submitted_at', '-id')
+
+
+def encode_cursor(report):
+    """Opaque cursor pointing just after ``report``"""
+    raw = f'{report.report_date.isoformat()}|{report.submitted_at.isoformat()}|{report.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return (report_date, submitted_at, id) or None for a missing/invalid cursor"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        report_date, submitted_at, pk = raw.split('|')
+        return date.fromisoformat(report_date), datetime.fromisoformat(submitted_at), int(pk)
+    except (ValueError, UnicodeError):
+        return None
+
+
+def keyset_page(queryset, cursor=None, page_size=PAGE_SIZE):
+    """
+    Return (reports, next_cursor) for the page that follows ``cursor``.
+    ``next_cursor`` is None on the last page.
+    """
+    queryset = queryset.order_by(*KEYSET_ORDERING)
+
+    position = decode_cursor(cursor)
+    if position:
+        report_date, submitted_at, pk = position
+        queryset = queryset.filter(
+            Q(report_date__lt=report_date) |
+            Q(report_date=report_date, submitted_at__lt=submitted_at) |
+            Q(report_date=report_date, submitted_at=submitted_at, id__lt=pk)
+        )
+
+    # Fetch one extra row to learn whether another page exists
+    reports = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(reports) > page_size:
+        reports = reports[:page_size]
+        next_cursor = encode_cursor(reports[-1])
+    return reports, next_cursor
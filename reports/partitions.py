@@ -0,0 +1,142 @@
+"""
+Monthly range partitions of the EODReport table (PostgreSQL only).
+
+Migration 0011 turns reports_eodreport into a table partitioned by month of
+``report_date``: one partition per month (reports_eodreport_y2025m03) and a
+default partition (reports_eodreport_default) catching reports for months
+without one. Queries bounded by report_date only scan the partitions of the
+months they cover.
+
+ensure_partitions() creates the partitions of the coming months ahead of
+time; the create_report_partitions command runs it daily from the scheduler.
+A partition for a month the default partition already has reports for is
+created empty, filled with those reports and then attached, all in one
+transaction, so the rows never become invisible.
+
+PostgreSQL only enforces unique constraints that include the partition key:
+the primary key is (id, report_date) and (employee, report_date) stays
+unique. No foreign key can reference the id alone, so migration 0014 adds
+deferred constraint triggers that check a review's report exists instead
+(on other backends ReportReview.report is an ordinary foreign key).
+"""
+from datetime import date
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import EODReport
+
+DEFAULT_MONTHS_AHEAD = 3
+
+TABLE = EODReport._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{TABLE}_y{month.year}m{month.month:02d}'
+
+
+def partitioning_enabled():
+    """Whether the report table is partitioned (PostgreSQL after migration 0011)"""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)', [TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def partitions():
+    """(name, bound) of every partition, e.g. ('reports_eodreport_y2025m03', "FOR VALUES FROM ...")"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) '
+            'FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = to_regclass(%s) ORDER BY c.relname',
+            [TABLE]
+        )
+        return cursor.fetchall()
+
+
+def _default_partition_months(cursor):
+    """Months the default partition holds reports for"""
+    cursor.execute(
+        f"SELECT DISTINCT date_trunc('month', report_date)::date "
+        f'FROM {connection.ops.quote_name(DEFAULT_PARTITION)}'
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def create_partition(month):
+    """
+    Add the partition for ``month``, moving the month's reports out of the
+    default partition into it. ATTACH PARTITION takes a SHARE UPDATE
+    EXCLUSIVE lock on the report table, but an ACCESS EXCLUSIVE lock on the
+    default partition, which it scans to check no rows belong to the new
+    month. Until the transaction commits, every query that can't rule out
+    the default partition (anything not bounded by report_date, and all
+    writes of reports for months without a partition) waits. Creating the
+    partitions months ahead keeps the default partition empty, so this is
+    normally brief.
+    """
+    quote = connection.ops.quote_name
+    name = partition_name(month)
+    bounds = [month, add_months(month, 1)]
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Attaching needs the table's CHECK constraints on the partition
+        cursor.execute(
+            f'CREATE TABLE {quote(name)} (LIKE {quote(TABLE)} '
+            f'INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE)'
+        )
+        cursor.execute(
+            f'WITH moved AS ('
+            f'DELETE FROM {quote(DEFAULT_PARTITION)} '
+            f'WHERE report_date >= %s AND report_date < %s RETURNING *'
+            f') INSERT INTO {quote(name)} SELECT * FROM moved',
+            bounds
+        )
+        # Indexes, unique and foreign key constraints are created to match the table's
+        cursor.execute(
+            f'ALTER TABLE {quote(TABLE)} ATTACH PARTITION {quote(name)} '
+            f'FOR VALUES FROM (%s) TO (%s)',
+            bounds
+        )
+    return name
+
+
+def ensure_partitions(months_ahead=DEFAULT_MONTHS_AHEAD, since=None, today=None):
+    """
+    Create the missing partitions from the month of ``since`` (default:
+    this month) through ``months_ahead`` months after this one, and for any
+    month the default partition has reports for. Returns the names of the
+    partitions created; nothing is done unless the table is partitioned.
+    """
+    if not partitioning_enabled():
+        return []
+
+    month = month_start(today or timezone.localdate())
+    last = add_months(month, months_ahead)
+    month = month_start(min(since, month)) if since else month
+    wanted = set()
+    while month <= last:
+        wanted.add(month)
+        month = add_months(month, 1)
+
+    with connection.cursor() as cursor:
+        wanted |= _default_partition_months(cursor)
+    existing = {name for name, _ in partitions()}
+    return [
+        create_partition(month)
+        for month in sorted(wanted)
+        if partition_name(month) not in existing
+    ]
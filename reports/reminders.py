@@ -0,0 +1,91 @@
+"""
+Staggered EOD reminder planning.
+
+Each employee's reminder is due at their preferred time in their own time
+zone, pushed back by a wave offset: employees are spread over
+REMINDER_WAVES waves REMINDER_WAVE_INTERVAL minutes apart, plus up to
+REMINDER_WAVE_JITTER seconds. Offsets are a hash of the employee and date,
+so every run agrees on when someone is due and the waves change daily.
+
+``send_eod_reminders --waves`` runs every few minutes from the scheduler and
+queues only the reminders that have come due, re-checking submissions at
+that moment, so SMTP traffic and the resulting logins arrive in waves
+instead of all at 6 PM.
+"""
+import hashlib
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from accounts.models import User
+from .models import EODReport
+
+
+def employees_without_report(report_date):
+    """Active employees with no report for ``report_date`` (one anti-join query)"""
+    return User.objects.filter(
+        role='EMPLOYEE',
+        is_active=True
+    ).exclude(
+        Exists(EODReport.objects.filter(employee=OuterRef('pk'), report_date=report_date))
+    ).only(
+        'username', 'first_name', 'last_name', 'email', 'reminder_timezone', 'reminder_time'
+    ).order_by('pk')
+
+
+def reminder_zone(name):
+    """ZoneInfo for a user's reminder_timezone, falling back to TIME_ZONE"""
+    if name:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return timezone.get_default_timezone()
+
+
+def wave_offset(employee_id, reminder_date):
+    """Delay after the preferred time for this employee on this date"""
+    digest = hashlib.md5(f'{employee_id}:{reminder_date}'.encode()).digest()
+    value = int.from_bytes(digest[:8], 'big')
+    wave = value % settings.REMINDER_WAVES
+    jitter = (value // settings.REMINDER_WAVES) % (settings.REMINDER_WAVE_JITTER + 1)
+    return timedelta(minutes=wave * settings.REMINDER_WAVE_INTERVAL, seconds=jitter)
+
+
+def reminder_due_at(employee, reminder_date, tz):
+    """When ``employee``'s reminder for ``reminder_date`` is due"""
+    at = employee.reminder_time or datetime.strptime(settings.REMINDER_DEFAULT_TIME, '%H:%M').time()
+    return datetime.combine(reminder_date, at, tzinfo=tz) + wave_offset(employee.pk, reminder_date)
+
+
+def due_reminders(now=None):
+    """
+    Yield (employee, local date) for employees whose reminder has come due
+    today in their time zone and who still have no report for that date.
+    Weekends (local) and employees without an email address are skipped.
+    """
+    now = now or timezone.now()
+    zones = (
+        User.objects.filter(role='EMPLOYEE', is_active=True)
+        .order_by()
+        .values_list('reminder_timezone', flat=True)
+        .distinct()
+    )
+    # NULL and '' both mean the organization time zone
+    for zone in {zone or '' for zone in zones}:
+        tz = reminder_zone(zone)
+        local_now = now.astimezone(tz)
+        local_date = local_now.date()
+        if local_date.weekday() >= 5:
+            continue
+        employees = employees_without_report(local_date).exclude(email='')
+        if zone:
+            employees = employees.filter(reminder_timezone=zone)
+        else:
+            employees = employees.filter(Q(reminder_timezone__isnull=True) | Q(reminder_timezone=''))
+        for employee in employees.iterator(chunk_size=500):
+            if reminder_due_at(employee, local_date, tz) <= local_now:
+                yield employee, local_date
@@ -0,0 +1,155 @@
+"""
+Committing reviews: one report from the review page, or many at once from
+the manager dashboard and admin actions.
+"""
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from accounts.models import User
+from .models import EODReport, ReportReview
+from .rollup import record_report_change, update_report_status
+from .stats import invalidate_employee_stats
+
+# Only one of several concurrent reviews finds the report still pending;
+# the others wait for its row lock, then match nothing. Returns the fields
+# the rollup needs, as they are at the moment of the update.
+_CLAIM_REPORT_SQL = """
+    UPDATE {report} SET status = %s, updated_at = %s, last_reviewed_at = %s
+    WHERE id = %s AND status = 'PENDING'
+    RETURNING report_date, hours_worked,
+        (SELECT manager_id FROM {user} WHERE {user}.id = {report}.employee_id),
+        (SELECT department FROM {user} WHERE {user}.id = {report}.employee_id),
+        employee_id
+"""
+
+# Numbered after the report's latest review, in the same statement
+_INSERT_REVIEW_SQL = """
+    INSERT INTO {review} (report_id, reviewer_id, review_number, comments, reviewed_at, updated_at)
+    SELECT %s, %s, COALESCE(MAX(review_number), 0) + 1, %s, %s, %s
+    FROM {review} WHERE report_id = %s
+    RETURNING id, review_number, report_id
+"""
+
+# PostgreSQL also points the report at the new review in that statement
+_INSERT_LAST_REVIEW_SQL = """
+    WITH review AS ({insert})
+    UPDATE {report} SET last_review_id = review.id
+    FROM review WHERE {report}.id = review.report_id
+    RETURNING review.id, review.review_number
+"""
+
+
+def _sql(template, **extra):
+    return template.format(
+        report=connection.ops.quote_name(EODReport._meta.db_table),
+        review=connection.ops.quote_name(ReportReview._meta.db_table),
+        user=connection.ops.quote_name(User._meta.db_table),
+        **extra,
+    )
+
+
+def reviewable_reports(user):
+    """Reports ``user`` may review: their team's, or everyone's for admins"""
+    if user.is_admin_user():
+        return EODReport.objects.all()
+    if user.is_manager():
+        return EODReport.objects.filter(employee__manager=user)
+    return EODReport.objects.none()
+
+
+def _latest_reviews():
+    return ReportReview.objects.filter(report=OuterRef('pk')).order_by('-review_number')
+
+
+def review_report(report_id, reviewer, decision, comments=None):
+    """
+    Approve or reject (``decision``) one pending report as ``reviewer``.
+
+    An UPDATE ... WHERE status = 'PENDING' RETURNING claims the report and
+    an INSERT ... SELECT adds the review with the next review number, so
+    concurrent reviews can't both succeed or collide on the review number,
+    and no row is read and locked beforehand. Returns the new review's
+    (id, review_number), or None if the report was no longer pending.
+    """
+    now = timezone.now()
+    fields = {f: EODReport._meta.get_field(f) for f in ('report_date', 'hours_worked')}
+    with transaction.atomic(), connection.cursor() as cursor:
+        reviewed_at = connection.ops.adapt_datetimefield_value(now)
+        cursor.execute(_sql(_CLAIM_REPORT_SQL), [decision, reviewed_at, reviewed_at, report_id])
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        report_date, hours_worked, manager_id, department, employee_id = row
+
+        insert = _sql(_INSERT_REVIEW_SQL)
+        params = [report_id, reviewer.pk, comments or None, reviewed_at, reviewed_at, report_id]
+        if connection.vendor == 'postgresql':
+            cursor.execute(_sql(_INSERT_LAST_REVIEW_SQL, insert=insert), params)
+            review_id, review_number = cursor.fetchone()
+        else:
+            # Other backends can't put an INSERT in a WITH clause
+            cursor.execute(insert, params)
+            review_id, review_number, _ = cursor.fetchone()
+            EODReport.objects.filter(pk=report_id).update(last_review_id=review_id)
+
+        state = {
+            'report_date': fields['report_date'].to_python(report_date),
+            'manager_id': manager_id,
+            'department': department,
+            'status': 'PENDING',
+            'hours_worked': fields['hours_worked'].to_python(hours_worked),
+        }
+        record_report_change(state, {**state, 'status': decision})
+
+    invalidate_employee_stats(employee_id)
+    return review_id, review_number
+
+
+def bulk_review(reports, reviewer, decision, comments=None):
+    """
+    Approve or reject (``decision``) the pending reports in ``reports``,
+    recording a review by ``reviewer`` for each, as the review page does
+    one at a time. Reports that are no longer pending are skipped.
+
+    The reports are selected and locked in one query, the reviews are
+    inserted with one bulk_create, and the statuses (with the denormalized
+    last review) are set with one UPDATE. Returns the ids of the reports
+    reviewed.
+    """
+    # Locking a plain pk__in query works whatever ``reports`` is (joins,
+    # DISTINCT from admin search); the status is rechecked once locked
+    pending = EODReport.objects.filter(pk__in=reports.values('pk'), status='PENDING')
+    with transaction.atomic():
+        rows = list(
+            pending.select_for_update()
+            .annotate(last_number=Coalesce(
+                Subquery(_latest_reviews().values('review_number')[:1]), Value(0)
+            ))
+            .order_by('pk')
+            .values_list('pk', 'employee_id', 'last_number')
+        )
+        if not rows:
+            return []
+
+        ReportReview.objects.bulk_create([
+            ReportReview(
+                report_id=pk,
+                reviewer=reviewer,
+                review_number=last_number + 1,
+                comments=comments or None,
+            )
+            for pk, _, last_number in rows
+        ])
+        report_ids = [pk for pk, _, _ in rows]
+        latest = _latest_reviews()
+        update_report_status(
+            EODReport.objects.filter(pk__in=report_ids),
+            decision,
+            last_review=Subquery(latest.values('pk')[:1]),
+            last_reviewed_at=Subquery(latest.values('reviewed_at')[:1]),
+        )
+
+    invalidate_employee_stats(*{employee_id for _, employee_id, _ in rows})
+    return report_ids
@@ -0,0 +1,181 @@
+"""
+Maintenance of the DailyReportRollup table.
+
+Each rollup row holds the number of reports and summed hours for one
+(report_date, manager, department, status) bucket. Reports are counted under
+their employee's *current* manager and department, mirroring the
+``employee__manager=...`` filters the dashboards used before.
+"""
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import EODReport, DailyReportRollup
+
+
+# One statement for any number of buckets: missing buckets are inserted,
+# existing ones (matched on the bucket constraint, see DailyReportRollup)
+# get the deltas added. Both PostgreSQL and SQLite support it.
+_UPSERT_SQL = """
+    INSERT INTO {table} (report_date, manager_id, department, status, report_count, hours_worked)
+    VALUES {values}
+    ON CONFLICT (report_date, (COALESCE(manager_id, 0)), department, status) DO UPDATE SET
+        report_count = {table}.report_count + EXCLUDED.report_count,
+        hours_worked = {table}.hours_worked + EXCLUDED.hours_worked
+"""
+
+
+def apply_deltas(deltas):
+    """
+    Add (report_date, manager_id, department, status, count, hours) deltas
+    to their rollup buckets with one upsert, then drop buckets left empty.
+    Deltas for the same bucket are combined first, since one upsert can't
+    touch a row twice.
+    """
+    combined = {}
+    for report_date, manager_id, department, status, count, hours in deltas:
+        key = (report_date, manager_id, department or '', status)
+        total_count, total_hours = combined.get(key, (0, Decimal(0)))
+        combined[key] = (total_count + count, total_hours + Decimal(str(hours or 0)))
+    # Buckets that net out (a report moving back and forth) need no write
+    rows = [
+        (*key, count, hours) for key, (count, hours) in combined.items() if count or hours
+    ]
+    if not rows:
+        return
+    # The same lock order in every writer avoids deadlocks between them
+    rows.sort(key=lambda row: (row[0], row[1] or 0, row[2], row[3]))
+
+    table = connection.ops.quote_name(DailyReportRollup._meta.db_table)
+    values = ', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(rows))
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            _UPSERT_SQL.format(table=table, values=values),
+            [value for row in rows for value in row],
+        )
+        if any(count < 0 for *_, count, _ in rows):
+            DailyReportRollup.objects.filter(
+                report_date__in={row[0] for row in rows}, report_count__lte=0
+            ).delete()
+
+
+def apply_delta(report_date, manager_id, department, status, count, hours):
+    """Add ``count`` reports and ``hours`` to a single rollup bucket"""
+    apply_deltas([(report_date, manager_id, department, status, count, hours)])
+
+
+def _report_bucket(state):
+    return (
+        state['report_date'],
+        state['manager_id'],
+        state['department'] or '',
+        state['status'],
+    )
+
+
+def report_state(report):
+    """Snapshot of the fields of ``report`` that determine its rollup bucket"""
+    employee = report.employee
+    return {
+        'report_date': report.report_date,
+        'manager_id': employee.manager_id,
+        'department': employee.department,
+        'status': report.status,
+        'hours_worked': Decimal(str(report.hours_worked or 0)),
+    }
+
+
+def record_report_change(previous, current):
+    """
+    Move a report between buckets.
+    ``previous`` / ``current`` are ``report_state`` snapshots, or None when the
+    report was just created / deleted.
+    """
+    if previous == current:
+        return
+
+    deltas = []
+    if previous is not None:
+        deltas.append((*_report_bucket(previous), -1, -previous['hours_worked']))
+    if current is not None:
+        deltas.append((*_report_bucket(current), 1, current['hours_worked']))
+    apply_deltas(deltas)
+
+
+def _grouped_report_totals(reports, *group_by, **annotations):
+    return (
+        reports
+        .order_by()
+        .annotate(**annotations)
+        .values(*group_by)
+        .annotate(report_count=Count('id'), hours=Sum('hours_worked'))
+    )
+
+
+def move_employee(employee_id, old_manager_id, old_department, new_manager_id, new_department):
+    """Re-file an employee's reports after their manager or department changed"""
+    rows = _grouped_report_totals(
+        EODReport.objects.filter(employee_id=employee_id),
+        'report_date', 'status',
+    )
+    deltas = []
+    for row in rows:
+        deltas.append((
+            row['report_date'], old_manager_id, old_department, row['status'],
+            -row['report_count'], -row['hours'],
+        ))
+        deltas.append((
+            row['report_date'], new_manager_id, new_department, row['status'],
+            row['report_count'], row['hours'],
+        ))
+    apply_deltas(deltas)
+
+
+def update_report_status(queryset, status, **fields):
+    """
+    Bulk-update the status of ``queryset`` (and any other ``fields``) and
+    move the affected rows between rollup buckets in the same transaction.
+    Returns the number of reports updated.
+    """
+    with transaction.atomic():
+        moving = _grouped_report_totals(
+            queryset.exclude(status=status),
+            'report_date', 'manager_id', 'dept', 'status',
+            manager_id=F('employee__manager_id'),
+            dept=Coalesce('employee__department', Value('')),
+        )
+        deltas = []
+        for row in moving:
+            bucket = (row['report_date'], row['manager_id'], row['dept'])
+            deltas.append((*bucket, row['status'], -row['report_count'], -row['hours']))
+            deltas.append((*bucket, status, row['report_count'], row['hours']))
+        apply_deltas(deltas)
+        return queryset.update(status=status, updated_at=timezone.now(), **fields)
+
+
+def rebuild_rollup(batch_size=1000):
+    """Recompute the whole rollup table from EODReport. Returns the bucket count."""
+    rows = _grouped_report_totals(
+        EODReport.objects.all(),
+        'report_date', 'manager_id', 'dept', 'status',
+        manager_id=F('employee__manager_id'),
+        dept=Coalesce('employee__department', Value('')),
+    )
+    buckets = [
+        DailyReportRollup(
+            report_date=row['report_date'],
+            manager_id=row['manager_id'],
+            department=row['dept'],
+            status=row['status'],
+            report_count=row['report_count'],
+            hours_worked=row['hours'] or 0,
+        )
+        for row in rows.iterator()
+    ]
+    with transaction.atomic():
+        DailyReportRollup.objects.all().delete()
+        DailyReportRollup.objects.bulk_create(buckets, batch_size=batch_size)
+    return len(buckets)
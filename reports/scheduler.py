@@ -0,0 +1,177 @@
+"""
+In-process job scheduler behind the run_scheduler command.
+
+Jobs are declared in settings.NOTIFICATION_SCHEDULE, either at a wall-clock
+time in TIME_ZONE on given weekdays or every N seconds, and run management
+commands in a thread pool of one long-lived process.
+
+Each job's last scheduled slot is stored in ScheduledJob. A node claims a
+slot by advancing ``last_slot`` with a conditional UPDATE, so when several
+nodes run the scheduler only one of them runs each slot. A slot missed while
+no scheduler was running is caught up on start if it is still within the
+job's grace period, otherwise it is recorded as skipped.
+"""
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ScheduledJob
+
+WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+DEFAULT_GRACE = timedelta(hours=1)
+
+
+def parse_days(spec):
+    """Weekday numbers (Monday=0) from a spec like 'mon-fri' or 'mon,wed,fri'"""
+    days = set()
+    for part in spec.lower().split(','):
+        start, _, end = part.strip().partition('-')
+        first = WEEKDAYS.index(start)
+        last = WEEKDAYS.index(end) if end else first
+        days.update(range(first, last + 1))
+    return days
+
+
+class Job:
+    """One entry of NOTIFICATION_SCHEDULE"""
+
+    def __init__(self, name, command, args=(), at=None, days='mon-sun', every=None, grace=None):
+        if (at is None) == (every is None):
+            raise ValueError(f'Scheduled job {name!r} needs exactly one of "at" or "every"')
+        self.name = name
+        self.command = command
+        self.args = list(args)
+        self.every = every
+        self.days = parse_days(days)
+        self.at = datetime.strptime(at, '%H:%M').time() if at else None
+        if grace is not None:
+            self.grace = timedelta(seconds=grace)
+        else:
+            self.grace = timedelta(seconds=every) if every else DEFAULT_GRACE
+
+    def __str__(self):
+        return self.name
+
+    def due_slot(self, now):
+        """The most recent scheduled time at or before ``now`` (None if there is none)"""
+        if self.every:
+            epoch = now.timestamp()
+            return datetime.fromtimestamp(epoch - epoch % self.every, tz=dt_timezone.utc)
+
+        tz = timezone.get_default_timezone()
+        local_now = timezone.localtime(now, tz)
+        day = local_now.date()
+        for _ in range(8):
+            slot = datetime.combine(day, self.at, tzinfo=tz)
+            if slot <= local_now and day.weekday() in self.days:
+                return slot
+            day -= timedelta(days=1)
+        return None
+
+
+def load_schedule(schedule=None):
+    """Job objects for ``schedule`` (default: settings.NOTIFICATION_SCHEDULE)"""
+    if schedule is None:
+        schedule = settings.NOTIFICATION_SCHEDULE
+    return [Job(name, **spec) for name, spec in schedule.items()]
+
+
+def node_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim_slot(job, slot, now, owner):
+    """
+    Advance ``job`` to ``slot`` unless another node already has. Returns
+    'RUNNING' if this node should run it, 'SKIPPED' if it was claimed but
+    is past its grace period, or None if it was already claimed.
+    """
+    status = 'RUNNING' if now - slot <= job.grace else 'SKIPPED'
+    ScheduledJob.objects.get_or_create(name=job.name)
+    claimed = ScheduledJob.objects.filter(
+        Q(last_slot__isnull=True) | Q(last_slot__lt=slot),
+        name=job.name,
+    ).update(
+        last_slot=slot,
+        last_status=status,
+        last_started_at=now if status == 'RUNNING' else None,
+        last_finished_at=None,
+        last_error='',
+        owner=owner,
+    )
+    return status if claimed else None
+
+
+def run_job(job, slot):
+    """
+    Run ``job``'s command for ``slot`` and record the outcome.
+    Returns (status, output or error, elapsed seconds).
+    """
+    output = StringIO()
+    started = time.monotonic()
+    try:
+        call_command(job.command, *job.args, stdout=output, stderr=output)
+    except Exception as e:
+        status, error = 'FAILED', f'{type(e).__name__}: {e}'
+    else:
+        status, error = 'SUCCEEDED', ''
+    elapsed = time.monotonic() - started
+    try:
+        ScheduledJob.objects.filter(name=job.name, last_slot=slot).update(
+            last_status=status, last_finished_at=timezone.now(), last_error=error
+        )
+    finally:
+        # Pool threads are reused; don't keep a connection open between runs
+        connection.close()
+    return status, error or output.getvalue(), elapsed
+
+
+class Scheduler:
+    """Claims due slots and runs their jobs in a thread pool"""
+
+    def __init__(self, jobs, workers, owner=None):
+        self.jobs = jobs
+        self.owner = owner or node_name()
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scheduler')
+        self.running = {}
+        # Slots already handled by this process, to avoid re-checking the database
+        self.seen = {}
+
+    def tick(self, now=None):
+        """Start every job with a new due slot; returns the (job, slot, status) claimed"""
+        now = now or timezone.now()
+        claimed = []
+        for job in self.jobs:
+            if job.name in self.running:
+                continue
+            slot = job.due_slot(now)
+            if slot is None or self.seen.get(job.name) == slot:
+                continue
+            self.seen[job.name] = slot
+            status = claim_slot(job, slot, now, self.owner)
+            if status == 'RUNNING':
+                self.running[job.name] = (slot, self.pool.submit(run_job, job, slot))
+            if status:
+                claimed.append((job, slot, status))
+        return claimed
+
+    def finished(self):
+        """Collect jobs that completed since the last call: (name, slot, status, output, elapsed)"""
+        done = []
+        for name, (slot, future) in list(self.running.items()):
+            if future.done():
+                del self.running[name]
+                done.append((name, slot, *future.result()))
+        return done
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True)
@@ -0,0 +1,125 @@
+"""
+Full-text search over report content.
+
+On PostgreSQL every report carries a ``search_vector`` (tsvector) built from
+the plain text of its project name, tasks, blockers and next-day plan, served
+by a GIN index. The plain text comes from the ``*_text`` columns written by
+reports.content; reports saved before those existed fall back to stripping
+tags in SQL. Other database backends fall back to ``icontains`` matching
+so local SQLite setups keep working.
+"""
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Func, Q, TextField, Value
+from django.db.models.functions import Coalesce, Concat
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+SEARCH_CONFIG = 'english'
+SEARCH_RESULT_LIMIT = 50
+
+# Highlight markers returned by ts_headline; swapped for <mark> after escaping
+_START_SEL = '\x02'
+_STOP_SEL = '\x03'
+
+
+def search_enabled():
+    """Full-text search needs PostgreSQL"""
+    return connection.vendor == 'postgresql'
+
+
+def plain_text(field):
+    """SQL expression stripping HTML tags from a Summernote field"""
+    return Func(
+        Coalesce(F(field), Value(''), output_field=TextField()),
+        Value('<[^>]*>'), Value(' '), Value('g'),
+        function='regexp_replace',
+        output_field=TextField()
+    )
+
+
+def report_text(field):
+    """Stored plain text of a content field, stripping tags in SQL if not yet processed"""
+    return Coalesce(F(f'{field}_text'), plain_text(field), output_field=TextField())
+
+
+def report_search_vector():
+    """Weighted tsvector over a report's searchable content"""
+    return (
+        SearchVector('project_name', weight='A', config=SEARCH_CONFIG) +
+        SearchVector(report_text('tasks_completed'), weight='B', config=SEARCH_CONFIG) +
+        SearchVector(report_text('blockers_issues'), weight='C', config=SEARCH_CONFIG) +
+        SearchVector(report_text('next_day_plan'), weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vector(reports):
+    """Recompute ``search_vector`` for the given report queryset"""
+    if search_enabled():
+        reports.update(search_vector=report_search_vector())
+
+
+def search_query(query):
+    return SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+
+
+def matching_reports(reports, query):
+    """Filter ``reports`` to those whose content matches ``query``"""
+    if search_enabled():
+        return reports.filter(search_vector=search_query(query))
+    return reports.filter(
+        Q(project_name__icontains=query) |
+        Q(tasks_completed__icontains=query) |
+        Q(blockers_issues__icontains=query) |
+        Q(next_day_plan__icontains=query)
+    )
+
+
+def annotate_search(reports, query):
+    """
+    Annotate ``reports`` with the ``search_rank`` of their content against
+    ``query`` and a ``search_headline`` with the matched terms between
+    markers (pass it through highlight()). PostgreSQL only.
+    """
+    search = search_query(query)
+    return reports.annotate(
+        search_rank=SearchRank(F('search_vector'), search),
+        search_headline=SearchHeadline(
+            Concat(
+                report_text('tasks_completed'), Value(' '),
+                report_text('blockers_issues'), Value(' '),
+                report_text('next_day_plan'),
+            ),
+            search,
+            config=SEARCH_CONFIG,
+            start_sel=_START_SEL,
+            stop_sel=_STOP_SEL,
+            max_fragments=2,
+        ),
+    )
+
+
+def search_reports(reports, query, limit=SEARCH_RESULT_LIMIT):
+    """
+    Return up to ``limit`` reports matching ``query``, best match first.
+    Each report gets a ``search_headline`` with the matched terms in <mark>.
+    """
+    if not search_enabled():
+        return list(matching_reports(reports, query).order_by('-report_date', '-submitted_at')[:limit])
+
+    results = list(
+        annotate_search(matching_reports(reports, query), query)
+        .order_by('-search_rank', '-report_date')[:limit]
+    )
+    for report in results:
+        report.search_headline = highlight(report.search_headline)
+    return results
+
+
+def highlight(headline):
+    """Escape a ts_headline result and turn its markers into <mark> tags"""
+    return mark_safe(
+        escape(headline or '')
+        .replace(_START_SEL, '<mark>')
+        .replace(_STOP_SEL, '</mark>')
+    )
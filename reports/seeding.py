@@ -0,0 +1,506 @@
+"""
+Deterministic synthetic data: an organisation of managers and employees
+with weekday reports, reviews and resubmissions.
+
+The same ``seed`` and end date always produce the same rows. Rows are generated as
+plain dicts with their primary keys assigned up front, so reviews and the
+reports' denormalized last review can point at each other without reading
+anything back, and are written either with bulk_create or, on PostgreSQL,
+with COPY. Model signals don't run; the rollup and search documents are
+rebuilt once the data is in.
+"""
+import io
+import json
+import multiprocessing
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from accounts.models import User
+from .content import process_content
+from .partitions import ensure_partitions
+from .models import EODReport, ReportReview
+from .rollup import rebuild_rollup
+from .search import search_enabled, update_search_vector
+
+DEFAULT_PASSWORD = 'password'
+
+DEPARTMENTS = ['Engineering', 'Design', 'Marketing', 'Sales', 'Support', 'Operations', 'Finance']
+PROJECTS = [
+    'Customer Portal', 'Billing Revamp', 'Mobile App', 'Data Warehouse', 'Onboarding Flow',
+    'Internal Tools', 'Website Refresh', 'Partner API', 'Reporting Suite', 'Trainee',
+]
+FIRST_NAMES = [
+    'Aarav', 'Aisha', 'Ben', 'Chen', 'Diego', 'Elena', 'Fatima', 'Grace', 'Hiro', 'Isla',
+    'Jonas', 'Kavya', 'Liam', 'Maya', 'Noah', 'Olga', 'Priya', 'Rahul', 'Sara', 'Tomás',
+]
+LAST_NAMES = [
+    'Ahmed', 'Brown', 'Costa', 'Dubois', 'Evans', 'Fischer', 'Gupta', 'Hughes', 'Ito', 'Khan',
+    'Lopez', 'Müller', 'Nair', 'Okafor', 'Patel', 'Rossi', 'Singh', 'Tanaka', 'Wang', 'Zhou',
+]
+
+_VERBS = ['Fixed', 'Implemented', 'Reviewed', 'Refactored', 'Tested', 'Documented', 'Deployed', 'Investigated']
+_OBJECTS = [
+    'the login redirect', 'invoice PDF generation', 'the search filters', 'CSV export encoding',
+    'the signup form validation', 'dashboard loading time', 'push notification settings',
+    'the payment webhook', 'user permissions', 'the release checklist', 'flaky integration tests',
+]
+_BLOCKERS = [
+    'Waiting for API credentials from the vendor.',
+    'Staging database was down for most of the afternoon.',
+    'Need design sign-off before continuing.',
+    'Unclear requirements for the edge cases, asked the product owner.',
+    'Build pipeline keeps timing out.',
+]
+_PLANS = [
+    'Continue with', 'Pair with QA on', 'Start on', 'Write tests for', 'Demo', 'Finish the review of',
+]
+_APPROVAL_COMMENTS = [None, None, 'Looks good.', 'Great progress, thanks!', 'Approved.']
+_REJECTION_COMMENTS = [
+    'Please add more detail about what was completed.',
+    'Hours do not match the tasks listed, please check.',
+    'Missing the plan for tomorrow.',
+    'Please split the tasks per project.',
+]
+
+HOURS = [Decimal(h) for h in ('6.00', '6.50', '7.00', '7.50', '8.00', '8.00', '8.00', '8.50', '9.00', '9.50')]
+
+
+def _task_item(rng):
+    item = f'{rng.choice(_VERBS)} {rng.choice(_OBJECTS)}'
+    if rng.random() < 0.3:
+        item = f'<strong>{item}</strong> ({rng.randint(1, 400)} lines changed)'
+    return f'<li>{item}</li>'
+
+
+def _report_content(rng):
+    """(tasks, blockers, plan) HTML as an employee would write it in the editor"""
+    tasks = ''.join(_task_item(rng) for _ in range(rng.randint(2, 6)))
+    tasks = f'<ul>{tasks}</ul>'
+    if rng.random() < 0.4:
+        tasks = f'<p>Worked mostly on {rng.choice(PROJECTS)} today.</p>{tasks}'
+    blockers = f'<p>{rng.choice(_BLOCKERS)}</p>' if rng.random() < 0.25 else ''
+    plan = ''.join(
+        f'<li>{rng.choice(_PLANS)} {rng.choice(_OBJECTS)}</li>' for _ in range(rng.randint(1, 3))
+    )
+    return tasks, blockers, f'<ol>{plan}</ol>'
+
+
+def content_pool(rng, size):
+    """
+    ``size`` distinct report bodies with their derived fields.
+    Sanitizing is the slow part of creating a report, so reports draw their
+    content from this pool instead of each being processed on its own.
+    """
+    return [process_content(*_report_content(rng)) for _ in range(size)]
+
+
+def weekdays(end, count):
+    """The ``count`` weekdays up to and including ``end``, oldest first"""
+    days = []
+    day = end
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day -= timedelta(days=1)
+    return days[::-1]
+
+
+def report_status(rng, age):
+    """
+    (status, resubmission_count) of a report ``age`` weekdays old.
+    Recent reports are mostly still waiting for review; old ones rarely are.
+    """
+    roll = rng.random()
+    if age < 2:
+        status = 'PENDING' if roll < 0.85 else 'APPROVED' if roll < 0.95 else 'REJECTED'
+    elif age < 10:
+        status = 'APPROVED' if roll < 0.82 else 'REJECTED' if roll < 0.9 else 'PENDING'
+    else:
+        status = 'APPROVED' if roll < 0.91 else 'REJECTED' if roll < 0.995 else 'PENDING'
+    roll = rng.random()
+    resubmissions = 0 if roll < 0.85 else 1 if roll < 0.97 else 2
+    return status, resubmissions
+
+
+def review_decisions(status, resubmissions):
+    """
+    Decisions of the reviews a report has had: one rejection per
+    resubmission, then the final decision unless it is pending again.
+    """
+    decisions = ['REJECTED'] * resubmissions
+    if status != 'PENDING':
+        decisions.append(status)
+    return decisions
+
+
+def _aware(day, hour):
+    return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+def _next_id(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def generate_users(rng, managers, employees, password_hash, joined):
+    """
+    Rows for an admin, ``managers`` managers and ``employees`` employees
+    spread evenly over them. Returns (user rows, rows of the managers, rows of the employees).
+    """
+    next_id = _next_id(User)
+
+    def user(username, role, **fields):
+        nonlocal next_id
+        row = {
+            'id': next_id,
+            'username': username,
+            'email': f'{username}@example.com',
+            'first_name': rng.choice(FIRST_NAMES),
+            'last_name': rng.choice(LAST_NAMES),
+            'role': role,
+            'password': password_hash,
+            'is_active': True,
+            'is_staff': False,
+            'is_superuser': False,
+            'date_joined': joined,
+            'updated_at': joined,
+            **fields,
+        }
+        next_id += 1
+        return row
+
+    admin = user('admin', 'ADMIN', is_staff=True, is_superuser=True)
+    manager_rows = [
+        user(f'manager{i:04d}', 'MANAGER', department=DEPARTMENTS[i % len(DEPARTMENTS)])
+        for i in range(1, managers + 1)
+    ]
+    employee_rows = []
+    for i in range(1, employees + 1):
+        manager = manager_rows[(i - 1) % managers]
+        employee_rows.append(user(
+            f'employee{i:05d}', 'EMPLOYEE', manager_id=manager['id'], department=manager['department']
+        ))
+    return [admin, *manager_rows, *employee_rows], manager_rows, employee_rows
+
+
+# Reviews a report can have: a rejection per resubmission (at most 2), then the decision
+MAX_REVIEWS_PER_REPORT = 3
+
+
+class ReportGenerator:
+    """
+    Report and review rows for every weekday of every employee, leaving out
+    a share of days to stand in for missed reports. Submission, review and
+    resubmission times follow each other the way they would in the app.
+
+    Each employee has their own random stream and a fixed block of ids, so
+    employees can be generated in any order, or in parallel, and still give
+    the same rows.
+    """
+
+    def __init__(self, seed, days, pool, report_base, review_base, skip_rate=0.06):
+        self.seed = seed
+        self.pool = pool
+        self.report_base = report_base
+        self.review_base = review_base
+        self.skip_rate = skip_rate
+        # Nothing happens after the evening of the last day
+        self.now = _aware(days[-1], 20)
+        # (age in weekdays, date, 17:00 that day), newest first
+        self.days = [(age, day, _aware(day, 17)) for age, day in enumerate(reversed(days))]
+
+    def employee_rows(self, index, employee):
+        """(report rows, review rows) of the ``index``-th employee"""
+        rng = random.Random(f'{self.seed}:{index}')
+        now = self.now
+        reports, reviews = [], []
+        project = rng.choice(PROJECTS)
+        slot = index * len(self.days)
+        for age, day, evening in self.days:
+            slot += 1
+            if rng.random() < self.skip_rate:
+                continue
+            if rng.random() < 0.1:
+                project = rng.choice(PROJECTS)
+            status, resubmissions = report_status(rng, age)
+
+            report_id = self.report_base + slot
+            submitted = min(evening + timedelta(minutes=rng.randrange(0, 180)), now)
+            updated = submitted
+            last_review_id = last_reviewed_at = None
+            for number, decision in enumerate(review_decisions(status, resubmissions), start=1):
+                reviewed = min(updated + timedelta(minutes=rng.randrange(60, 20 * 60)), now)
+                last_review_id = self.review_base + slot * MAX_REVIEWS_PER_REPORT + number
+                last_reviewed_at = reviewed
+                reviews.append({
+                    'id': last_review_id,
+                    'report_id': report_id,
+                    'reviewer_id': employee['manager_id'],
+                    'review_number': number,
+                    'comments': rng.choice(
+                        _APPROVAL_COMMENTS if decision == 'APPROVED' else _REJECTION_COMMENTS
+                    ),
+                    'reviewed_at': reviewed,
+                    'updated_at': reviewed,
+                })
+                updated = reviewed
+                if number <= resubmissions:
+                    # Resubmitted after this rejection
+                    updated = min(reviewed + timedelta(minutes=rng.randrange(30, 24 * 60)), now)
+
+            reports.append({
+                'id': report_id,
+                'employee_id': employee['id'],
+                'report_date': day,
+                'project_name': project,
+                'hours_worked': rng.choice(HOURS),
+                'status': status,
+                'resubmission_count': resubmissions,
+                'submitted_at': submitted,
+                'updated_at': updated,
+                'last_review_id': last_review_id,
+                'last_reviewed_at': last_reviewed_at,
+                **rng.choice(self.pool),
+            })
+        return reports, reviews
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the given values of auto_now/auto_now_add fields"""
+    fields = [
+        (field, field.auto_now, field.auto_now_add)
+        for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    for field, _, _ in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in fields:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def bulk_create_rows(model, rows, batch_size=5000):
+    """Insert row dicts with bulk_create"""
+    with explicit_timestamps(model):
+        model.objects.bulk_create([model(**row) for row in rows], batch_size=batch_size)
+
+
+# Escaped forms of the strings seen so far; the same few strings repeat in every batch
+_escaped = {}
+
+
+def _copy_text(value):
+    """A string in COPY's text format"""
+    result = _escaped.get(value)
+    if result is None:
+        result = value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+        if len(_escaped) < 100000:
+            _escaped[value] = result
+    return result
+
+
+def _copy_bool(value):
+    return 't' if value else 'f'
+
+
+def _copy_isoformat(value):
+    return value.isoformat()
+
+
+def _copy_json(value):
+    return _copy_text(json.dumps(value))
+
+
+COPY_CONVERTERS = {
+    'CharField': _copy_text,
+    'TextField': _copy_text,
+    'EmailField': _copy_text,
+    'BooleanField': _copy_bool,
+    'DateField': _copy_isoformat,
+    'DateTimeField': _copy_isoformat,
+    'TimeField': _copy_isoformat,
+    'JSONField': _copy_json,
+}
+
+
+def _copy_converter(field):
+    """Function formatting values of ``field`` for COPY (None becomes NULL)"""
+    convert = COPY_CONVERTERS.get(field.get_internal_type(), str)
+
+    def converter(value):
+        return '\\N' if value is None else convert(value)
+    return converter
+
+
+def copy_text(model, rows):
+    """
+    Row dicts in PostgreSQL COPY text format, in the order of
+    ``model``'s concrete fields. Missing columns get the field default, as
+    they would with bulk_create.
+    """
+    columns = [
+        (field.attname, field.get_default(), _copy_converter(field))
+        for field in model._meta.concrete_fields
+    ]
+    return ''.join(
+        '\t'.join([convert(row.get(name, default)) for name, default, convert in columns]) + '\n'
+        for row in rows
+    )
+
+
+def copy_from_text(model, text):
+    """Load COPY text produced by copy_text() into ``model``'s table"""
+    fields = model._meta.concrete_fields
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f'COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN',
+            io.StringIO(text),
+            size=1 << 20,
+        )
+
+
+def reset_sequences(*models):
+    """Move the id sequences past the explicitly assigned primary keys"""
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+_worker_generator = None
+
+
+def _init_worker(generator):
+    global _worker_generator
+    _worker_generator = generator
+
+
+def generate_chunk(employees, use_copy, generator=None):
+    """
+    Rows of the (index, employee row) pairs in ``employees``, as
+    (report count, review count, reports, reviews). With ``use_copy`` the
+    reports and reviews come as COPY text, which is much cheaper to send
+    back from a worker process than the row dicts.
+    """
+    generator = generator or _worker_generator
+    reports, reviews = [], []
+    for index, employee in employees:
+        employee_reports, employee_reviews = generator.employee_rows(index, employee)
+        reports.extend(employee_reports)
+        reviews.extend(employee_reviews)
+    if use_copy:
+        return len(reports), len(reviews), copy_text(EODReport, reports), copy_text(ReportReview, reviews)
+    return len(reports), len(reviews), reports, reviews
+
+
+def seed_dataset(managers, employees, days, seed=0, end_date=None, password=DEFAULT_PASSWORD,
+                 batch_size=20000, pool_size=200, use_copy=None, workers=1, progress=None):
+    """
+    Add a synthetic organisation to the database. Every user gets
+    ``password``; reports cover the ``days`` weekdays up to ``end_date``
+    (default today). Rows are written with COPY when ``use_copy`` is true
+    (default: on PostgreSQL) and bulk_create otherwise, one transaction per
+    batch of about ``batch_size`` reports. With ``workers`` > 1 the rows are
+    generated in that many processes while this one writes them.
+    ``progress`` is called with the running counts after each batch.
+    Returns the number of rows created per model.
+    """
+    if use_copy is None:
+        use_copy = connection.vendor == 'postgresql'
+
+    rng = random.Random(seed)
+    end_date = end_date or timezone.localdate()
+    days = weekdays(end_date, days)
+    # Hashing is deliberately slow; every user shares the one hash
+    password_hash = make_password(password)
+
+    # Otherwise every report before this month lands in the default partition
+    ensure_partitions(since=days[0])
+
+    user_rows, _, employee_rows = generate_users(
+        rng, managers, employees, password_hash, joined=_aware(days[0] - timedelta(days=1), 9)
+    )
+    with transaction.atomic():
+        if use_copy:
+            copy_from_text(User, copy_text(User, user_rows))
+        else:
+            bulk_create_rows(User, user_rows)
+    counts = {'users': len(user_rows), 'reports': 0, 'reviews': 0}
+
+    generator = ReportGenerator(
+        seed, days, content_pool(rng, pool_size),
+        report_base=_next_id(EODReport) - 1,
+        review_base=_next_id(ReportReview) - 1,
+    )
+    per_chunk = max(1, batch_size // len(days))
+    numbered = list(enumerate(employee_rows))
+    chunks = [numbered[start:start + per_chunk] for start in range(0, len(numbered), per_chunk)]
+
+    def write(chunk):
+        report_count, review_count, reports, reviews = chunk
+        # Reports and their reviews reference each other; the foreign keys
+        # are only checked at commit
+        with transaction.atomic():
+            if use_copy:
+                copy_from_text(EODReport, reports)
+                copy_from_text(ReportReview, reviews)
+            else:
+                bulk_create_rows(EODReport, reports)
+                bulk_create_rows(ReportReview, reviews)
+        counts['reports'] += report_count
+        counts['reviews'] += review_count
+        if progress:
+            progress(counts)
+
+    if workers > 1:
+        # Workers only generate rows; all database writes stay in this
+        # process. Keep at most two chunks per worker in flight. Workers are
+        # forked so they start with Django already set up.
+        pending = deque()
+        with ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_worker, initargs=(generator,),
+        ) as pool:
+            for chunk in chunks:
+                pending.append(pool.submit(generate_chunk, chunk, use_copy))
+                if len(pending) >= workers * 2:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+    else:
+        for chunk in chunks:
+            write(generate_chunk(chunk, use_copy, generator))
+
+    reset_sequences(User, EODReport, ReportReview)
+    return counts
+
+
+def rebuild_derived_data(batch_size=50000):
+    """Rebuild the rollup and the search documents after loading rows directly"""
+    rebuild_rollup()
+    if not search_enabled():
+        return
+    # One UPDATE per range of ids rather than one over the whole table
+    last_pk = 0
+    while True:
+        reports = EODReport.objects.filter(pk__gt=last_pk)
+        upper = list(reports.order_by('pk').values_list('pk', flat=True)[batch_size - 1:batch_size])
+        if upper:
+            reports = reports.filter(pk__lte=upper[0])
+        update_search_vector(reports)
+        if not upper:
+            return
+        last_pk = upper[0]
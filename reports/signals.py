@@ -0,0 +1,117 @@
+"""
+Signal handlers for reports app
+"""
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.db.models import Q, OuterRef, Subquery
+from django.dispatch import receiver
+
+from accounts.models import User
+from .models import EODReport, ReportReview
+from .rollup import report_state, record_report_change, move_employee
+from .search import update_search_vector
+from .stats import invalidate_employee_stats
+
+SEARCHABLE_FIELDS = {'project_name', 'tasks_completed', 'blockers_issues', 'next_day_plan'}
+
+
+@receiver(pre_save, sender=EODReport)
+def remember_report_state(sender, instance, raw=False, **kwargs):
+    """Snapshot the stored report so post_save can move it between rollup buckets"""
+    instance._rollup_previous = None
+    if raw or instance._state.adding or not instance.pk:
+        return
+    previous = EODReport.objects.filter(pk=instance.pk).values(
+        'report_date', 'status', 'hours_worked',
+        'employee__manager_id', 'employee__department',
+    ).first()
+    if previous:
+        instance._rollup_previous = {
+            'report_date': previous['report_date'],
+            'manager_id': previous['employee__manager_id'],
+            'department': previous['employee__department'],
+            'status': previous['status'],
+            'hours_worked': previous['hours_worked'],
+        }
+
+
+@receiver(post_save, sender=EODReport)
+def report_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Update the daily rollup and search document, and invalidate cached stats"""
+    if not raw:
+        record_report_change(
+            getattr(instance, '_rollup_previous', None),
+            report_state(instance)
+        )
+        if update_fields is None or SEARCHABLE_FIELDS & set(update_fields):
+            update_search_vector(EODReport.objects.filter(pk=instance.pk))
+    invalidate_employee_stats(instance.employee_id)
+
+
+@receiver(post_delete, sender=EODReport)
+def report_deleted(sender, instance, **kwargs):
+    """Remove a deleted report from the rollup and the owner's cached stats"""
+    record_report_change(report_state(instance), None)
+    invalidate_employee_stats(instance.employee_id)
+
+
+@receiver(post_save, sender=ReportReview)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    """Record the review as the report's latest and invalidate cached stats"""
+    if not raw:
+        EODReport.objects.filter(pk=instance.report_id).filter(
+            Q(last_reviewed_at__isnull=True) | Q(last_reviewed_at__lte=instance.reviewed_at)
+        ).update(last_review=instance, last_reviewed_at=instance.reviewed_at)
+
+        # Keep an already loaded report in sync so a later report.save()
+        # does not write the stale values back
+        if ReportReview.report.is_cached(instance):
+            report = instance.report
+            if report.last_reviewed_at is None or report.last_reviewed_at <= instance.reviewed_at:
+                report.last_review = instance
+                report.last_reviewed_at = instance.reviewed_at
+    invalidate_employee_stats(instance.report.employee_id)
+
+
+@receiver(post_delete, sender=ReportReview)
+def review_deleted(sender, instance, **kwargs):
+    """Fall back to the next most recent review and invalidate cached stats"""
+    latest = ReportReview.objects.filter(report=OuterRef('pk')).order_by('-reviewed_at')
+    EODReport.objects.filter(pk=instance.report_id).update(
+        last_review=Subquery(latest.values('id')[:1]),
+        last_reviewed_at=Subquery(latest.values('reviewed_at')[:1]),
+    )
+    invalidate_employee_stats(instance.report.employee_id)
+
+
+@receiver(pre_save, sender=User)
+def remember_user_team(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Snapshot manager/department so rollup rows follow team reassignments"""
+    instance._rollup_team = None
+    if raw or instance._state.adding or not instance.pk:
+        return
+    if update_fields is not None and not {'manager', 'department'} & set(update_fields):
+        return
+    instance._rollup_team = User.objects.filter(pk=instance.pk).values_list(
+        'manager_id', 'department'
+    ).first()
+
+
+@receiver(post_save, sender=User)
+def user_team_changed(sender, instance, **kwargs):
+    """Re-file the employee's reports in the rollup after a team change"""
+    previous = getattr(instance, '_rollup_team', None)
+    if previous is None:
+        return
+    old_manager_id, old_department = previous
+    if (old_manager_id, old_department or '') != (instance.manager_id, instance.department or ''):
+        move_employee(
+            instance.pk, old_manager_id, old_department,
+            instance.manager_id, instance.department
+        )
+
+
+@receiver(pre_delete, sender=User)
+def manager_deleted(sender, instance, **kwargs):
+    """Team members fall back to no manager (SET_NULL), so move their rollup rows first"""
+    for employee_id, department in instance.team_members.values_list('id', 'department'):
+        move_employee(employee_id, instance.pk, department, None, department)
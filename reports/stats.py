@@ -0,0 +1,85 @@
+"""
+Dashboard statistics for reports app
+"""
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .models import EODReport, DailyReportRollup
+from .utils import get_week_date_range
+
+# Cached stats are invalidated on every report/review save, so the timeout
+# only bounds how long an entry can outlive a missed invalidation.
+EMPLOYEE_STATS_CACHE_TIMEOUT = 60 * 60
+
+
+def _employee_stats_cache_key(employee_id):
+    return f'reports:employee_stats:{employee_id}'
+
+
+def compute_employee_stats(employee, week_start, week_end):
+    """
+    Compute overall and weekly status counts for an employee
+    in a single conditional-aggregation query
+    """
+    in_week = Q(report_date__gte=week_start, report_date__lte=week_end)
+    return EODReport.objects.filter(employee=employee).aggregate(
+        total_reports=Count('id'),
+        pending_reports=Count('id', filter=Q(status='PENDING')),
+        approved_reports=Count('id', filter=Q(status='APPROVED')),
+        week_total=Count('id', filter=in_week),
+        week_pending=Count('id', filter=in_week & Q(status='PENDING')),
+        week_approved=Count('id', filter=in_week & Q(status='APPROVED')),
+        week_rejected=Count('id', filter=in_week & Q(status='REJECTED')),
+    )
+
+
+def get_employee_stats(employee):
+    """
+    Return the employee dashboard stats, served from cache when possible.
+    The cached entry remembers the week it was computed for, so it is
+    recomputed once the work week rolls over.
+    """
+    week_start, week_end = get_week_date_range()
+    key = _employee_stats_cache_key(employee.pk)
+
+    cached = cache.get(key)
+    if cached is not None and cached['week_start'] == week_start:
+        return cached['stats']
+
+    stats = compute_employee_stats(employee, week_start, week_end)
+    cache.set(
+        key,
+        {'week_start': week_start, 'stats': stats},
+        EMPLOYEE_STATS_CACHE_TIMEOUT
+    )
+    return stats
+
+
+def invalidate_employee_stats(*employee_ids):
+    """Drop cached dashboard stats for the given employees"""
+    cache.delete_many([_employee_stats_cache_key(pk) for pk in employee_ids])
+
+
+def get_manager_stats(user, week_start, week_end):
+    """
+    Overall and weekly status counts for a manager's team (or the whole
+    organisation for admins), read from the daily rollup in one query
+    """
+    rollups = DailyReportRollup.objects.all()
+    if not user.is_admin_user():
+        rollups = rollups.filter(manager=user)
+
+    def total(condition=None):
+        return Coalesce(Sum('report_count', filter=condition), 0)
+
+    in_week = Q(report_date__gte=week_start, report_date__lte=week_end)
+    return rollups.aggregate(
+        total_count=total(),
+        pending_count=total(Q(status='PENDING')),
+        approved_count=total(Q(status='APPROVED')),
+        week_total=total(in_week),
+        week_pending=total(in_week & Q(status='PENDING')),
+        week_approved=total(in_week & Q(status='APPROVED')),
+        week_rejected=total(in_week & Q(status='REJECTED')),
+    )
@@ -0,0 +1,215 @@
+"""
+Content-addressed media storage.
+
+Every file saved to media (profile photos, avatar renditions, Summernote
+attachments) is named after the SHA-256 of its contents, keeping only the
+top-level directory and the extension of the requested name:
+
+    profile_photos/3f/3f9a...c1.jpg
+
+Identical uploads are therefore stored once, and since a name can never
+point at different bytes, media can be cached forever (see serve_media and
+the nginx config in FREE_DEPLOYMENT_PLAN.md).
+
+Files are shared between rows, so nothing deletes them when a row changes.
+The gc_media command counts references from every FileField on default
+storage plus the registered reference sources and deletes the orphans.
+"""
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+import time
+from collections import Counter
+
+from django.apps import apps
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db.models import FileField
+from django.utils import timezone
+from django.views.static import serve
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# <dir>/<first two hex digits>/<sha256>[.ext]
+CONTENT_ADDRESSED_RE = re.compile(r'(?:^|/)([0-9a-f]{2})/\1[0-9a-f]{62}(?:\.\w+)?$')
+
+
+def content_hash(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hashed_name(name, digest):
+    """Storage name for contents with ``digest`` uploaded as ``name``"""
+    head, sep, _ = name.replace('\\', '/').partition('/')
+    directory = head if sep else ''
+    ext = os.path.splitext(name)[1].lower()
+    return posixpath.join(directory, digest[:2], digest + ext)
+
+
+def is_content_addressed(name):
+    return bool(CONTENT_ADDRESSED_RE.search(name))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files by content hash and stores duplicates once"""
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = hashed_name(name, content_hash(content))
+        if max_length is not None and len(name) > max_length:
+            raise SuspiciousFileOperation(
+                f'Storage name "{name}" is longer than {max_length} characters.'
+            )
+        if self.exists(name):
+            # Already stored. Refresh the mtime so gc_media, which skips
+            # recently modified files, can't collect it before the new
+            # reference is committed.
+            os.utime(self.path(name))
+            return name
+        return self._save(name, content)
+
+    def _save(self, name, content):
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        if self.directory_permissions_mode is not None:
+            old_umask = os.umask(0o777 & ~self.directory_permissions_mode)
+            try:
+                os.makedirs(directory, self.directory_permissions_mode, exist_ok=True)
+            finally:
+                os.umask(old_umask)
+        else:
+            os.makedirs(directory, exist_ok=True)
+
+        # Write to a temporary file and rename it into place: concurrent
+        # uploads of the same content then both succeed with one file.
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in content.chunks():
+                    f.write(chunk)
+            os.chmod(tmp_path, self.file_permissions_mode or 0o644)
+            os.replace(tmp_path, full_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        return name
+
+
+def serve_media(request, path, document_root=None, show_indexes=False):
+    """django.views.static.serve with immutable caching for content-addressed files"""
+    response = serve(request, path, document_root=document_root, show_indexes=show_indexes)
+    if is_content_addressed(path):
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+_reference_sources = []
+
+
+def register_reference_source(func):
+    """
+    Register ``func`` as a source of media references for gc_media. It must
+    return an iterable of storage names that are in use. FileFields on
+    default storage are counted without registering anything.
+    """
+    _reference_sources.append(func)
+    return func
+
+
+def file_field_references():
+    """Names stored in every FileField that uses default storage"""
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if not isinstance(field, FileField) or field.storage is not default_storage:
+                continue
+            yield from (
+                model._default_manager
+                .exclude(**{field.attname: ''})
+                .filter(**{f'{field.attname}__isnull': False})
+                .values_list(field.attname, flat=True)
+                .iterator(chunk_size=2000)
+            )
+
+
+def reference_counts():
+    """Counter of storage name -> number of references"""
+    counts = Counter(file_field_references())
+    for source in _reference_sources:
+        counts.update(source())
+    return counts
+
+
+def stored_files(storage=default_storage, path=''):
+    """Every file name in ``storage`` under ``path``"""
+    directories, files = storage.listdir(path)
+    for name in files:
+        yield posixpath.join(path, name)
+    for directory in directories:
+        yield from stored_files(storage, posixpath.join(path, directory))
+
+
+def collect_garbage(min_age, chunk_size=500, pause=0, dry_run=False, storage=default_storage):
+    """
+    Delete files in ``storage`` that nothing references, ``chunk_size`` at a
+    time with ``pause`` seconds between chunks. Files modified within
+    ``min_age`` (a timedelta) are kept: they may belong to an upload whose
+    row isn't committed yet, or have just been reused by a duplicate upload.
+
+    Returns a dict of counts: scanned, referenced, shared, missing, deleted
+    and freed (bytes).
+    """
+    counts = reference_counts()
+    stats = dict.fromkeys(['scanned', 'referenced', 'shared', 'missing', 'deleted', 'freed'], 0)
+    if not storage.exists(''):
+        stats['missing'] = len(counts)
+        return stats
+
+    def delete(chunk):
+        # Check the age again right before deleting; the scan may be minutes old
+        cutoff = timezone.now() - min_age
+        for name in chunk:
+            try:
+                if storage.get_modified_time(name) > cutoff:
+                    continue
+                size = storage.size(name)
+                if not dry_run:
+                    storage.delete(name)
+            except FileNotFoundError:
+                continue
+            stats['deleted'] += 1
+            stats['freed'] += size
+
+    cutoff = timezone.now() - min_age
+    found = set()
+    chunk = []
+    for name in stored_files(storage):
+        stats['scanned'] += 1
+        if name in counts:
+            found.add(name)
+            stats['referenced'] += 1
+            stats['shared'] += counts[name] > 1
+            continue
+        if storage.get_modified_time(name) > cutoff:
+            continue
+        chunk.append(name)
+        if len(chunk) >= chunk_size:
+            delete(chunk)
+            chunk = []
+            if pause:
+                time.sleep(pause)
+    if chunk:
+        delete(chunk)
+    stats['missing'] = len(counts.keys() - found)
+    return stats
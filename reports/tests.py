@@ -1,3 +1,1372 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import threading
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+from io import BytesIO, StringIO
+from time import perf_counter
+from unittest import mock, skipIf, skipUnless
 
-# Create your tests here.
+import psycopg2
+from asgiref.sync import sync_to_async
+from openpyxl import load_workbook
+from psycopg2 import extensions
+
+from django import forms
+from django.core import mail
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.files.base import ContentFile
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Sum
+from django.template import engines
+from django.test import AsyncClient, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from eod_project import middleware
+from eod_project.postgresql_pool.pool import ConnectionPool, PoolTimeout
+from reports import (
+    async_views, benchmarks, content, export_jobs, exports, mailer, outbox, partitions, reminders,
+    reviews, rollup, scheduler, search, seeding, stats, storage,
+)
+from reports.management.commands.benchmark_dashboards import dashboard_urlconf
+from reports.models import DailyReportRollup, EODReport, ExportJob, Outbox, ReportReview, ScheduledJob
+from reports.pagination import decode_cursor, keyset_page
+from reports.seeding import rebuild_derived_data, seed_dataset
+
+
+class FailingEmailBackend(EmailBackend):
+    """locmem backend that rejects one address"""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if 'bounce@example.com' in message.to:
+                raise OSError('mailbox unavailable')
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class SendEODRemindersTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user('boss', 'boss@example.com', 'x', role='MANAGER')
+        cls.missing = [
+            User.objects.create_user(
+                f'emp{i}', f'emp{i}@example.com', 'x', role='EMPLOYEE', manager=cls.manager
+            )
+            for i in range(5)
+        ]
+        cls.submitted = User.objects.create_user(
+            'done', 'done@example.com', 'x', role='EMPLOYEE', manager=cls.manager
+        )
+        EODReport.objects.create(
+            employee=cls.submitted,
+            report_date=timezone.now().date(),
+            tasks_completed='<p>Work</p>',
+            hours_worked=8,
+            next_day_plan='<p>More</p>',
+        )
+        User.objects.create_user('gone', 'gone@example.com', 'x', role='EMPLOYEE', is_active=False)
+        User.objects.create_user('noemail', '', 'x', role='EMPLOYEE')
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command('send_eod_reminders', *args, stdout=out)
+        return out.getvalue()
+
+    def deliver(self):
+        out = StringIO()
+        call_command('process_outbox', '--once', stdout=out)
+        return out.getvalue()
+
+    def test_reminds_only_active_employees_without_report(self):
+        output = self.run_command()
+        self.assertIn('Skipping noemail - no email address', output)
+        self.assertIn('Queued 5 reminder(s) for delivery', output)
+        self.assertEqual(mail.outbox, [])
+
+        self.deliver()
+        recipients = sorted(message.to[0] for message in mail.outbox)
+        self.assertEqual(recipients, sorted(user.email for user in self.missing))
+        self.assertEqual(Outbox.objects.filter(status='SENT').count(), 5)
+
+    def test_rerun_on_same_day_does_not_duplicate(self):
+        self.run_command()
+        output = self.run_command()
+        self.assertIn('Queued 0 reminder(s) for delivery', output)
+        self.assertEqual(Outbox.objects.count(), 5)
+
+    def test_missing_set_is_one_query(self):
+        # One anti-join for the recipients, regardless of employee count
+        with self.assertNumQueries(1):
+            self.run_command('--dry-run')
+        self.assertFalse(Outbox.objects.exists())
+
+    @override_settings(EMAIL_BATCH_SIZE=2, EMAIL_SEND_WORKERS=2)
+    def test_batches_share_connections(self):
+        self.run_command()
+        with mock.patch('reports.mailer.get_connection', wraps=mailer.get_connection) as get_connection:
+            self.deliver()
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(get_connection.call_count, 3)
+
+    @override_settings(
+        EMAIL_BATCH_SIZE=2, EMAIL_SEND_WORKERS=2,
+        EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+    )
+    def test_batches_share_smtp_sessions(self):
+        self.run_command()
+        with mock.patch('django.core.mail.backends.smtp.smtplib.SMTP') as smtp:
+            self.deliver()
+        # One SMTP session per batch of two, not one per message
+        self.assertEqual(smtp.call_count, 3)
+        self.assertEqual(smtp.return_value.sendmail.call_count, 5)
+
+    @override_settings(EMAIL_BACKEND='reports.tests.FailingEmailBackend')
+    def test_failures_are_retried_with_backoff(self):
+        self.missing[0].email = 'bounce@example.com'
+        self.missing[0].save()
+        self.run_command()
+        output = self.deliver()
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertIn('Failed to send to bounce@example.com: mailbox unavailable', output)
+
+        failed = Outbox.objects.get(to=['bounce@example.com'])
+        self.assertEqual((failed.status, failed.attempts), ('PENDING', 1))
+        self.assertEqual(failed.last_error, 'mailbox unavailable')
+        self.assertGreater(failed.next_attempt_at, timezone.now())
+
+        # Not due yet, so a second pass sends nothing
+        self.deliver()
+        self.assertEqual(len(mail.outbox), 4)
+
+        # The last allowed attempt marks the message as failed for good
+        Outbox.objects.filter(pk=failed.pk).update(
+            next_attempt_at=timezone.now(), attempts=outbox.OUTBOX_MAX_ATTEMPTS - 1
+        )
+        self.deliver()
+        failed.refresh_from_db()
+        self.assertEqual(failed.status, 'FAILED')
+
+    def test_everyone_submitted(self):
+        EODReport.objects.bulk_create([
+            EODReport(
+                employee=user,
+                report_date=timezone.now().date(),
+                tasks_completed='<p>Work</p>',
+                hours_worked=8,
+                next_day_plan='<p>More</p>',
+            )
+            for user in self.missing + list(User.objects.filter(username='noemail'))
+        ])
+        output = self.run_command()
+        self.assertFalse(Outbox.objects.exists())
+        self.assertIn('All employees have submitted their reports!', output)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class SendManagerNotificationsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.now().date()
+        for m in range(3):
+            manager = User.objects.create_user(f'mgr{m}', f'mgr{m}@example.com', 'x', role='MANAGER')
+            for e in range(m + 1):
+                employee = User.objects.create_user(
+                    f'm{m}e{e}', f'm{m}e{e}@example.com', 'x', role='EMPLOYEE', manager=manager
+                )
+                EODReport.objects.create(
+                    employee=employee,
+                    report_date=today,
+                    tasks_completed='<p>Work</p>',
+                    hours_worked=8,
+                    next_day_plan='<p>More</p>',
+                    status='APPROVED' if m == 0 else 'PENDING',
+                )
+
+    def test_one_digest_per_manager_with_pending_reports(self):
+        out = StringIO()
+        call_command('send_manager_notifications', stdout=out)
+        self.assertIn('Queued 2 notification(s) for delivery', out.getvalue())
+        call_command('process_outbox', '--once', stdout=StringIO())
+        subjects = sorted((message.to[0], message.subject) for message in mail.outbox)
+        self.assertEqual(subjects, [
+            ('mgr1@example.com', 'Pending EOD Reports to Review (2)'),
+            ('mgr2@example.com', 'Pending EOD Reports to Review (3)'),
+        ])
+
+    def test_pending_reports_fetched_in_one_query(self):
+        with self.assertNumQueries(1):
+            call_command('send_manager_notifications', '--dry-run', stdout=StringIO())
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class PasswordResetOutboxTests(TestCase):
+
+    def test_reset_email_is_queued_not_sent(self):
+        User.objects.create_user('reset', 'reset@example.com', 'x', role='EMPLOYEE')
+        response = self.client.post(reverse('accounts:password_reset'), {'email': 'reset@example.com'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(mail.outbox, [])
+        queued = Outbox.objects.get()
+        self.assertEqual(queued.to, ['reset@example.com'])
+
+        call_command('process_outbox', '--once', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('/accounts/password-reset-confirm/', mail.outbox[0].body)
+
+
+class EnqueueManyTests(TestCase):
+
+    def test_repeated_keys_are_queued_once(self):
+        def message(to):
+            return mail.EmailMessage('Subject', 'Body', to=[to])
+
+        outbox.enqueue(message('a@example.com'), dedupe_key='a')
+        queued = outbox.enqueue_many([
+            (message('a@example.com'), 'a'),
+            (message('b@example.com'), 'b'),
+            (message('b@example.com'), 'b'),
+            (message('c@example.com'), None),
+            (message('c@example.com'), None),
+            (message('b@example.com'), 'b'),
+        ], batch_size=4)
+        self.assertEqual(queued, 3)
+        self.assertEqual(Outbox.objects.count(), 4)
+
+    def batch(self):
+        return [
+            (mail.EmailMessage('Subject', 'Body', to=[f'{key}@example.com']), key)
+            for key in ('a', 'b', 'c')
+        ]
+
+    def test_requeueing_a_batch_queues_nothing(self):
+        self.assertEqual(outbox.enqueue_many(self.batch()), 3)
+        self.assertEqual(outbox.enqueue_many(self.batch()), 0)
+        self.assertEqual(Outbox.objects.count(), 3)
+
+    def test_keys_queued_concurrently_are_not_counted(self):
+        outbox.enqueue(mail.EmailMessage('Subject', 'Body', to=['b@example.com']), dedupe_key='b')
+        # Another run queued 'b' between the lookup and the insert
+        with mock.patch.object(outbox, '_queued_keys', return_value=set()):
+            self.assertEqual(outbox.enqueue_many(self.batch()), 2)
+        self.assertEqual(Outbox.objects.count(), 3)
+
+
+@override_settings(
+    REMINDER_DEFAULT_TIME='18:00', REMINDER_WAVES=4, REMINDER_WAVE_INTERVAL=10, REMINDER_WAVE_JITTER=60,
+)
+class ReminderWaveTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employees = [
+            User.objects.create_user(f'w{i}', f'w{i}@example.com', 'x', role='EMPLOYEE')
+            for i in range(40)
+        ]
+        cls.remote = User.objects.create_user(
+            'remote', 'remote@example.com', 'x', role='EMPLOYEE',
+            reminder_timezone='America/New_York', reminder_time=time(17, 0),
+        )
+
+    def at(self, hour, minute, tz='Asia/Kolkata'):
+        # Thursday
+        return datetime(2026, 10, 15, hour, minute, tzinfo=ZoneInfo(tz))
+
+    def due(self, now):
+        return {employee.username for employee, _ in reminders.due_reminders(now)}
+
+    def test_reminders_spread_over_waves(self):
+        self.assertEqual(self.due(self.at(17, 59)), set())
+        first = self.due(self.at(18, 1))
+        everyone = self.due(self.at(18, 32))
+        self.assertTrue(0 < len(first) < 40)
+        self.assertEqual(len(everyone), 40)
+        self.assertLessEqual(first, everyone)
+
+    def test_submitted_employees_are_skipped(self):
+        for employee in self.employees[:10]:
+            EODReport.objects.create(
+                employee=employee, report_date=date(2026, 10, 15),
+                tasks_completed='<p>Work</p>', hours_worked=8, next_day_plan='<p>More</p>',
+            )
+        self.assertEqual(len(self.due(self.at(18, 32))), 30)
+
+    def test_preferred_time_in_own_time_zone(self):
+        self.assertNotIn('remote', self.due(self.at(16, 59, 'America/New_York')))
+        self.assertIn('remote', self.due(self.at(17, 32, 'America/New_York')))
+
+
+class SchedulerTests(TestCase):
+
+    def setUp(self):
+        self.job = scheduler.Job('reminders', 'send_eod_reminders', at='18:00', days='mon-fri')
+
+    def local(self, *args):
+        return datetime(*args, tzinfo=timezone.get_default_timezone())
+
+    def test_daily_slot_is_in_time_zone_and_skips_weekends(self):
+        # Friday 18:00 local is the latest slot for the following Sunday
+        self.assertEqual(self.job.due_slot(self.local(2026, 10, 18, 12, 0)), self.local(2026, 10, 16, 18, 0))
+        self.assertEqual(self.job.due_slot(self.local(2026, 10, 15, 18, 0)), self.local(2026, 10, 15, 18, 0))
+        self.assertEqual(self.job.due_slot(self.local(2026, 10, 15, 17, 59)), self.local(2026, 10, 14, 18, 0))
+
+    def test_slot_is_claimed_once_across_nodes(self):
+        slot = self.local(2026, 10, 15, 18, 0)
+        now = slot + timedelta(minutes=1)
+        self.assertEqual(scheduler.claim_slot(self.job, slot, now, 'node-a'), 'RUNNING')
+        self.assertIsNone(scheduler.claim_slot(self.job, slot, now, 'node-b'))
+        self.assertEqual(ScheduledJob.objects.get(name='reminders').owner, 'node-a')
+
+    def test_missed_slot_caught_up_within_grace_only(self):
+        slot = self.local(2026, 10, 15, 18, 0)
+        self.assertEqual(scheduler.claim_slot(self.job, slot, slot + timedelta(minutes=30), 'n'), 'RUNNING')
+        next_slot = self.local(2026, 10, 16, 18, 0)
+        self.assertEqual(scheduler.claim_slot(self.job, next_slot, next_slot + timedelta(hours=3), 'n'), 'SKIPPED')
+
+
+@override_settings(NOTIFICATION_SCHEDULE={
+    'outbox': {'command': 'process_outbox', 'args': ['--once'], 'every': 60},
+})
+class RunSchedulerCommandTests(TransactionTestCase):
+    """Jobs run in pool threads, which need committed data"""
+
+    def setUp(self):
+        # Keep media jobs (gc_media) away from the real MEDIA_ROOT
+        media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+
+    def test_once_runs_due_jobs(self):
+        call_command('run_scheduler', '--once', stdout=StringIO())
+        state = ScheduledJob.objects.get(name='outbox')
+        self.assertEqual(state.last_status, 'SUCCEEDED')
+        self.assertIsNotNone(state.last_finished_at)
+
+
+class RateLimiterTests(TestCase):
+
+    def test_spaces_calls(self):
+        limiter = mailer.RateLimiter(rate=10)
+        with mock.patch('reports.mailer.time.sleep') as sleep:
+            for _ in range(3):
+                limiter.acquire()
+        waits = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(len(waits), 2)
+        self.assertAlmostEqual(waits[-1], 0.2, places=1)
+
+    def test_zero_rate_is_unlimited(self):
+        limiter = mailer.RateLimiter(rate=0)
+        with mock.patch('reports.mailer.time.sleep') as sleep:
+            limiter.acquire()
+            limiter.acquire()
+        sleep.assert_not_called()
+
+
+class ContentAddressedStorageTests(TestCase):
+
+    def setUp(self):
+        self.root = self.enterContext(tempfile.TemporaryDirectory())
+        self.storage = storage.ContentAddressedStorage(location=self.root)
+
+    def test_names_by_content_and_dedupes(self):
+        first = self.storage.save('django-summernote/2026-10-17/a.PNG', ContentFile(b'same'))
+        second = self.storage.save('django-summernote/2026-10-18/b.png', ContentFile(b'same'))
+        other = self.storage.save('django-summernote/c.png', ContentFile(b'different'))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertRegex(first, r'^django-summernote/[0-9a-f]{2}/[0-9a-f]{64}\.png$')
+        self.assertTrue(storage.is_content_addressed(first))
+        self.assertEqual(os.listdir(os.path.dirname(self.storage.path(first))), [os.path.basename(first)])
+
+    def test_serve_media_marks_hashed_files_immutable(self):
+        name = self.storage.save('profile_photos/me.jpg', ContentFile(b'jpeg'))
+        with open(os.path.join(self.root, 'legacy.jpg'), 'wb') as f:
+            f.write(b'jpeg')
+        request = RequestFactory().get('/media/')
+
+        response = storage.serve_media(request, name, document_root=self.root)
+        self.assertEqual(response['Cache-Control'], storage.IMMUTABLE_CACHE_CONTROL)
+        response = storage.serve_media(request, 'legacy.jpg', document_root=self.root)
+        self.assertNotIn('Cache-Control', response)
+
+    def test_gc_deletes_old_orphans_in_chunks(self):
+        names = [self.storage.save(f'avatars/{i}.jpg', ContentFile(str(i).encode())) for i in range(5)]
+        old = (timezone.now() - timedelta(hours=2)).timestamp()
+        for name in names[:4]:
+            os.utime(self.storage.path(name), (old, old))
+
+        with mock.patch('reports.storage.time.sleep') as sleep:
+            stats = storage.collect_garbage(
+                timedelta(hours=1), chunk_size=2, pause=1, storage=self.storage
+            )
+        self.assertEqual((stats['scanned'], stats['deleted']), (5, 4))
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual([n for n in names if self.storage.exists(n)], names[4:])
+
+
+class FakeConnection:
+    """Just enough of a psycopg2 connection for ConnectionPool"""
+    closed = 0
+    autocommit = True
+    broken = False
+
+    def cursor(self):
+        return mock.MagicMock(**{'__enter__.return_value.execute.side_effect': self.execute})
+
+    def execute(self, sql):
+        if self.broken:
+            raise psycopg2.OperationalError('server closed the connection unexpectedly')
+
+    def get_transaction_status(self):
+        return extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+class ConnectionPoolTests(TestCase):
+
+    def pool(self, **options):
+        return ConnectionPool(FakeConnection, name='test', **options)
+
+    def test_reuses_returned_connections(self):
+        pool = self.pool()
+        conn = pool.getconn()
+        pool.putconn(conn)
+        self.assertIs(pool.getconn(), conn)
+        metrics = pool.metrics()
+        self.assertEqual((metrics['opened'], metrics['checkouts'], metrics['in_use']), (1, 2, 1))
+
+    def test_waits_then_times_out_at_max_size(self):
+        pool = self.pool(max_size=1, timeout=0.05)
+        pool.getconn()
+        with self.assertRaises(PoolTimeout), self.assertLogs('eod_project.db', 'WARNING'):
+            pool.getconn()
+        metrics = pool.metrics()
+        self.assertEqual((metrics['size'], metrics['waits'], metrics['timeouts']), (1, 1, 1))
+
+    def test_replaces_unhealthy_and_expired_connections(self):
+        pool = self.pool()
+        conn = pool.getconn()
+        pool.putconn(conn)
+        conn.broken = True
+        replacement = pool.getconn()
+        self.assertIsNot(replacement, conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.metrics()['failed_checks'], 1)
+
+        pool.max_lifetime = 0
+        pool.putconn(replacement)
+        self.assertTrue(replacement.closed)
+        self.assertEqual(pool.metrics()['size'], 0)
+
+
+@override_settings(ROOT_URLCONF=dashboard_urlconf(async_views))
+class AsyncDashboardViewTests(TransactionTestCase):
+    """The queries run in worker threads, which need committed data"""
+
+    def setUp(self):
+        self.manager = User.objects.create_user('boss', 'boss@example.com', 'x', role='MANAGER')
+        self.employee = User.objects.create_user(
+            'emp', 'emp@example.com', 'x', role='EMPLOYEE', manager=self.manager
+        )
+        self.outsider = User.objects.create_user('other', 'other@example.com', 'x', role='EMPLOYEE')
+        self.report = EODReport.objects.create(
+            employee=self.employee,
+            report_date=timezone.now().date(),
+            tasks_completed='<p>Work</p>',
+            hours_worked=8,
+            next_day_plan='<p>More</p>',
+        )
+        self.client = AsyncClient()
+
+    async def test_employee_dashboard(self):
+        await sync_to_async(self.client.force_login)(self.employee)
+        response = await self.client.get(reverse('reports:employee_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['today_report'], self.report)
+        self.assertEqual(list(response.context['reports']), [self.report])
+
+    async def test_manager_dashboard(self):
+        await sync_to_async(self.client.force_login)(self.manager)
+        response = await self.client.get(reverse('reports:manager_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['reports'], [self.report])
+        self.assertEqual(list(response.context['team_members']), [self.employee])
+
+        await sync_to_async(self.client.force_login)(self.employee)
+        response = await self.client.get(reverse('reports:manager_dashboard'))
+        self.assertRedirects(response, reverse('reports:employee_dashboard'), fetch_redirect_response=False)
+
+    async def test_report_detail_permissions(self):
+        url = reverse('reports:report_detail', args=[self.report.pk])
+        response = await self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('accounts:login'), response.url)
+
+        await sync_to_async(self.client.force_login)(self.manager)
+        response = await self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        await sync_to_async(self.client.force_login)(self.outsider)
+        response = await self.client.get(url)
+        self.assertRedirects(response, reverse('reports:employee_dashboard'), fetch_redirect_response=False)
+
+        response = await self.client.get(reverse('reports:report_detail', args=[self.report.pk + 1]))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(ASYNC_VIEW_DB_CONNECTIONS=2)
+    async def test_run_queries_bounds_connections_per_request(self):
+        threads = []
+
+        def query(value):
+            threads.append(threading.get_ident())
+            return EODReport.objects.filter(pk=self.report.pk).count() and value
+
+        results = await async_views.run_queries(*[(query, n) for n in range(5)])
+        self.assertEqual(results, [0, 1, 2, 3, 4])
+        self.assertLessEqual(len(set(threads)), 2)
+
+
+class RequestBudgetMiddlewareTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user('boss', 'boss@example.com', 'x', role='MANAGER')
+
+    def setUp(self):
+        self.client.force_login(self.manager)
+
+    def test_server_timing_for_staff_only(self):
+        response = self.client.get(reverse('reports:manager_dashboard'))
+        self.assertNotIn('Server-Timing', response)
+
+        User.objects.filter(pk=self.manager.pk).update(is_staff=True)
+        response = self.client.get(reverse('reports:manager_dashboard'))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", tpl;dur=')
+
+    @override_settings(REQUEST_BUDGETS={
+        'default': {'queries': 100},
+        'reports:manager_dashboard': {'queries': 1, 'total_ms': None},
+    })
+    def test_logs_budget_violations(self):
+        with self.assertLogs('eod_project.budgets', 'WARNING') as logs:
+            self.client.get(reverse('reports:manager_dashboard'))
+            self.client.get(reverse('reports:employee_autocomplete'), {'q': 'x'})
+        self.assertEqual(len(logs.records), 1)
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['view'], 'reports:manager_dashboard')
+        self.assertEqual(line['user'], self.manager.pk)
+        self.assertEqual(line['over']['queries'][1], 1)
+        self.assertGreater(line['queries'], 1)
+
+    def test_nested_renders_are_timed_once(self):
+        class WidgetsForm(forms.Form):
+            name = forms.CharField()
+            when = forms.DateField()
+            kind = forms.ChoiceField(choices=[('a', 'A'), ('b', 'B')])
+
+        page = engines['django'].from_string('{{ form }}')
+        timing = middleware.RequestTiming()
+        token = middleware._current.set(timing)
+        try:
+            started = perf_counter()
+            page.render({'form': WidgetsForm()})
+            elapsed = perf_counter() - started
+        finally:
+            middleware._current.reset(token)
+        # The widget templates render inside the page's render
+        self.assertGreater(timing.template, 0)
+        self.assertLessEqual(timing.template, elapsed)
+        self.assertEqual(timing.template_depth, 0)
+
+
+class ViewBenchmarkTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(managers=1, employees=2, days=5)
+        rebuild_derived_data()
+        cls.fixtures = benchmarks.benchmark_fixtures()
+        cls.addClassCleanup(cls.fixtures['export_job'].file.delete, save=False)
+
+    def test_every_url_has_a_case(self):
+        cases = benchmarks.view_cases(self.fixtures)
+        self.assertEqual({case['name'] for case in cases}, benchmarks.url_names())
+
+    def test_measures_every_case(self):
+        runner = benchmarks.ViewRunner()
+        results = {}
+        for case in benchmarks.view_cases(self.fixtures):
+            with self.subTest(case['label']):
+                results[case['label']] = runner.measure(case, repeat=1)
+                self.assertLess(results[case['label']]['status'], 400)
+        self.assertGreater(results['reports:manager_dashboard']['queries'], 0)
+        self.assertEqual(results['accounts:login']['queries'], 0)
+
+    def test_compare_flags_regressions_beyond_tolerance(self):
+        baseline = {'small': {
+            'a': {'status': 200, 'queries': 5, 'wall_ms': 100.0, 'peak_kb': 500.0},
+            'b': {'status': 200, 'queries': 5, 'wall_ms': 2.0, 'peak_kb': 30.0},
+        }}
+        results = {'small': {
+            'a': {'status': 302, 'queries': 6, 'wall_ms': 160.0, 'peak_kb': 520.0},
+            # Small absolute changes on fast views are noise
+            'b': {'status': 200, 'queries': 5, 'wall_ms': 6.0, 'peak_kb': 60.0},
+            'new': {'status': 200, 'queries': 50, 'wall_ms': 1.0, 'peak_kb': 1.0},
+        }}
+        self.assertEqual(benchmarks.compare(results, baseline), [
+            ('small', 'a', 'status', 200, 302),
+            ('small', 'a', 'queries', 5, 6),
+            ('small', 'a', 'wall_ms', 100.0, 160.0),
+        ])
+        self.assertEqual(benchmarks.compare(results, baseline, {'queries': 1, 'time_percent': 100})[1:], [])
+
+
+class SeedSyntheticDataTests(TestCase):
+
+    def test_seeds_consistent_organisation(self):
+        out = StringIO()
+        call_command(
+            'seed_synthetic_data', managers=2, employees=6, days=15, workers=1,
+            method='bulk', end_date=date(2025, 3, 14), stdout=out,
+        )
+        self.assertIn('Loaded 9 users', out.getvalue())
+
+        # One password hash shared by everyone
+        self.assertEqual(User.objects.values('password').distinct().count(), 1)
+        self.assertTrue(User.objects.get(username='employee00001').check_password('password'))
+        self.assertEqual(User.objects.filter(role='EMPLOYEE', manager__isnull=True).count(), 0)
+
+        reports = EODReport.objects.all()
+        self.assertLessEqual(reports.count(), 6 * 15)
+        self.assertEqual(reports.filter(report_date__week_day__in=[1, 7]).count(), 0)
+        for report in reports.filter(reviews__isnull=False).distinct():
+            reviews = list(report.reviews.order_by('review_number'))
+            self.assertEqual(report.last_review, reviews[-1])
+            self.assertEqual(len(reviews), report.resubmission_count + (report.status != 'PENDING'))
+            self.assertGreater(reviews[0].reviewed_at, report.submitted_at)
+        self.assertEqual(reports.filter(tasks_completed_text__isnull=True).count(), 0)
+        self.assertEqual(
+            DailyReportRollup.objects.aggregate(total=Sum('report_count'))['total'], reports.count()
+        )
+
+        with self.assertRaisesMessage(CommandError, 'Synthetic users already exist'):
+            call_command('seed_synthetic_data', managers=1, employees=1, days=1, stdout=StringIO())
+
+    def test_same_seed_same_rows(self):
+        def rows():
+            return (
+                list(User.objects.order_by('username').values_list('username', 'first_name', 'manager__username')),
+                list(EODReport.objects.order_by('employee__username', 'report_date').values_list(
+                    'status', 'resubmission_count', 'hours_worked', 'tasks_completed', 'submitted_at',
+                )),
+            )
+
+        seed_dataset(2, 4, 10, seed=7, end_date=date(2025, 3, 14))
+        first = rows()
+        User.objects.all().delete()
+        seed_dataset(2, 4, 10, seed=7, end_date=date(2025, 3, 14), batch_size=10)
+        self.assertEqual(rows(), first)
+
+    def test_copy_text(self):
+        row = {
+            'id': 1, 'employee_id': 2, 'report_date': date(2025, 3, 14), 'project_name': 'A\tB',
+            'tasks_completed': 'line 1\nline 2 \\ end', 'hours_worked': Decimal('7.50'),
+            'blockers_issues': None, 'next_day_plan': 'x', 'status': 'PENDING',
+            'submitted_at': datetime(2025, 3, 14, 17, tzinfo=dt_timezone.utc),
+            'updated_at': datetime(2025, 3, 14, 17, tzinfo=dt_timezone.utc),
+        }
+        line = seeding.copy_text(EODReport, [row])
+        self.assertTrue(line.endswith('\n'))
+        values = line[:-1].split('\t')
+        self.assertEqual(len(values), len(EODReport._meta.concrete_fields))
+        self.assertEqual(values[:8], [
+            '1', '2', '2025-03-14', 'A\\tB', 'line 1\\nline 2 \\\\ end', '7.50', '\\N', 'x',
+        ])
+        self.assertIn('2025-03-14T17:00:00+00:00', values)
+        # Field defaults for columns the row leaves out
+        self.assertEqual(values[[f.attname for f in EODReport._meta.concrete_fields].index('word_count')], '0')
+
+
+class BulkReviewTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user('boss', 'boss@example.com', 'x', role='MANAGER')
+        self.employee = User.objects.create_user(
+            'emp', 'emp@example.com', 'x', role='EMPLOYEE', manager=self.manager
+        )
+        other_manager = User.objects.create_user('boss2', 'boss2@example.com', 'x', role='MANAGER')
+        outsider = User.objects.create_user(
+            'other', 'other@example.com', 'x', role='EMPLOYEE', manager=other_manager
+        )
+        today = timezone.now().date()
+
+        def report(employee, days_ago, status='PENDING'):
+            return EODReport.objects.create(
+                employee=employee,
+                report_date=today - timedelta(days=days_ago),
+                tasks_completed='<p>Work</p>',
+                hours_worked=8,
+                next_day_plan='<p>More</p>',
+                status=status,
+            )
+
+        self.pending = report(self.employee, 0)
+        # Rejected once and resubmitted: the next review is number 2
+        self.resubmitted = report(self.employee, 1)
+        ReportReview.objects.create(report=self.resubmitted, reviewer=self.manager, review_number=1)
+        self.approved = report(self.employee, 2, status='APPROVED')
+        self.other_team = report(outsider, 0)
+
+    def post(self, user, report_ids, decision='APPROVED', **data):
+        self.client.force_login(user)
+        return self.client.post(
+            reverse('reports:bulk_review'),
+            {'report_ids': report_ids, 'decision': decision, **data},
+            follow=True,
+        )
+
+    def test_reviews_pending_team_reports(self):
+        selected = [self.pending.pk, self.resubmitted.pk, self.approved.pk, self.other_team.pk]
+        response = self.post(self.manager, selected, 'REJECTED', comments='Add detail')
+
+        self.assertRedirects(response, reverse('reports:manager_dashboard'))
+        for report in (self.pending, self.resubmitted, self.approved, self.other_team):
+            report.refresh_from_db()
+        self.assertEqual(self.pending.status, 'REJECTED')
+        self.assertEqual(self.resubmitted.status, 'REJECTED')
+        self.assertEqual(self.approved.status, 'APPROVED')
+        self.assertEqual(self.other_team.status, 'PENDING')
+
+        self.assertEqual(
+            list(self.pending.reviews.values_list('review_number', 'comments')), [(1, 'Add detail')]
+        )
+        latest = self.resubmitted.reviews.order_by('-review_number').first()
+        self.assertEqual(latest.review_number, 2)
+        self.assertEqual(self.resubmitted.last_review, latest)
+        self.assertEqual(self.resubmitted.last_reviewed_at, latest.reviewed_at)
+        self.assertFalse(self.other_team.reviews.exists())
+
+        texts = [str(m) for m in response.context['messages']]
+        self.assertIn('2 report(s) rejected.', texts)
+        self.assertTrue(any(t.startswith('2 selected report(s) were skipped') for t in texts))
+
+        # The rollup followed the status change
+        rejected = DailyReportRollup.objects.filter(manager=self.manager, status='REJECTED')
+        self.assertEqual(rejected.aggregate(n=Sum('report_count'))['n'], 2)
+        self.assertFalse(
+            DailyReportRollup.objects.filter(manager=self.manager, status='PENDING', report_count__gt=0).exists()
+        )
+
+    def test_query_count_does_not_grow_with_buckets(self):
+        def review_queries(days):
+            reports = [
+                EODReport.objects.create(
+                    employee=self.employee, report_date=date(2026, 1, 5) + timedelta(days=day),
+                    tasks_completed='<p>Work</p>', hours_worked=8, next_day_plan='<p>More</p>',
+                )
+                for day in days
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                reviews.bulk_review(
+                    EODReport.objects.filter(pk__in=[r.pk for r in reports]), self.manager, 'APPROVED'
+                )
+            return len(queries)
+
+        # One report and its two buckets, then twenty reports over twenty days
+        self.assertEqual(review_queries(range(1)), review_queries(range(10, 30)))
+
+    def test_employees_cannot_bulk_review(self):
+        self.post(self.employee, [self.pending.pk])
+        self.pending.refresh_from_db()
+        self.assertEqual(self.pending.status, 'PENDING')
+        self.assertFalse(self.pending.reviews.exists())
+
+    def test_admin_action_records_reviews(self):
+        admin_user = User.objects.create_superuser('root', 'root@example.com', 'x')
+        self.client.force_login(admin_user)
+        self.client.post(reverse('admin:reports_eodreport_changelist'), {
+            'action': 'approve_reports',
+            '_selected_action': [self.pending.pk, self.approved.pk],
+        })
+        self.pending.refresh_from_db()
+        self.assertEqual(self.pending.status, 'APPROVED')
+        self.assertEqual(self.pending.last_review.reviewer, admin_user)
+        self.assertFalse(self.approved.reviews.exists())
+
+
+class ReviewReportTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user('boss', 'boss@example.com', 'x', role='MANAGER')
+        self.employee = User.objects.create_user(
+            'emp', 'emp@example.com', 'x', role='EMPLOYEE', manager=self.manager, department='Eng'
+        )
+        self.report = EODReport.objects.create(
+            employee=self.employee,
+            report_date=timezone.now().date(),
+            tasks_completed='<p>Work</p>',
+            hours_worked=Decimal('7.5'),
+            next_day_plan='<p>More</p>',
+        )
+        ReportReview.objects.create(report=self.report, reviewer=self.manager, review_number=1)
+
+    def test_review_page_commits_review(self):
+        self.client.force_login(self.manager)
+        response = self.client.post(
+            reverse('reports:review_report', args=[self.report.pk]),
+            {'decision': 'REJECTED', 'comments': 'More detail'},
+            follow=True,
+        )
+        self.assertRedirects(response, reverse('reports:manager_dashboard'))
+        self.assertIn('Report rejected successfully (Review #2)!', str(list(response.context['messages'])[0]))
+
+        self.report.refresh_from_db()
+        review = self.report.last_review
+        self.assertEqual(self.report.status, 'REJECTED')
+        self.assertEqual((review.review_number, review.reviewer, review.comments), (2, self.manager, 'More detail'))
+        self.assertEqual(self.report.last_reviewed_at, review.reviewed_at)
+        self.assertEqual(
+            list(DailyReportRollup.objects.values_list('department', 'status', 'report_count', 'hours_worked')),
+            [('Eng', 'REJECTED', 1, Decimal('7.50'))],
+        )
+
+    def test_only_one_review_of_a_pending_report(self):
+        first = reviews.review_report(self.report.pk, self.manager, 'APPROVED')
+        self.assertEqual(first[1], 2)
+        self.assertIsNone(reviews.review_report(self.report.pk, self.manager, 'REJECTED'))
+
+        self.report.refresh_from_db()
+        self.assertEqual(self.report.status, 'APPROVED')
+        self.assertEqual(self.report.last_review_id, first[0])
+        self.assertEqual(self.report.reviews.count(), 2)
+
+
+class ReportPartitionTests(TestCase):
+    def test_months(self):
+        self.assertEqual(partitions.add_months(date(2025, 11, 1), 3), date(2026, 2, 1))
+        self.assertEqual(partitions.add_months(date(2025, 1, 1), -1), date(2024, 12, 1))
+        self.assertEqual(partitions.partition_name(date(2025, 3, 1)), 'reports_eodreport_y2025m03')
+
+    @skipIf(connection.vendor == 'postgresql', 'The report table is partitioned on PostgreSQL')
+    def test_reviews_keep_report_foreign_key(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, ReportReview._meta.db_table)
+        self.assertIn(
+            (['report_id'], (EODReport._meta.db_table, 'id')),
+            [(c['columns'], c['foreign_key']) for c in constraints.values() if c['foreign_key']],
+        )
+
+    @skipIf(connection.vendor == 'postgresql', 'The report table is partitioned on PostgreSQL')
+    def test_command_without_partitioning(self):
+        out = StringIO()
+        call_command('create_report_partitions', stdout=out)
+        self.assertIn('not partitioned', out.getvalue())
+
+    @skipUnless(connection.vendor == 'postgresql', 'Partitioning needs PostgreSQL')
+    def test_reports_move_out_of_default_partition(self):
+        employee = User.objects.create_user('emp', 'emp@example.com', 'x', role='EMPLOYEE')
+        report = EODReport.objects.create(
+            employee=employee, report_date=date(2001, 5, 10),
+            tasks_completed='<p>Work</p>', hours_worked=8, next_day_plan='<p>More</p>',
+        )
+
+        def partition_of(pk):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT tableoid::regclass::text FROM reports_eodreport WHERE id = %s', [pk])
+                return cursor.fetchone()[0]
+
+        self.assertEqual(partition_of(report.pk), 'reports_eodreport_default')
+        created = partitions.ensure_partitions(months_ahead=0)
+        self.assertIn('reports_eodreport_y2001m05', created)
+        self.assertEqual(partition_of(report.pk), 'reports_eodreport_y2001m05')
+        self.assertEqual(partitions.ensure_partitions(months_ahead=0), [])
+
+        # A month-bounded query only scans that month's partition
+        may = EODReport.objects.filter(report_date__gte=date(2001, 5, 1), report_date__lt=date(2001, 6, 1))
+        plan = may.explain()
+        self.assertIn('reports_eodreport_y2001m05', plan)
+        self.assertNotIn('reports_eodreport_default', plan)
+        self.assertEqual(list(may), [report])
+
+
+    @skipUnless(connection.vendor == 'postgresql', 'Partitioning needs PostgreSQL')
+    def test_month_boundary_pruning_and_review_integrity(self):
+        manager = User.objects.create_user('boss', 'boss@example.com', 'x', role='MANAGER')
+        employee = User.objects.create_user('emp', 'emp@example.com', 'x', role='EMPLOYEE', manager=manager)
+        may, june = [
+            EODReport.objects.create(
+                employee=employee, report_date=day,
+                tasks_completed='<p>Work</p>', hours_worked=8, next_day_plan='<p>More</p>',
+            )
+            for day in (date(2001, 5, 31), date(2001, 6, 1))
+        ]
+        ReportReview.objects.create(report=may, reviewer=manager, comments='Fine')
+
+        def check_constraints():
+            # The triggers are deferred to commit, which a TestCase never reaches
+            with connection.cursor() as cursor:
+                cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+        # Moving the reviewed report out of the default partition keeps its review valid
+        partitions.ensure_partitions(months_ahead=0)
+        check_constraints()
+
+        plan = EODReport.objects.filter(report_date__gte=date(2001, 6, 1), report_date__lt=date(2001, 7, 1)).explain()
+        self.assertIn('reports_eodreport_y2001m06', plan)
+        self.assertNotIn('reports_eodreport_y2001m05', plan)
+        self.assertNotIn('reports_eodreport_default', plan)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ReportReview.objects.create(report_id=june.pk + 1000, reviewer=manager)
+            check_constraints()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('DELETE FROM reports_eodreport WHERE id = %s', [may.pk])
+            check_constraints()
+
+
+class StreamingExportEncodingTests(TestCase):
+    def test_accepts_encoding(self):
+        self.assertTrue(exports.accepts_encoding('gzip, deflate, br', 'gzip'))
+        self.assertTrue(exports.accepts_encoding('deflate;q=1, GZIP;q=0.5', 'gzip'))
+        self.assertFalse(exports.accepts_encoding('gzip;q=0, deflate', 'gzip'))
+        self.assertFalse(exports.accepts_encoding('gzip; q=0.000', 'gzip'))
+        self.assertTrue(exports.accepts_encoding('*', 'gzip'))
+        self.assertFalse(exports.accepts_encoding('*;q=0', 'gzip'))
+        self.assertFalse(exports.accepts_encoding('', 'gzip'))
+
+    def test_gzip_refused_with_zero_quality(self):
+        manager = User.objects.create_user('boss', 'boss@example.com', 'x', role='MANAGER')
+        self.client.force_login(manager)
+        url = reverse('reports:export_reports_excel') + '?format=csv'
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'Employee'))
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+
+
+class EmployeeStatsCacheTests(TestCase):
+    def test_cache_is_shared_between_processes(self):
+        # Stats invalidated by one worker or command must not survive in another
+        self.assertNotIsInstance(caches['default'], LocMemCache)
+
+    def test_saving_a_report_refreshes_cached_stats(self):
+        employee = User.objects.create_user('emp', 'emp@example.com', 'x', role='EMPLOYEE')
+        self.assertEqual(stats.get_employee_stats(employee)['total_reports'], 0)
+        report = EODReport.objects.create(
+            employee=employee, report_date=timezone.now().date(),
+            tasks_completed='<p>Work</p>', hours_worked=8, next_day_plan='<p>More</p>',
+        )
+        self.assertEqual(stats.get_employee_stats(employee)['pending_reports'], 1)
+        report.status = 'APPROVED'
+        report.save()
+        cached = stats.get_employee_stats(employee)
+        self.assertEqual((cached['pending_reports'], cached['approved_reports']), (0, 1))
+
+
+class DailyReportRollupTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user('boss', 'boss@example.com', 'x', role='MANAGER')
+        self.other_manager = User.objects.create_user('boss2', 'boss2@example.com', 'x', role='MANAGER')
+        self.employee = User.objects.create_user(
+            'emp', 'emp@example.com', 'x', role='EMPLOYEE', manager=self.manager, department='Eng'
+        )
+        self.day = date(2026, 10, 14)
+
+    def report(self, employee, day=None, hours='8'):
+        return EODReport.objects.create(
+            employee=employee, report_date=day or self.day,
+            tasks_completed='<p>Work</p>', hours_worked=Decimal(hours), next_day_plan='<p>More</p>',
+        )
+
+    def buckets(self):
+        return sorted(
+            DailyReportRollup.objects.values_list(
+                'report_date', 'manager__username', 'department', 'status', 'report_count', 'hours_worked'
+            ),
+            key=str,
+        )
+
+    def test_signals_keep_buckets_in_step(self):
+        report = self.report(self.employee, hours='7.5')
+        self.report(self.employee, self.day + timedelta(days=1))
+        self.assertEqual(self.buckets(), [
+            (self.day, 'boss', 'Eng', 'PENDING', 1, Decimal('7.50')),
+            (self.day + timedelta(days=1), 'boss', 'Eng', 'PENDING', 1, Decimal('8.00')),
+        ])
+
+        report.status = 'APPROVED'
+        report.hours_worked = Decimal('6')
+        report.save()
+        self.assertIn((self.day, 'boss', 'Eng', 'APPROVED', 1, Decimal('6.00')), self.buckets())
+        self.assertNotIn('PENDING', [b[3] for b in self.buckets() if b[0] == self.day])
+
+        # Reassigning the employee re-files their reports
+        self.employee.manager = self.other_manager
+        self.employee.department = 'Ops'
+        self.employee.save()
+        self.assertEqual({(b[1], b[2]) for b in self.buckets()}, {('boss2', 'Ops')})
+
+        report.delete()
+        self.assertEqual(self.buckets(), [
+            (self.day + timedelta(days=1), 'boss2', 'Ops', 'PENDING', 1, Decimal('8.00')),
+        ])
+
+    def test_reports_without_manager_share_one_bucket(self):
+        for name in ('a', 'b', 'c'):
+            employee = User.objects.create_user(name, f'{name}@example.com', 'x', role='EMPLOYEE')
+            self.report(employee)
+        self.assertEqual(self.buckets(), [(self.day, None, '', 'PENDING', 3, Decimal('24.00'))])
+
+        # The bucket key treats a missing manager like any other value
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            DailyReportRollup.objects.create(report_date=self.day, manager=None, status='PENDING')
+
+    def test_deleting_a_manager_moves_buckets_to_no_manager(self):
+        self.report(self.employee)
+        self.manager.delete()
+        self.assertEqual(self.buckets(), [(self.day, None, 'Eng', 'PENDING', 1, Decimal('8.00'))])
+
+    def test_rebuild_matches_incremental_rollup(self):
+        loner = User.objects.create_user('loner', 'loner@example.com', 'x', role='EMPLOYEE')
+        for offset in range(3):
+            self.report(self.employee, self.day - timedelta(days=offset), hours=f'{offset + 6}')
+            self.report(loner, self.day - timedelta(days=offset))
+        rollup.update_report_status(EODReport.objects.filter(employee=loner), 'REJECTED')
+        incremental = self.buckets()
+
+        DailyReportRollup.objects.all().delete()
+        self.assertEqual(rollup.rebuild_rollup(), len(incremental))
+        self.assertEqual(self.buckets(), incremental)
+
+
+class ExportJobTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'x', role='ADMIN')
+        self.employee = User.objects.create_user(
+            'emp', 'emp@example.com', 'x', role='EMPLOYEE', first_name='Ann', department='Eng'
+        )
+        self.report = EODReport.objects.create(
+            employee=self.employee, report_date=date(2026, 10, 14),
+            tasks_completed='<p>Work</p>', hours_worked=Decimal('8'), next_day_plan='<p>More</p>',
+        )
+
+    def running_job(self, attempts=1, idle=timedelta(0)):
+        job, _ = export_jobs.submit_export(self.admin, {})
+        job = export_jobs.claim_next_job()
+        ExportJob.objects.filter(pk=job.pk).update(
+            attempts=attempts, heartbeat_at=timezone.now() - idle, rows_written=2000
+        )
+        return job
+
+    def test_stale_running_jobs_are_requeued(self):
+        job = self.running_job(idle=export_jobs.EXPORT_JOB_TIMEOUT + timedelta(minutes=1))
+        self.assertEqual(export_jobs.release_stale_jobs(), (1, 0))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.started_at, job.rows_written), ('QUEUED', None, 0))
+
+        # Picked up again like any queued job
+        self.assertEqual(export_jobs.claim_next_job().pk, job.pk)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('RUNNING', 2))
+
+    def test_jobs_with_recent_heartbeat_keep_running(self):
+        job = self.running_job(idle=timedelta(minutes=1))
+        self.assertEqual(export_jobs.release_stale_jobs(), (0, 0))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'RUNNING')
+
+    def test_worker_fails_jobs_out_of_attempts(self):
+        job = self.running_job(
+            attempts=export_jobs.EXPORT_JOB_MAX_ATTEMPTS,
+            idle=export_jobs.EXPORT_JOB_TIMEOUT + timedelta(minutes=1),
+        )
+        out = StringIO()
+        call_command('run_export_worker', '--once', stdout=out)
+        self.assertIn('0 requeued, 1 failed', out.getvalue())
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertIsNotNone(job.finished_at)
+
+    def test_data_version_follows_employees_and_reviews(self):
+        def version():
+            return export_jobs.data_version(EODReport.objects.all())
+
+        versions = [version()]
+        self.employee.last_name = 'Lee'
+        self.employee.save()
+        versions.append(version())
+        self.employee.department = 'Ops'
+        self.employee.save()
+        versions.append(version())
+
+        reviews.review_report(self.report.pk, self.admin, 'REJECTED', 'Too short')
+        versions.append(version())
+        review = ReportReview.objects.get(report=self.report)
+        review.comments = 'Too short, add details'
+        review.save()
+        versions.append(version())
+        review.delete()
+        versions.append(version())
+
+        self.assertEqual(len(set(map(json.dumps, versions))), len(versions))
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.employee = User.objects.create_user('emp', 'emp@example.com', 'x', role='EMPLOYEE')
+        self.reports = [
+            EODReport.objects.create(
+                employee=self.employee, report_date=date(2026, 9, 1) + timedelta(days=offset),
+                tasks_completed='<p>Work</p>', hours_worked=8, next_day_plan='<p>More</p>',
+            )
+            for offset in range(30)
+        ]
+        self.client.force_login(self.employee)
+
+    def test_pages_follow_the_cursor(self):
+        newest_first = [report.pk for report in reversed(self.reports)]
+        response = self.client.get(reverse('reports:my_reports'))
+        self.assertEqual([r.pk for r in response.context['reports']], newest_first[:25])
+        cursor = response.context['next_cursor']
+        self.assertIsNotNone(cursor)
+
+        response = self.client.get(reverse('reports:my_report_rows'), {'cursor': cursor})
+        self.assertEqual([r.pk for r in response.context['reports']], newest_first[25:])
+        self.assertNotIn('X-Next-Cursor', response)
+
+    def test_next_page_travels_in_header(self):
+        reports, cursor = keyset_page(EODReport.objects.all(), page_size=10)
+        response = self.client.get(reverse('reports:my_report_rows'))
+        self.assertEqual(response['X-Next-Cursor'], keyset_page(EODReport.objects.all())[1])
+        self.assertEqual(decode_cursor(cursor)[2], reports[-1].pk)
+
+    def test_invalid_cursor_starts_over(self):
+        self.assertIsNone(decode_cursor('not a cursor'))
+        reports, _ = keyset_page(EODReport.objects.all(), 'not a cursor', page_size=5)
+        self.assertEqual(reports[0], self.reports[-1])
+
+
+class LatestReviewTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user('boss', 'boss@example.com', 'x', role='MANAGER')
+        self.employee = User.objects.create_user(
+            'emp', 'emp@example.com', 'x', role='EMPLOYEE', manager=self.manager
+        )
+        self.report = EODReport.objects.create(
+            employee=self.employee, report_date=date(2026, 10, 14),
+            tasks_completed='<p>Work</p>', hours_worked=8, next_day_plan='<p>More</p>',
+        )
+
+    def review(self, comments):
+        return ReportReview.objects.create(
+            report=self.report, reviewer=self.manager, comments=comments,
+            review_number=self.report.reviews.count() + 1,
+        )
+
+    def test_latest_review_is_denormalized(self):
+        first = self.review('First')
+        second = self.review('Second')
+        report = EODReport.objects.get(pk=self.report.pk)
+        self.assertEqual((report.last_review_id, report.last_reviewed_at), (second.pk, second.reviewed_at))
+
+        second.delete()
+        report.refresh_from_db()
+        self.assertEqual((report.last_review_id, report.last_reviewed_at), (first.pk, first.reviewed_at))
+
+    def test_can_edit_needs_no_query(self):
+        self.review('Fix it')
+        EODReport.objects.filter(pk=self.report.pk).update(status='REJECTED')
+        report = EODReport.objects.get(pk=self.report.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(report.can_edit())
+
+        report.last_reviewed_at = timezone.now() - timedelta(days=8)
+        self.assertFalse(report.can_edit())
+
+    def test_report_list_queries_do_not_grow_with_reviews(self):
+        self.client.force_login(self.employee)
+        self.client.get(reverse('reports:my_reports'))  # warm the caches
+        with CaptureQueriesContext(connection) as one_report:
+            self.client.get(reverse('reports:my_reports'))
+
+        for offset in range(1, 6):
+            report = EODReport.objects.create(
+                employee=self.employee, report_date=date(2026, 10, 14) - timedelta(days=offset),
+                tasks_completed='<p>Work</p>', hours_worked=8, next_day_plan='<p>More</p>',
+            )
+            ReportReview.objects.create(report=report, reviewer=self.manager, comments='Redo')
+            EODReport.objects.filter(pk=report.pk).update(status='REJECTED')
+        with self.assertNumQueries(len(one_report)):
+            self.client.get(reverse('reports:my_reports'))
+
+
+class ReportSearchTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user('boss', 'boss@example.com', 'x', role='MANAGER')
+        employee = User.objects.create_user('emp', 'emp@example.com', 'x', role='EMPLOYEE', manager=self.manager)
+        self.invoice = EODReport.objects.create(
+            employee=employee, report_date=date(2026, 10, 14), project_name='Billing',
+            tasks_completed='<p>Fixed the <b>invoice</b> totals</p>', hours_worked=8, next_day_plan='<p>Tests</p>',
+        )
+        self.other = EODReport.objects.create(
+            employee=employee, report_date=date(2026, 10, 13), project_name='Website',
+            tasks_completed='<p>New landing page</p>', hours_worked=8, next_day_plan='<p>Invoices</p>',
+        )
+
+    def test_matches_content_best_first(self):
+        results = search.search_reports(EODReport.objects.all(), 'invoice')
+        self.assertEqual(results[0], self.invoice)
+        self.assertNotIn(self.other, search.search_reports(EODReport.objects.all(), 'totals'))
+
+    @skipUnless(connection.vendor == 'postgresql', 'Ranked search needs PostgreSQL')
+    def test_headline_marks_matches(self):
+        results = search.search_reports(EODReport.objects.all(), 'invoice')
+        self.assertIn('<mark>invoice</mark>', results[0].search_headline)
+
+    def test_manager_dashboard_search(self):
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse('reports:manager_dashboard'), {'q': 'landing'})
+        self.assertEqual(list(response.context['reports']), [self.other])
+        self.assertIsNone(response.context['next_cursor'])
+
+    def admin_search(self, query):
+        self.portal = EODReport.objects.create(
+            employee=self.invoice.employee, report_date=date(2026, 10, 1), project_name='Invoice portal',
+            tasks_completed='<p>Invoice export</p>', hours_worked=8, next_day_plan='<p>Deploy</p>',
+        )
+        self.client.force_login(User.objects.create_superuser('root', 'root@example.com', 'x'))
+        return self.client.get(reverse('admin:reports_eodreport_changelist'), {'q': query})
+
+    def test_admin_search_matches_content(self):
+        response = self.admin_search('invoice')
+        self.assertEqual(set(response.context['cl'].result_list), {self.invoice, self.other, self.portal})
+
+    @skipUnless(connection.vendor == 'postgresql', 'Ranked search needs PostgreSQL')
+    def test_admin_search_ranks_best_match_first(self):
+        response = self.admin_search('invoice')
+        # Project name outranks tasks, which outrank the next-day plan, whatever the dates
+        self.assertEqual(list(response.context['cl'].result_list), [self.portal, self.invoice, self.other])
+        self.assertContains(response, '<mark>Invoice</mark> export')
+
+        # Sorting on a column still wins over the rank
+        response = self.client.get(reverse('admin:reports_eodreport_changelist'), {'q': 'invoice', 'o': '2'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.portal, self.other, self.invoice])
+
+
+class EmployeeAutocompleteTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user('boss', 'boss@example.com', 'x', role='MANAGER')
+        self.alice = User.objects.create_user(
+            'alice', 'alice@example.com', 'x', role='EMPLOYEE', manager=self.manager,
+            first_name='Alice', last_name='Martin', department='Eng',
+        )
+        User.objects.create_user(
+            'alicia', 'alicia@example.com', 'x', role='EMPLOYEE', first_name='Alicia', last_name='Ng'
+        )
+        self.url = reverse('reports:employee_autocomplete')
+
+    def test_suggestions_are_scoped_to_the_team(self):
+        self.client.force_login(self.manager)
+        response = self.client.get(self.url, {'q': 'ALI'})
+        self.assertEqual(response.json()['results'], [{
+            'id': self.alice.pk, 'name': 'Alice Martin', 'username': 'alice', 'department': 'Eng',
+        }])
+        self.assertEqual(self.client.get(self.url, {'q': 'a'}).json()['results'], [])
+
+        admin = User.objects.create_user('admin', 'admin@example.com', 'x', role='ADMIN')
+        self.client.force_login(admin)
+        names = [r['username'] for r in self.client.get(self.url, {'q': 'ali'}).json()['results']]
+        self.assertEqual(names, ['alice', 'alicia'])
+
+    def test_employees_are_forbidden(self):
+        self.client.force_login(self.alice)
+        self.assertEqual(self.client.get(self.url, {'q': 'ali'}).status_code, 403)
+
+
+class ExcelExportTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user('boss', 'boss@example.com', 'x', role='MANAGER')
+        employee = User.objects.create_user(
+            'emp', 'emp@example.com', 'x', role='EMPLOYEE', manager=self.manager,
+            first_name='Ann', last_name='Lee', department='Eng',
+        )
+        for offset in range(3):
+            EODReport.objects.create(
+                employee=employee, report_date=date(2026, 10, 14) - timedelta(days=offset),
+                tasks_completed=f'<p>Task <b>{offset}</b></p>', hours_worked=8, next_day_plan='<p>More</p>',
+            )
+
+    def test_workbook_rows(self):
+        progress = []
+        with tempfile.TemporaryFile() as fileobj:
+            with mock.patch.object(exports, 'EXPORT_CHUNK_SIZE', 2):
+                exports.write_reports_xlsx(EODReport.objects.order_by('-report_date'), fileobj, progress.append)
+            fileobj.seek(0)
+            rows = list(load_workbook(fileobj).active.values)
+
+        self.assertEqual(list(rows[0]), exports.HEADERS)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][:3], ('Ann Lee', 'Eng', '2026-10-14'))
+        self.assertEqual(rows[1][4], 'Task 0')
+        self.assertEqual(rows[1][-1], 'No review yet')
+        self.assertEqual(progress, [2])
+
+    def test_export_view(self):
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse('reports:export_reports_excel'))
+        self.assertEqual(response.status_code, 200)
+        rows = list(load_workbook(BytesIO(response.getvalue())).active.values)
+        self.assertEqual(len(rows), 4)
+
+
+class ReportContentTests(TestCase):
+    def test_sanitize_html(self):
+        cleaned = content.sanitize_html(
+            '<p onclick="x()" style="color: red; position: fixed">Hi<script>alert(1)</script></p>'
+            '<a href="javascript:alert(1)">link</a><img src="x.png">'
+        )
+        self.assertEqual(cleaned, '<p style="color: red;">Hi</p><a>link</a>')
+
+    def test_text_preview_and_word_count(self):
+        values = content.process_content(
+            '<p>Fixed <b>two</b> bugs</p><ul><li>one</li><li>two</li></ul>', '', '<p>Ship it</p>'
+        )
+        self.assertEqual(values['tasks_completed_text'], 'Fixed two bugs\none\ntwo')
+        self.assertEqual(values['blockers_issues_text'], '')
+        self.assertEqual(values['preview'], 'Fixed two bugs one two')
+        self.assertEqual(values['word_count'], 7)
+        self.assertEqual(content.make_preview('word ' * 50, length=12), 'word word…')
+
+    def test_derived_fields_follow_saves(self):
+        employee = User.objects.create_user('emp', 'emp@example.com', 'x', role='EMPLOYEE')
+        report = EODReport.objects.create(
+            employee=employee, report_date=date(2026, 10, 14),
+            tasks_completed='<p>Draft<script>x</script></p>', hours_worked=8, next_day_plan='<p>More</p>',
+        )
+        report.refresh_from_db()
+        self.assertEqual((report.tasks_completed, report.preview), ('<p>Draft</p>', 'Draft'))
+
+        report.tasks_completed = '<p>Final text</p>'
+        report.save(update_fields=['tasks_completed'])
+        report.refresh_from_db()
+        self.assertEqual((report.tasks_completed_text, report.word_count), ('Final text', 3))
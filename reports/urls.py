@@ -1,5 +1,9 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# Dashboards and report detail run their queries concurrently under ASGI
+dashboard_views = async_views if settings.ASYNC_VIEWS else views
 
 app_name = 'reports'
 
@@ -8,16 +12,26 @@ urlpatterns = [
     path('', views.dashboard_view, name='dashboard'),
 
     # Employee views
-    path('employee/', views.employee_dashboard_view, name='employee_dashboard'),
+    path('employee/', dashboard_views.employee_dashboard_view, name='employee_dashboard'),
     path('submit/', views.submit_report_view, name='submit_report'),
     path('report/<int:pk>/edit/', views.submit_report_view, name='edit_report'),
     path('my-reports/', views.my_reports_view, name='my_reports'),
+    path('my-reports/rows/', views.my_report_rows_view, name='my_report_rows'),
 
     # Report detail
-    path('report/<int:pk>/', views.report_detail_view, name='report_detail'),
+    path('report/<int:pk>/', dashboard_views.report_detail_view, name='report_detail'),
 
     # Manager views
-    path('manager/', views.manager_dashboard_view, name='manager_dashboard'),
+    path('manager/', dashboard_views.manager_dashboard_view, name='manager_dashboard'),
+    path('manager/rows/', views.manager_report_rows_view, name='manager_report_rows'),
+    path('manager/employees/', views.employee_autocomplete_view, name='employee_autocomplete'),
     path('manager/export/', views.export_reports_excel, name='export_reports_excel'),
+    path('manager/export/jobs/', views.export_job_create_view, name='export_job_create'),
+    path('manager/export/jobs/<int:pk>/', views.export_job_status_view, name='export_job_status'),
+    path('manager/export/jobs/<int:pk>/download/', views.export_job_download_view, name='export_job_download'),
     path('review/<int:pk>/', views.review_report_view, name='review_report'),
+    path('review/bulk/', views.bulk_review_view, name='bulk_review'),
+
+    # Operations
+    path('ops/db-pool/', views.db_pool_metrics_view, name='db_pool_metrics'),
 ]
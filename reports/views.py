@@ -1,17 +1,36 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_POST
 from django.contrib import messages
+from django.urls import reverse
 from django.utils import timezone
-from django.db.models import Q, Count, Avg
-from django.http import HttpResponse
+from django.db.models import Count, Avg
+from django.http import FileResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
 from datetime import timedelta
-import re
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
-from .models import EODReport, ReportReview
-from .forms import EODReportForm, ReportReviewForm, EODReportFilterForm
+import os
+import tempfile
+from eod_project.postgresql_pool.pool import pool_metrics
+from .models import EODReport, ReportReview, ExportJob
+from .forms import EODReportForm, ReportReviewForm, BulkReviewForm
 from .utils import get_week_date_range, is_weekend, get_week_display
+from .stats import get_employee_stats, get_manager_stats
+from .pagination import keyset_page
+from .search import search_reports
+from .employees import autocomplete_employees
+from .filters import filtered_team_reports, filtered_my_reports
+from .content import LIST_DEFERRED_FIELDS
+from .exports import (
+    write_reports_xlsx, iter_reports_csv, iter_reports_ndjson, gzip_stream, accepts_encoding,
+)
+from .export_jobs import submit_export, can_access_job
+from .reviews import bulk_review, review_report, reviewable_reports
+
+# format=... option of export_reports_excel: (content type, extension, row generator)
+STREAMING_EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv', iter_reports_csv),
+    'ndjson': ('application/x-ndjson', 'ndjson', iter_reports_ndjson),
+}
 
 
 @login_required
@@ -26,51 +45,48 @@ def dashboard_view(request):
 @login_required
 def employee_dashboard_view(request):
     """Employee dashboard showing their reports"""
-    # Get employee's reports
-    reports = EODReport.objects.filter(employee=request.user).order_by('-report_date')[:10]
-
-    # Check if today's report exists
     today = timezone.now().date()
-    try:
-        today_report = EODReport.objects.get(employee=request.user, report_date=today)
-        today_report_exists = True
-        can_edit_today_report = today_report.can_edit()
-    except EODReport.DoesNotExist:
-        today_report = None
-        today_report_exists = False
-        can_edit_today_report = False
+    context = _employee_dashboard_context(
+        reports=_recent_reports(request.user),
+        today=today,
+        today_report=EODReport.objects.filter(employee=request.user, report_date=today).first(),
+        rejected_editable_reports=_rejected_editable_reports(request.user),
+        # Overall and weekly statistics (single aggregate query, cached per employee)
+        stats=get_employee_stats(request.user),
+    )
+    return render(request, 'reports/employee_dashboard.html', context)
 
-    # Get current week date range
-    week_start, week_end = get_week_date_range()
 
-    # Get rejected reports that can be edited (within 7 days and under 3 attempts)
-    rejected_editable_reports = []
-    all_rejected = EODReport.objects.filter(employee=request.user, status='REJECTED')
-    for report in all_rejected:
-        if report.can_edit():
-            rejected_editable_reports.append(report)
-
-    # Get overall statistics
-    total_reports = EODReport.objects.filter(employee=request.user).count()
-    pending_reports = EODReport.objects.filter(employee=request.user, status='PENDING').count()
-    approved_reports = EODReport.objects.filter(employee=request.user, status='APPROVED').count()
-
-    # Get weekly statistics
-    week_reports = EODReport.objects.filter(
-        employee=request.user,
-        report_date__gte=week_start,
-        report_date__lte=week_end
+def _recent_reports(user):
+    """The employee's ten latest reports (list columns only)"""
+    return (
+        EODReport.objects.filter(employee=user)
+        .defer(*LIST_DEFERRED_FIELDS)
+        .order_by('-report_date')[:10]
     )
-    week_total = week_reports.count()
-    week_pending = week_reports.filter(status='PENDING').count()
-    week_approved = week_reports.filter(status='APPROVED').count()
-    week_rejected = week_reports.filter(status='REJECTED').count()
 
-    context = {
+
+def _rejected_editable_reports(user):
+    """
+    Rejected reports that can be edited (within 7 days and under 3 attempts).
+    Mirrors can_edit(): a whole-day difference of <= 7 means less than 8 days.
+    """
+    return EODReport.objects.filter(
+        employee=user,
+        status='REJECTED',
+        resubmission_count__lt=3,
+        last_reviewed_at__gt=timezone.now() - timedelta(days=8)
+    ).order_by('-report_date')
+
+
+def _employee_dashboard_context(reports, today, today_report, rejected_editable_reports, stats):
+    # Get current week date range
+    week_start, week_end = get_week_date_range()
+    return {
         'reports': reports,
         'today_report': today_report,
-        'today_report_exists': today_report_exists,
-        'can_edit_today_report': can_edit_today_report,
+        'today_report_exists': today_report is not None,
+        'can_edit_today_report': today_report is not None and today_report.can_edit(),
         'today': today,
         'is_weekend': is_weekend(),
         'week_display': get_week_display(),
@@ -78,17 +94,9 @@ def employee_dashboard_view(request):
         'week_end': week_end,
         # Rejected reports that can be resubmitted
         'rejected_editable_reports': rejected_editable_reports,
-        # Overall stats
-        'total_reports': total_reports,
-        'pending_reports': pending_reports,
-        'approved_reports': approved_reports,
-        # Weekly stats
-        'week_total': week_total,
-        'week_pending': week_pending,
-        'week_approved': week_approved,
-        'week_rejected': week_rejected,
+        # Overall and weekly stats
+        **stats,
     }
-    return render(request, 'reports/employee_dashboard.html', context)
 
 
 @login_required
@@ -179,9 +187,7 @@ def submit_report_view(request, pk=None):
         form = EODReportForm(instance=report, user=request.user)
 
     # Get last review if exists (for displaying rejection comments)
-    last_review = None
-    if report and report.reviews.exists():
-        last_review = report.reviews.latest('reviewed_at')
+    last_review = report.last_review if report else None
 
     context = {
         'form': form,
@@ -196,29 +202,38 @@ def submit_report_view(request, pk=None):
 @login_required
 def report_detail_view(request, pk):
     """View individual report details"""
-    report = get_object_or_404(EODReport, pk=pk)
+    report = get_object_or_404(EODReport.objects.select_related('employee'), pk=pk)
+
+    denied = _report_access_denied(request, report)
+    if denied:
+        return denied
 
-    # Check permissions
+    # Get all reviews for this report (ordered from oldest to newest)
+    reviews = report.reviews.all().order_by('review_number')
+    return render(request, 'reports/report_detail.html', _report_detail_context(request, report, reviews))
+
+
+def _report_access_denied(request, report):
+    """Redirect response if ``request.user`` may not view ``report``, else None"""
     if request.user.is_employee():
-        if report.employee != request.user:
+        if report.employee_id != request.user.pk:
             messages.error(request, 'You do not have permission to view this report.')
             return redirect('reports:employee_dashboard')
     elif request.user.is_manager():
         # Manager can only view their team members' reports
-        if report.employee.manager != request.user:
+        if report.employee.manager_id != request.user.pk:
             messages.error(request, 'You do not have permission to view this report.')
             return redirect('reports:manager_dashboard')
+    return None
 
-    # Get all reviews for this report (ordered from oldest to newest)
-    reviews = report.reviews.all().order_by('review_number')
 
-    context = {
+def _report_detail_context(request, report, reviews):
+    return {
         'report': report,
         'reviews': reviews,
-        'can_edit': report.can_edit() and report.employee == request.user,
+        'can_edit': report.can_edit() and report.employee_id == request.user.pk,
         'remaining_attempts': report.remaining_resubmissions() if report.is_rejected() else 0,
     }
-    return render(request, 'reports/report_detail.html', context)
 
 
 @login_required
@@ -228,80 +243,87 @@ def manager_dashboard_view(request):
         messages.error(request, 'You do not have permission to access this page.')
         return redirect('reports:employee_dashboard')
 
-    # Get team members' reports
-    if request.user.is_admin_user():
-        reports = EODReport.objects.all()
-        team_members = None
-    else:
-        team_members = request.user.get_team_members()
-        reports = EODReport.objects.filter(employee__in=team_members)
-
-    # Apply filters
-    filter_form = EODReportFilterForm(request.GET)
-    if filter_form.is_valid():
-        date_from = filter_form.cleaned_data.get('date_from')
-        date_to = filter_form.cleaned_data.get('date_to')
-        status = filter_form.cleaned_data.get('status')
-        employee = filter_form.cleaned_data.get('employee')
-
-        if date_from:
-            reports = reports.filter(report_date__gte=date_from)
-        if date_to:
-            reports = reports.filter(report_date__lte=date_to)
-        if status:
-            reports = reports.filter(status=status)
-        if employee:
-            reports = reports.filter(
-                Q(employee__first_name__icontains=employee) |
-                Q(employee__last_name__icontains=employee) |
-                Q(employee__username__icontains=employee)
-            )
-
-    reports = reports.select_related('employee').order_by('-report_date', '-submitted_at')[:50]
+    reports, filter_form, team_members = filtered_team_reports(request.user, request.GET)
+    reports, next_cursor = _report_page(request, reports, filter_form)
 
     # Get current week date range
     week_start, week_end = get_week_date_range()
 
-    # Get base queryset for statistics
-    if request.user.is_admin_user():
-        base_reports = EODReport.objects.all()
-    else:
-        base_reports = EODReport.objects.filter(employee__manager=request.user)
+    context = _manager_dashboard_context(
+        reports=reports,
+        next_cursor=next_cursor,
+        filter_form=filter_form,
+        team_members=team_members,
+        export_jobs=_recent_export_jobs(request.user),
+        # Overall and weekly statistics from the daily rollup
+        stats=get_manager_stats(request.user, week_start, week_end),
+    )
+    return render(request, 'reports/manager_dashboard.html', context)
 
-    # Get overall statistics
-    pending_count = base_reports.filter(status='PENDING').count()
-    total_count = base_reports.count()
-    approved_count = base_reports.filter(status='APPROVED').count()
 
-    # Get weekly statistics
-    week_reports = base_reports.filter(
-        report_date__gte=week_start,
-        report_date__lte=week_end
-    )
-    week_total = week_reports.count()
-    week_pending = week_reports.filter(status='PENDING').count()
-    week_approved = week_reports.filter(status='APPROVED').count()
-    week_rejected = week_reports.filter(status='REJECTED').count()
+def _recent_export_jobs(user):
+    return ExportJob.objects.filter(requested_by=user)[:5]
 
-    context = {
+
+def _manager_dashboard_context(reports, next_cursor, filter_form, team_members, export_jobs, stats):
+    week_start, week_end = get_week_date_range()
+    return {
         'reports': reports,
+        'next_cursor': next_cursor,
         'filter_form': filter_form,
+        'export_jobs': export_jobs,
+        'bulk_review_form': BulkReviewForm(),
         'is_weekend': is_weekend(),
         'week_display': get_week_display(),
         'week_start': week_start,
         'week_end': week_end,
-        # Overall stats
-        'pending_count': pending_count,
-        'total_count': total_count,
-        'approved_count': approved_count,
-        # Weekly stats
-        'week_total': week_total,
-        'week_pending': week_pending,
-        'week_approved': week_approved,
-        'week_rejected': week_rejected,
+        # Overall and weekly stats
+        **stats,
         'team_members': team_members,
     }
-    return render(request, 'reports/manager_dashboard.html', context)
+
+
+@login_required
+def manager_report_rows_view(request):
+    """Next page of manager dashboard table rows (infinite scroll fragment)"""
+    if not (request.user.is_manager() or request.user.is_admin_user()):
+        return HttpResponseForbidden()
+
+    reports, filter_form, _ = filtered_team_reports(request.user, request.GET)
+    reports, next_cursor = _report_page(request, reports, filter_form)
+    return _render_rows(request, 'reports/partials/manager_report_rows.html', reports, next_cursor)
+
+
+def _report_page(request, reports, filter_form):
+    """
+    One page of a report list: ranked full-text matches when a search term
+    is given, otherwise the next keyset page. Returns (reports, next_cursor).
+    """
+    query = filter_form.cleaned_data.get('q') if filter_form.is_valid() else None
+    reports = reports.defer(*LIST_DEFERRED_FIELDS)
+    if query:
+        return search_reports(reports, query), None
+    return keyset_page(reports, request.GET.get('cursor'))
+
+
+def _render_rows(request, template_name, reports, next_cursor):
+    """Render a rows fragment; the following page's cursor travels in a header"""
+    response = render(request, template_name, {'reports': reports})
+    if next_cursor:
+        response['X-Next-Cursor'] = next_cursor
+    return response
+
+
+@login_required
+def employee_autocomplete_view(request):
+    """JSON name suggestions for the employee filter, scoped to the user's team"""
+    if not (request.user.is_manager() or request.user.is_admin_user()):
+        return HttpResponseForbidden()
+
+    term = request.GET.get('q', '').strip()
+    if len(term) < 2:
+        return JsonResponse({'results': []})
+    return JsonResponse({'results': autocomplete_employees(request.user, term)})
 
 
 @login_required
@@ -328,36 +350,21 @@ def review_report_view(request, pk):
         # Redirect to report detail instead of review page
         return redirect('reports:report_detail', pk=report.pk)
 
-    # Get previous reviews to determine review number and check if this is a resubmission
-    previous_reviews = report.reviews.all().order_by('review_number')
-    is_resubmission = previous_reviews.exists()
-    next_review_number = previous_reviews.count() + 1 if is_resubmission else 1
-
-    # Always create a new review (never update existing ones to preserve history)
-    review = None
-    is_new_review = True
-
     if request.method == 'POST':
-        # Double-check status hasn't changed since page load
-        if report.status != 'PENDING':
-            messages.error(request, 'This report has already been reviewed and cannot be modified.')
-            return redirect('reports:manager_dashboard')
-
-        form = ReportReviewForm(request.POST, instance=review, report=report)
+        form = ReportReviewForm(request.POST, report=report)
         if form.is_valid():
-            report_review = form.save(commit=False)
-            report_review.report = report
-            report_review.reviewer = request.user
-            report_review.review_number = next_review_number
-            report_review.save()
-
-            # Update report status
             decision = form.cleaned_data.get('decision')
-            report.status = decision
-            report.save()
+            # Only succeeds if the report is still pending when the review is written
+            review = review_report(
+                report.pk, request.user, decision, form.cleaned_data.get('comments')
+            )
+            if review is None:
+                messages.error(request, 'This report has already been reviewed and cannot be modified.')
+                return redirect('reports:manager_dashboard')
 
+            _, review_number = review
             action = 'approved' if decision == 'APPROVED' else 'rejected'
-            review_iteration = f' (Review #{next_review_number})' if is_resubmission else ''
+            review_iteration = f' (Review #{review_number})' if review_number > 1 else ''
             messages.success(
                 request,
                 f'Report {action} successfully{review_iteration}! '
@@ -365,7 +372,14 @@ def review_report_view(request, pk):
             )
             return redirect('reports:manager_dashboard')
     else:
-        form = ReportReviewForm(instance=review, report=report)
+        form = ReportReviewForm(report=report)
+
+    # Previous reviews show the history and whether this is a resubmission.
+    # Always a new review (never update existing ones to preserve history)
+    previous_reviews = report.reviews.all().order_by('review_number')
+    is_resubmission = previous_reviews.exists()
+    next_review_number = previous_reviews.count() + 1 if is_resubmission else 1
+    is_new_review = True
 
     context = {
         'form': form,
@@ -378,178 +392,176 @@ def review_report_view(request, pk):
     return render(request, 'reports/review_report.html', context)
 
 
+@login_required
+@require_POST
+def bulk_review_view(request):
+    """Approve or reject the reports selected on the manager dashboard in one go"""
+    if not (request.user.is_manager() or request.user.is_admin_user()):
+        messages.error(request, 'You do not have permission to review reports.')
+        return redirect('reports:employee_dashboard')
+
+    form = BulkReviewForm(request.POST)
+    if form.is_valid():
+        report_ids = form.cleaned_data['report_ids']
+        decision = form.cleaned_data['decision']
+        # Only the user's team, checked in the same query that locks the reports
+        reports = reviewable_reports(request.user).filter(pk__in=report_ids)
+        reviewed = bulk_review(reports, request.user, decision, form.cleaned_data['comments'])
+
+        action = 'approved' if decision == 'APPROVED' else 'rejected'
+        if reviewed:
+            messages.success(request, f'{len(reviewed)} report(s) {action}.')
+        skipped = len(report_ids) - len(reviewed)
+        if skipped:
+            messages.warning(
+                request,
+                f'{skipped} selected report(s) were skipped: already reviewed or not on your team.'
+            )
+    else:
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(request, error)
+
+    # Back to the dashboard with the filters the selection was made under
+    dashboard_url = reverse('reports:manager_dashboard')
+    query = request.GET.urlencode()
+    return redirect(f'{dashboard_url}?{query}' if query else dashboard_url)
+
+
 @login_required
 def my_reports_view(request):
     """View all reports for the current user"""
-    reports = EODReport.objects.filter(employee=request.user).order_by('-report_date')
-
-    # Apply date filters
-    filter_form = EODReportFilterForm(request.GET)
-    if filter_form.is_valid():
-        date_from = filter_form.cleaned_data.get('date_from')
-        date_to = filter_form.cleaned_data.get('date_to')
-        status = filter_form.cleaned_data.get('status')
-
-        if date_from:
-            reports = reports.filter(report_date__gte=date_from)
-        if date_to:
-            reports = reports.filter(report_date__lte=date_to)
-        if status:
-            reports = reports.filter(status=status)
+    reports, filter_form = filtered_my_reports(request.user, request.GET)
+    reports, next_cursor = _report_page(request, reports, filter_form)
 
     context = {
         'reports': reports,
+        'next_cursor': next_cursor,
         'filter_form': filter_form,
     }
     return render(request, 'reports/my_reports.html', context)
 
 
+@login_required
+def my_report_rows_view(request):
+    """Next page of the my-reports table rows (infinite scroll fragment)"""
+    reports, filter_form = filtered_my_reports(request.user, request.GET)
+    reports, next_cursor = _report_page(request, reports, filter_form)
+    return _render_rows(request, 'reports/partials/my_report_rows.html', reports, next_cursor)
+
+
 @login_required
 def export_reports_excel(request):
-    """Export filtered reports to Excel for managers"""
+    """Export filtered reports for managers (Excel, or streamed CSV/NDJSON via ?format=)"""
     if not (request.user.is_manager() or request.user.is_admin_user()):
         messages.error(request, 'You do not have permission to export reports.')
         return redirect('reports:employee_dashboard')
 
-    # Get team members' reports (same logic as manager dashboard)
-    if request.user.is_admin_user():
-        reports = EODReport.objects.all()
-    else:
-        team_members = request.user.get_team_members()
-        reports = EODReport.objects.filter(employee__in=team_members)
-
-    # Apply filters (same as manager dashboard)
-    filter_form = EODReportFilterForm(request.GET)
-    if filter_form.is_valid():
-        date_from = filter_form.cleaned_data.get('date_from')
-        date_to = filter_form.cleaned_data.get('date_to')
-        status = filter_form.cleaned_data.get('status')
-        employee = filter_form.cleaned_data.get('employee')
-
-        if date_from:
-            reports = reports.filter(report_date__gte=date_from)
-        if date_to:
-            reports = reports.filter(report_date__lte=date_to)
-        if status:
-            reports = reports.filter(status=status)
-        if employee:
-            reports = reports.filter(
-                Q(employee__first_name__icontains=employee) |
-                Q(employee__last_name__icontains=employee) |
-                Q(employee__username__icontains=employee)
-            )
+    # Same team scoping and filters as the manager dashboard (no page limit)
+    reports, _, _ = filtered_team_reports(request.user, request.GET)
+    reports = reports.order_by('-report_date', '-submitted_at')
 
-    # Remove the limit for export (get all matching reports, not just 50)
-    reports = reports.select_related('employee').order_by('-report_date', '-submitted_at')
-
-    # Create Excel workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "EOD Reports"
-
-    # Define headers
-    headers = [
-        'Employee Name',
-        'Department',
-        'Report Date',
-        'Project Name',
-        'Tasks Completed',
-        'Hours Worked',
-        'Blockers/Issues',
-        'Next Day Plan',
-        'Status',
-        'Resubmission Count',
-        'Submitted At',
-        'Last Review Comments'
-    ]
-
-    # Style for header row
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-
-    # Write headers
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.value = header
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-
-    # Helper function to strip HTML tags
-    def strip_html(text):
-        """Remove HTML tags from text"""
-        if not text:
-            return ''
-        clean = re.compile('<.*?>')
-        return re.sub(clean, '', str(text)).strip()
-
-    # Style for status cells
-    status_fills = {
-        'APPROVED': PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"),
-        'PENDING': PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid"),
-        'REJECTED': PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid"),
-    }
+    export_format = request.GET.get('format', 'xlsx')
+    if export_format in STREAMING_EXPORT_FORMATS:
+        return _streaming_export(request, reports, export_format)
 
-    # Write data rows
-    for row_num, report in enumerate(reports, 2):
-        # Get last review comments if any
-        last_review = report.reviews.order_by('-reviewed_at').first()
-        review_comments = last_review.comments if last_review else 'No review yet'
-
-        # Prepare row data
-        row_data = [
-            report.employee.get_full_name() or report.employee.username,
-            report.employee.department or 'N/A',
-            report.report_date.strftime('%Y-%m-%d'),
-            report.project_name,
-            strip_html(report.tasks_completed),
-            float(report.hours_worked),
-            strip_html(report.blockers_issues) if report.blockers_issues else 'None',
-            strip_html(report.next_day_plan),
-            report.get_status_display(),
-            report.resubmission_count,
-            report.submitted_at.strftime('%Y-%m-%d %H:%M'),
-            strip_html(review_comments)
-        ]
-
-        # Write row
-        for col_num, value in enumerate(row_data, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = value
-            cell.alignment = Alignment(vertical="top", wrap_text=True)
-
-            # Apply status color
-            if col_num == 9:  # Status column
-                cell.fill = status_fills.get(report.status, PatternFill())
-
-    # Auto-size columns
-    for col_num in range(1, len(headers) + 1):
-        column_letter = get_column_letter(col_num)
-        max_length = 0
-        for cell in ws[column_letter]:
-            try:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            except:
-                pass
-        # Set width (with limits)
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = max(adjusted_width, 12)
-
-    # Freeze header row
-    ws.freeze_panes = 'A2'
-
-    # Prepare response
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
+    # Build the workbook in a temporary file, then stream it back in chunks
+    export_file = tempfile.TemporaryFile()
+    write_reports_xlsx(reports, export_file)
+    export_file.seek(0)
 
     # Generate filename with current date
     filename = f'EOD_Reports_{timezone.now().strftime("%Y-%m-%d")}.xlsx'
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return FileResponse(
+        export_file,
+        as_attachment=True,
+        filename=filename,
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
 
-    # Save workbook to response
-    wb.save(response)
 
+def _streaming_export(request, reports, export_format):
+    """Stream a CSV/NDJSON export row by row, gzip-compressed when accepted"""
+    content_type, extension, rows = STREAMING_EXPORT_FORMATS[export_format]
+    chunks = rows(reports)
+
+    accepts_gzip = accepts_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), 'gzip')
+    if accepts_gzip:
+        chunks = gzip_stream(chunks)
+
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    if accepts_gzip:
+        response['Content-Encoding'] = 'gzip'
+    # Either way the response depends on the header
+    patch_vary_headers(response, ['Accept-Encoding'])
+
+    filename = f'EOD_Reports_{timezone.now().strftime("%Y-%m-%d")}.{extension}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
+
+
+@login_required
+@require_POST
+def export_job_create_view(request):
+    """Queue a background export of the current dashboard filters"""
+    if not (request.user.is_manager() or request.user.is_admin_user()):
+        messages.error(request, 'You do not have permission to export reports.')
+        return redirect('reports:employee_dashboard')
+
+    job, cached = submit_export(request.user, request.GET)
+    if cached:
+        # Nothing changed since this export was built - serve it right away
+        return redirect('reports:export_job_download', pk=job.pk)
+
+    messages.info(
+        request,
+        'Your export is being prepared. It will appear under Recent Exports when ready.'
+    )
+    dashboard_url = reverse('reports:manager_dashboard')
+    query = request.GET.urlencode()
+    return redirect(f'{dashboard_url}?{query}' if query else dashboard_url)
+
+
+@login_required
+def export_job_status_view(request, pk):
+    """JSON progress of an export job (polled by the manager dashboard)"""
+    job = get_object_or_404(ExportJob, pk=pk)
+    if not can_access_job(request.user, job):
+        return HttpResponseForbidden()
+
+    return JsonResponse({
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'progress': job.progress_percent(),
+        'rows_written': job.rows_written,
+        'total_rows': job.total_rows,
+        'download_url': reverse('reports:export_job_download', args=[job.pk]) if job.is_done() else None,
+    })
+
+
+@login_required
+def export_job_download_view(request, pk):
+    """Download a finished export file"""
+    job = get_object_or_404(ExportJob, pk=pk)
+    if not can_access_job(request.user, job):
+        messages.error(request, 'You do not have permission to download this export.')
+        return redirect('reports:dashboard')
+    if not job.is_done() or not job.file:
+        messages.error(request, 'This export is not ready yet.')
+        return redirect('reports:manager_dashboard')
+
+    filename = f'EOD_Reports_{timezone.localtime(job.created_at).strftime("%Y-%m-%d")}.xlsx'
+    return FileResponse(
+        job.file.open('rb'),
+        as_attachment=True,
+        filename=filename,
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+
+
+@login_required
+def db_pool_metrics_view(request):
+    """Database connection pool metrics of the process serving this request (admins only)"""
+    if not request.user.is_admin_user():
+        return HttpResponseForbidden()
+    return JsonResponse({'pid': os.getpid(), 'pools': pool_metrics()})
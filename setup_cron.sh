@@ -1,6 +1,11 @@
 #!/bin/bash
 # Setup script for automated EOD email notifications
 # This script configures cron jobs to send daily reminders at 6 PM IST
+#
+# Prefer running `python manage.py run_scheduler` as a service instead (see
+# EMAIL_AUTOMATION_GUIDE.md): one warm process runs the same jobs from
+# NOTIFICATION_SCHEDULE in settings.py, in TIME_ZONE, with catch-up of
+# missed runs. Don't use both, or reminders are queued twice a day.
 
 # Get the absolute path to the project directory
 PROJECT_DIR="/home/my/Desktop/Update_Platform"
@@ -56,6 +61,9 @@ echo "10 16 * * 1-5 cd $PROJECT_DIR && $VENV_PYTHON $MANAGE_PY send_eod_reminder
 # Add cron job for manager notifications at 6:30 PM IST (daily)
 echo "30 18 * * 1-5 cd $PROJECT_DIR && $VENV_PYTHON $MANAGE_PY send_manager_notifications >> $PROJECT_DIR/logs/manager_notifications.log 2>&1" >> "$CRON_FILE"
 
+# Deliver queued emails (the commands above only queue them) every minute
+echo "* * * * * cd $PROJECT_DIR && $VENV_PYTHON $MANAGE_PY process_outbox --once >> $PROJECT_DIR/logs/outbox.log 2>&1" >> "$CRON_FILE"
+
 echo "" >> "$CRON_FILE"
 
 # Install the new crontab
@@ -72,6 +80,7 @@ echo ""
 echo "Scheduled jobs:"
 echo "  📧 Employee EOD Reminders: 6:00 PM IST (Mon-Fri)"
 echo "  📧 Manager Notifications:  6:30 PM IST (Mon-Fri)"
+echo "  📤 Outbox delivery:        every minute"
 echo ""
 echo "Logs will be saved to: $PROJECT_DIR/logs/"
 echo ""
@@ -0,0 +1,53 @@
+/*
+ * Bulk review on the manager dashboard.
+ *
+ * Pending report rows carry a checkbox belonging to the bulk review form
+ * (form="bulk-review-form"). The approve/reject buttons are enabled while
+ * something is selected; the header checkbox selects every pending row
+ * loaded so far, including rows added by infinite scroll.
+ */
+(function () {
+    'use strict';
+
+    function selected() {
+        return document.querySelectorAll('[data-bulk-select]:checked');
+    }
+
+    function update(form) {
+        var count = selected().length;
+        form.querySelectorAll('[data-bulk-action]').forEach(function (button) {
+            button.disabled = count === 0;
+        });
+        form.querySelector('[data-bulk-count]').textContent = count
+            ? count + ' report(s) selected'
+            : 'Select pending reports to review them together';
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        var form = document.querySelector('[data-bulk-review]');
+        if (!form) {
+            return;
+        }
+
+        // Rows are appended later by infinite scroll, so listen on the document
+        document.addEventListener('change', function (event) {
+            var target = event.target;
+            if (target.matches('[data-bulk-select-all]')) {
+                document.querySelectorAll('[data-bulk-select]').forEach(function (checkbox) {
+                    checkbox.checked = target.checked;
+                });
+            }
+            if (target.matches('[data-bulk-select], [data-bulk-select-all]')) {
+                update(form);
+            }
+        });
+
+        form.addEventListener('submit', function (event) {
+            var decision = event.submitter ? event.submitter.value : '';
+            var action = decision === 'REJECTED' ? 'Reject' : 'Approve';
+            if (!window.confirm(action + ' ' + selected().length + ' report(s)?')) {
+                event.preventDefault();
+            }
+        });
+    });
+})();
@@ -0,0 +1,45 @@
+/*
+ * Employee name suggestions for the manager dashboard filter.
+ *
+ * Fills the <datalist> referenced by the employee input from the JSON
+ * autocomplete endpoint (data-url on the datalist), debounced while typing.
+ */
+(function () {
+    'use strict';
+
+    var DEBOUNCE_MS = 250;
+
+    document.addEventListener('DOMContentLoaded', function () {
+        var datalist = document.getElementById('employee-suggestions');
+        if (!datalist) {
+            return;
+        }
+        var input = document.querySelector('input[list="employee-suggestions"]');
+        var timer = null;
+
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            var term = input.value.trim();
+            if (term.length < 2) {
+                return;
+            }
+            timer = setTimeout(function () {
+                fetch(datalist.dataset.url + '?q=' + encodeURIComponent(term), {
+                    credentials: 'same-origin'
+                })
+                    .then(function (response) { return response.json(); })
+                    .then(function (data) {
+                        datalist.innerHTML = '';
+                        data.results.forEach(function (employee) {
+                            var option = document.createElement('option');
+                            option.value = employee.username;
+                            option.textContent = employee.name +
+                                (employee.department ? ' (' + employee.department + ')' : '');
+                            datalist.appendChild(option);
+                        });
+                    })
+                    .catch(function () {});
+            }, DEBOUNCE_MS);
+        });
+    });
+})();
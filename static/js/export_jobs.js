@@ -0,0 +1,35 @@
+/*
+ * Progress polling for background exports on the manager dashboard.
+ *
+ * Every queued/running job row polls its JSON status endpoint and updates
+ * its progress bar, status badge and download link until it finishes.
+ */
+(function () {
+    'use strict';
+
+    var POLL_MS = 2000;
+
+    function poll(item) {
+        fetch(item.dataset.statusUrl, {credentials: 'same-origin'})
+            .then(function (response) { return response.json(); })
+            .then(function (job) {
+                item.querySelector('.progress-bar').style.width = job.progress + '%';
+                item.querySelector('[data-export-status]').textContent = job.status_display;
+                if (job.status === 'QUEUED' || job.status === 'RUNNING') {
+                    setTimeout(function () { poll(item); }, POLL_MS);
+                } else if (job.download_url) {
+                    item.querySelector('[data-export-download]').classList.remove('d-none');
+                }
+            })
+            .catch(function () {});
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('[data-export-job]').forEach(function (item) {
+            var status = item.dataset.status;
+            if (status === 'QUEUED' || status === 'RUNNING') {
+                poll(item);
+            }
+        });
+    });
+})();
@@ -0,0 +1,63 @@
+/*
+ * Infinite scroll for keyset-paginated report tables.
+ *
+ * A "Load More" button carrying data-url / data-cursor / data-target fetches
+ * the next page of <tr> rows (with the current filters) and appends them to
+ * the target <tbody>. The following page's cursor comes back in the
+ * X-Next-Cursor response header; the button is removed on the last page.
+ */
+(function () {
+    'use strict';
+
+    function loadMore(button) {
+        if (button.disabled) {
+            return;
+        }
+        button.disabled = true;
+
+        var params = new URLSearchParams(window.location.search);
+        params.set('cursor', button.dataset.cursor);
+
+        fetch(button.dataset.url + '?' + params.toString(), {
+            credentials: 'same-origin',
+            headers: {'X-Requested-With': 'XMLHttpRequest'}
+        })
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error('HTTP ' + response.status);
+                }
+                var nextCursor = response.headers.get('X-Next-Cursor');
+                return response.text().then(function (html) {
+                    document.getElementById(button.dataset.target)
+                        .insertAdjacentHTML('beforeend', html);
+                    if (nextCursor) {
+                        button.dataset.cursor = nextCursor;
+                        button.disabled = false;
+                    } else {
+                        button.parentNode.removeChild(button);
+                    }
+                });
+            })
+            .catch(function () {
+                button.disabled = false;
+            });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('[data-infinite-scroll]').forEach(function (button) {
+            button.addEventListener('click', function () {
+                loadMore(button);
+            });
+
+            if ('IntersectionObserver' in window) {
+                new IntersectionObserver(function (entries) {
+                    entries.forEach(function (entry) {
+                        if (entry.isIntersecting) {
+                            loadMore(button);
+                        }
+                    });
+                }, {rootMargin: '200px'}).observe(button);
+            }
+        });
+    });
+})();